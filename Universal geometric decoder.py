@@ -1,359 +1,729 @@
-import React, { useState, useEffect, useRef } from 'react';
-import { Play, Upload, ChevronRight, Calculator, Eye, CheckCircle, ImageIcon, RotateCcw, Zap } from 'lucide-react';
+import React, { Profiler, memo, useState, useEffect, useRef, useMemo } from 'react';
+// One module per icon: the lucide-react entry point re-exports the whole set.
+import Calculator from 'lucide-react/dist/esm/icons/calculator.js';
+import CheckCircle from 'lucide-react/dist/esm/icons/circle-check-big.js';
+import Eye from 'lucide-react/dist/esm/icons/eye.js';
+import ImageIcon from 'lucide-react/dist/esm/icons/image.js';
+import Play from 'lucide-react/dist/esm/icons/play.js';
+import RotateCcw from 'lucide-react/dist/esm/icons/rotate-ccw.js';
+import Timer from 'lucide-react/dist/esm/icons/timer.js';
+import Upload from 'lucide-react/dist/esm/icons/upload.js';
+import Zap from 'lucide-react/dist/esm/icons/zap.js';
+import { DecoderClient, abortError } from './decoder/client.js';
+import { BRIGHTNESS_THRESHOLD, OTSU, PIPELINE_STAGE_LABELS } from './decoder/defaults.js';
+import { loadCatalogIndex } from './decoder/catalog.js';
+import { mountPerfHud, perf } from './decoder/perf.js';
+import {
+  closeBitmap, createObjectUrl, formatBytes, memory, releaseCanvas, revokeObjectUrl, sizeCanvas, trackBitmap
+} from './decoder/memory.js';
+import { getCachedResult, hashBlob, putCachedResult, resultCacheKey, resultCacheStats } from './decoder/result-cache.js';
+
+// Larger uploads are decoded tile by tile from the File instead of through a
+// data URL and a 400px canvas.
+const TILED_DECODE_THRESHOLD = 10 * 1024 * 1024;
+
+// Startup loads only what the first screen needs (the kernel itself runs in
+// the worker). Threshold previews, the batch pool, the video loop and preset
+// matching load on first use; preset matching also starts once the browser
+// is idle, so it is usually ready by the first upload.
+const loadOnce = (load) => {
+  let promise = null;
+  return () => {
+    if (!promise) {
+      promise = load().catch((err) => {
+        promise = null;
+        throw err;
+      });
+    }
+    return promise;
+  };
+};
+
+const whenIdle = (callback) => {
+  if (typeof requestIdleCallback === 'function') {
+    const handle = requestIdleCallback(callback);
+    return () => cancelIdleCallback(handle);
+  }
+  const handle = setTimeout(callback, 200);
+  return () => clearTimeout(handle);
+};
+
+const loadThreshold = loadOnce(() => import('./decoder/threshold.js'));
+const loadPool = loadOnce(() => import('./decoder/pool.js'));
+const loadVideo = loadOnce(() => import('./decoder/video.js'));
+const loadProjection = loadOnce(async () => {
+  const [{ loadPresetIndex }, { SimilarityMatrix, projectUpload }, { signatureFromFeatures }] = await Promise.all([
+    import('./decoder/preset-index.js'),
+    import('./decoder/similarity.js'),
+    import('./decoder/signatures.js')
+  ]);
+  const index = await loadPresetIndex();
+  return { index, similarity: SimilarityMatrix.fromIndex(index), projectUpload, signatureFromFeatures };
+});
+
+const BATCH_COLUMNS = [
+  { key: 'name', label: 'File' },
+  { key: 'physicsLaw', label: 'Physics Law' },
+  { key: 'aspectRatio', label: 'Aspect', digits: 2 },
+  { key: 'fillRatio', label: 'Fill', digits: 3 },
+  { key: 'compactness', label: 'Compact', digits: 2 },
+  { key: 'radialSymmetry', label: 'Radial', digits: 2 },
+  { key: 'symmetryOrder', label: 'Order' }
+];
+
+const compareRows = (key, dir) => (a, b) => {
+  const x = a[key];
+  const y = b[key];
+  if (x === undefined || y === undefined) return (x === undefined) - (y === undefined);
+  return dir * (typeof x === 'string' ? x.localeCompare(y) : x - y);
+};
+
+const BatchDecoder = () => {
+  const [rows, setRows] = useState([]);
+  const [pending, setPending] = useState(0);
+  const [sort, setSort] = useState({ key: 'name', dir: 1 });
+  const poolRef = useRef(null);
+  const filesInputRef = useRef(null);
+  const folderInputRef = useRef(null);
+  const nextRowIdRef = useRef(0);
+
+  useEffect(() => () => poolRef.current?.dispose(), []);
+
+  const handleFiles = async (event) => {
+    const files = Array.from(event.target.files).filter((file) => file.type.startsWith('image/'));
+    event.target.value = '';
+    if (!files.length) return;
+    if (!poolRef.current) {
+      const { DecoderPool } = await loadPool();
+      poolRef.current = poolRef.current || new DecoderPool();
+    }
+
+    setPending((count) => count + files.length);
+    files.forEach((file) => {
+      const name = file.webkitRelativePath || file.name;
+      const id = nextRowIdRef.current++;
+      poolRef.current.decodeFile(file, { maxSize: 400 })
+        .then(({ features, analysis }) => ({
+          id,
+          name,
+          physicsLaw: analysis.physicsLaw,
+          aspectRatio: features.aspectRatio,
+          fillRatio: features.fillRatio,
+          compactness: features.compactness,
+          radialSymmetry: features.radialSymmetry,
+          symmetryOrder: features.symmetryOrder
+        }))
+        .catch((err) => (err.name === 'AbortError' ? null : { id, name, error: err.message }))
+        .then((row) => {
+          if (row) setRows((prev) => [...prev, row]);
+          setPending((count) => count - 1);
+        });
+    });
+  };
+
+  const clearBatch = () => {
+    poolRef.current?.cancel();
+    setRows([]);
+  };
+
+  const toggleSort = (key) => {
+    setSort((prev) => ({ key, dir: prev.key === key ? -prev.dir : 1 }));
+  };
+
+  const sortedRows = useMemo(() => [...rows].sort(compareRows(sort.key, sort.dir)), [rows, sort]);
+
+  return (
+    <div className="space-y-4">
+      <div className="border-2 border-dashed border-blue-400 rounded-lg p-6 flex justify-center gap-6">
+        <input ref={filesInputRef} type="file" accept="image/*" multiple onChange={handleFiles} className="hidden" />
+        <input ref={folderInputRef} type="file" webkitdirectory="" directory="" multiple onChange={handleFiles} className="hidden" />
+        <button
+          onClick={() => filesInputRef.current?.click()}
+          className="flex flex-col items-center gap-2 text-blue-200 hover:text-white transition-colors"
+        >
+          <Upload className="w-8 h-8" />
+          <span>Select images</span>
+        </button>
+        <button
+          onClick={() => folderInputRef.current?.click()}
+          className="flex flex-col items-center gap-2 text-blue-200 hover:text-white transition-colors"
+        >
+          <Upload className="w-8 h-8" />
+          <span>Select folder</span>
+        </button>
+      </div>
+
+      <div className="flex items-center justify-between text-blue-200 text-sm">
+        <span>{rows.length} decoded{pending > 0 ? `, ${pending} queued` : ''}</span>
+        <button onClick={clearBatch} className="text-blue-200 hover:text-white transition-colors">
+          Clear
+        </button>
+      </div>
+
+      {rows.length > 0 && (
+        <div className="overflow-x-auto max-h-96 overflow-y-auto rounded-lg border border-white/10">
+          <table className="w-full text-sm text-left">
+            <thead className="bg-white/10 text-blue-300 sticky top-0">
+              <tr>
+                {BATCH_COLUMNS.map(({ key, label }) => (
+                  <th key={key} onClick={() => toggleSort(key)} className="px-3 py-2 cursor-pointer select-none whitespace-nowrap">
+                    {label}{sort.key === key ? (sort.dir > 0 ? ' ▲' : ' ▼') : ''}
+                  </th>
+                ))}
+              </tr>
+            </thead>
+            <tbody>
+              {sortedRows.map((row) => (
+                <tr key={row.id} className="border-t border-white/10 text-white">
+                  {row.error ? (
+                    <>
+                      <td className="px-3 py-2">{row.name}</td>
+                      <td colSpan={BATCH_COLUMNS.length - 1} className="px-3 py-2 text-red-300">{row.error}</td>
+                    </>
+                  ) : (
+                    BATCH_COLUMNS.map(({ key, digits }) => (
+                      <td key={key} className="px-3 py-2">
+                        {digits === undefined ? row[key] : row[key].toFixed(digits)}
+                      </td>
+                    ))
+                  )}
+                </tr>
+              ))}
+            </tbody>
+          </table>
+        </div>
+      )}
+    </div>
+  );
+};
+
+const VideoDecoder = ({ active }) => {
+  const [source, setSource] = useState(null); // 'camera' | 'file'
+  const [update, setUpdate] = useState(null);
+  const [error, setError] = useState(null);
+  const videoRef = useRef(null);
+  const fileInputRef = useRef(null);
+  const clientRef = useRef(null);
+  const loopRef = useRef(null);
+  const streamRef = useRef(null);
+  const urlRef = useRef(null);
+
+  const stop = () => {
+    loopRef.current?.stop();
+    loopRef.current = null;
+    streamRef.current?.getTracks().forEach((track) => track.stop());
+    streamRef.current = null;
+    revokeObjectUrl(urlRef.current);
+    urlRef.current = null;
+    const video = videoRef.current;
+    if (video) {
+      video.pause();
+      video.srcObject = null;
+      video.removeAttribute('src');
+    }
+    setSource(null);
+  };
+
+  useEffect(() => () => {
+    stop();
+    clientRef.current?.dispose();
+  }, []);
+
+  // Leaving the tab stops the camera and the decode loop.
+  useEffect(() => {
+    if (!active) stop();
+  }, [active]);
+
+  const startLoop = async (kind) => {
+    if (!clientRef.current) {
+      clientRef.current = new DecoderClient();
+    }
+    setSource(kind);
+    setUpdate(null);
+    const [{ VideoFrameDecoder }] = await Promise.all([loadVideo(), videoRef.current.play()]);
+    loopRef.current = new VideoFrameDecoder(videoRef.current, clientRef.current, { onUpdate: setUpdate });
+    loopRef.current.start();
+  };
+
+  const startCamera = async () => {
+    stop();
+    setError(null);
+    try {
+      streamRef.current = await navigator.mediaDevices.getUserMedia({ video: { facingMode: 'environment' } });
+      videoRef.current.srcObject = streamRef.current;
+      await startLoop('camera');
+    } catch (err) {
+      stop();
+      setError(`Camera unavailable: ${err.message}`);
+    }
+  };
+
+  const handleVideoFile = async (event) => {
+    const file = event.target.files[0];
+    event.target.value = '';
+    if (!file) return;
+    stop();
+    setError(null);
+    urlRef.current = createObjectUrl(file);
+    videoRef.current.src = urlRef.current;
+    videoRef.current.loop = true;
+    try {
+      await startLoop('file');
+    } catch (err) {
+      stop();
+      setError(`Could not play video: ${err.message}`);
+    }
+  };
+
+  const result = update?.result;
+  const stats = update?.stats;
+
+  return (
+    <div className="space-y-4">
+      <div className="border-2 border-dashed border-blue-400 rounded-lg p-6 flex justify-center gap-6">
+        <input ref={fileInputRef} type="file" accept="video/*" onChange={handleVideoFile} className="hidden" />
+        <button
+          onClick={startCamera}
+          className="flex flex-col items-center gap-2 text-blue-200 hover:text-white transition-colors"
+        >
+          <Eye className="w-8 h-8" />
+          <span>Use camera</span>
+        </button>
+        <button
+          onClick={() => fileInputRef.current?.click()}
+          className="flex flex-col items-center gap-2 text-blue-200 hover:text-white transition-colors"
+        >
+          <Upload className="w-8 h-8" />
+          <span>Open video</span>
+        </button>
+      </div>
+
+      <div className={source ? 'bg-white/5 rounded-lg p-4 space-y-3' : 'hidden'}>
+        <video ref={videoRef} muted playsInline className="max-w-full h-auto rounded border border-white/20" />
+        <div className="flex items-center justify-between text-blue-200 text-sm">
+          <span>
+            {stats
+              ? `${stats.decoded} decoded · ${stats.dropped} dropped · ${stats.size}px · ${stats.frameMs.toFixed(0)} ms/frame`
+              : 'Waiting for frames...'}
+          </span>
+          <button onClick={stop} className="text-blue-200 hover:text-white transition-colors">
+            Stop
+          </button>
+        </div>
+        {result ? (
+          <div>
+            <h3 className="text-blue-300 font-medium">Physics Law</h3>
+            <p className="text-white font-semibold">{result.analysis.physicsLaw}</p>
+            <p className="text-blue-200 text-sm">{result.analysis.geometry}</p>
+          </div>
+        ) : (
+          stats && <p className="text-blue-200 text-sm">No stable geometry detected</p>
+        )}
+      </div>
+
+      {error && (
+        <div className="p-3 bg-red-500/20 border border-red-500/50 rounded-lg">
+          <p className="text-red-200 text-sm">{error}</p>
+        </div>
+      )}
+    </div>
+  );
+};
+
+// The picker is windowed: only the rows in view (plus a little overscan) are
+// mounted, whatever the catalog size.
+const PICKER_ROW_HEIGHT = 80;
+const PICKER_HEIGHT = 480;
+const PICKER_OVERSCAN = 4;
+
+const CatalogRow = memo(({ symbolKey, name, description, top, selected, onSelect }) => (
+  <button
+    onClick={() => onSelect(symbolKey)}
+    style={{ position: 'absolute', top, left: 0, right: 0, height: PICKER_ROW_HEIGHT - 12 }}
+    className={`p-3 rounded-lg text-left transition-colors ${
+      selected
+        ? 'bg-blue-500/30 border border-blue-400'
+        : 'bg-white/5 hover:bg-white/10 border border-white/10'
+    }`}
+  >
+    <div className="text-white font-medium truncate">{name}</div>
+    <div className="text-blue-200 text-sm truncate">{description}</div>
+  </button>
+));
+
+// Memoized on (catalog, selected, onSelect), so pipeline progress in the
+// parent never re-renders it.
+const CatalogPicker = memo(({ catalog, selected, onSelect }) => {
+  const [query, setQuery] = useState('');
+  const [scrollTop, setScrollTop] = useState(0);
+  const listRef = useRef(null);
+  const results = useMemo(() => (catalog ? catalog.search(query) : []), [catalog, query]);
+
+  if (!catalog) return <p className="text-blue-200 text-sm">Loading symbol catalog...</p>;
+
+  const first = Math.max(0, Math.floor(scrollTop / PICKER_ROW_HEIGHT) - PICKER_OVERSCAN);
+  const last = Math.min(results.length, Math.ceil((scrollTop + PICKER_HEIGHT) / PICKER_ROW_HEIGHT) + PICKER_OVERSCAN);
+
+  return (
+    <div className="space-y-3">
+      <input
+        type="search"
+        value={query}
+        onChange={(e) => {
+          setQuery(e.target.value);
+          setScrollTop(0);
+          if (listRef.current) listRef.current.scrollTop = 0;
+        }}
+        placeholder={`Search ${catalog.size} symbols by name, law or keyword`}
+        className="w-full px-3 py-2 rounded-lg bg-white/10 border border-white/20 text-white placeholder-blue-300"
+      />
+      <div
+        ref={listRef}
+        onScroll={(e) => setScrollTop(e.currentTarget.scrollTop)}
+        style={{ maxHeight: PICKER_HEIGHT }}
+        className="overflow-y-auto"
+      >
+        <div style={{ position: 'relative', height: results.length * PICKER_ROW_HEIGHT }}>
+          {results.slice(first, last).map((i, offset) => {
+            const { key, name, description } = catalog.summary(i);
+            return (
+              <CatalogRow
+                key={key}
+                symbolKey={key}
+                name={name}
+                description={description}
+                top={(first + offset) * PICKER_ROW_HEIGHT}
+                selected={key === selected}
+                onSelect={onSelect}
+              />
+            );
+          })}
+        </div>
+      </div>
+      {results.length === 0 && <p className="text-blue-200 text-sm">No symbols match “{query}”</p>}
+    </div>
+  );
+});
 
 const SacredGeometryDecoder = () => {
   const [selectedSymbol, setSelectedSymbol] = useState('seedOfLife');
+  const [catalog, setCatalog] = useState(null);
+  const [presetEntry, setPresetEntry] = useState(null);
   const [currentStep, setCurrentStep] = useState(0);
   const [isProcessing, setIsProcessing] = useState(false);
   const [uploadedImage, setUploadedImage] = useState(null);
   const [imageAnalysis, setImageAnalysis] = useState(null);
-  const [mode, setMode] = useState('preset'); // 'preset' or 'upload'
+  const [mode, setMode] = useState('preset'); // 'preset', 'upload', 'batch' or 'video'
   const [error, setError] = useState(null);
+  const [multiResolution, setMultiResolution] = useState(false);
+  const [threshold, setThreshold] = useState(BRIGHTNESS_THRESHOLD); // brightness cutoff or OTSU
+  const [thresholdPreview, setThresholdPreview] = useState(null);
+  const [cacheStats, setCacheStats] = useState(resultCacheStats);
+  const [tileProgress, setTileProgress] = useState(null);
+  const [memoryStats, setMemoryStats] = useState(() => memory.stats());
+  const [showPerfHud, setShowPerfHud] = useState(() => /[?&#]perf\b/.test(window.location.search + window.location.hash));
   const canvasRef = useRef(null);
   const fileInputRef = useRef(null);
+  const decoderRef = useRef(null);
+  const uploadRef = useRef({ file: null, hash: null, token: 0 });
+  const projectionRef = useRef(null);
+  const uploadNamesRef = useRef(new Map());
+
+  useEffect(() => () => decoderRef.current?.dispose(), []);
+
+  useEffect(() => (showPerfHud ? mountPerfHud(perf) : undefined), [showPerfHud]);
+
+  useEffect(() => memory.subscribe(() => setMemoryStats(memory.stats())), []);
+
+  useEffect(() => {
+    loadCatalogIndex()
+      .then(setCatalog)
+      .catch((err) => setError(`Could not load the symbol catalog: ${err.message}`));
+  }, []);
+
+  // Only the selected entry's chunk is fetched.
+  useEffect(() => {
+    if (!catalog) return undefined;
+    let current = true;
+    catalog.get(selectedSymbol)
+      .then((entry) => {
+        if (current) setPresetEntry(entry);
+      })
+      .catch((err) => setError(err.message));
+    return () => {
+      current = false;
+    };
+  }, [catalog, selectedSymbol]);
 
-  const presetSymbols = {
-    seedOfLife: {
-      name: 'Seed of Life',
-      description: '7 overlapping circles in hexagonal pattern',
-      geometry: 'Radial symmetry, 6-fold rotational symmetry, central convergence point',
-      constraint: 'Radial divergence from core point',
-      operator: '∇ · Φ = ρ',
-      physicsLaw: "Gauss's Law / Field Divergence",
-      application: 'Electric field from point charges, gravitational field mapping',
-      equation: 'div(E) = ρ/ε₀',
-      verification: 'Dimensional: [E]/[L] = [ρ]/[ε₀] ✓'
-    },
-    flowerOfLife: {
-      name: 'Flower of Life',
-      description: '19 overlapping circles in hexagonal lattice',
-      geometry: 'Multiple interference nodes, periodic lattice structure',
-      constraint: 'Multiple radial modes in interference pattern',
-      operator: 'Φ(x,t) = Σₙ ψₙ(x)e^(-iωₙt)',
-      physicsLaw: 'Wave Superposition / Harmonic Fields',
-      application: 'Optical interference, acoustic resonance, quantum superposition',
-      equation: '∇²ψₙ = -kₙ²ψₙ',
-      verification: 'Dimensional: [k²][ψ] = [∇²ψ] ✓'
-    },
-    torus: {
-      name: 'Torus',
-      description: 'Donut-shaped surface with circular cross-sections',
-      geometry: 'Closed loop topology, azimuthal symmetry, circulation',
-      constraint: 'Azimuthally looped vector flow',
-      operator: '∮ B · dl = μ₀I',
-      physicsLaw: "Ampère's Circuital Law",
-      application: 'Magnetic field around currents, tokamak plasma confinement',
-      equation: 'curl(B) = μ₀J',
-      verification: 'Dimensional: [B]/[L] = [μ₀][J] ✓'
-    },
-    goldenSpiral: {
-      name: 'Golden Spiral',
-      description: 'Logarithmic spiral with golden ratio growth',
-      geometry: 'Self-similar scaling, constant angular growth rate',
-      constraint: 'Logarithmic radial curve conserving angular growth',
-      operator: 'r(θ) = ae^(bθ), b = ln(φ)/π',
-      physicsLaw: 'Minimum Energy Scaling Path',
-      application: 'Galaxy arms, shell growth, fluid vortices, optimization paths',
-      equation: 'dE/dr = minimal for φ-scaling',
-      verification: 'Dimensional: [r] vs [θ] scaling consistent ✓'
-    },
-    vesicaPiscis: {
-      name: 'Vesica Piscis',
-      description: 'Intersection of two equal circles',
-      geometry: 'Lens-shaped intersection, bilateral symmetry',
-      constraint: 'Intersection region of circular field fronts',
-      operator: 'E = ½mv² = ℏω',
-      physicsLaw: 'Classical-Quantum Energy Bifurcation',
-      application: 'Wave-particle duality, resonator modes, optical lensing',
-      equation: 'λ = h/p (de Broglie relation)',
-      verification: 'Dimensional: [E] = [ℏ][ω] ✓'
-    },
-    metatronsCube: {
-      name: "Metatron's Cube",
-      description: '13-sphere structure containing all 5 Platonic solids',
-      geometry: '3D polyhedral framework, icosahedral symmetry, nested geometric forms',
-      constraint: 'Discrete crystalline lattice with multiple symmetry groups',
-      operator: 'H = -ℏ²/2m ∇² + V(r) with crystalline potential',
-      physicsLaw: 'Quantum Crystallography / Bloch Wave Theory',
-      application: 'Crystal band structure, electronic states in solids, quasicrystal physics',
-      equation: 'ψ(r) = e^(ik·r) u_k(r) (Bloch theorem)',
-      verification: 'Dimensional: [ψ] = [L^(-3/2)] ✓'
-    },
-    aries: {
-      name: 'Aries (Ram)',
-      description: 'V-shaped constellation representing the ram',
-      geometry: 'Angular momentum vector, directional thrust pattern',
-      constraint: 'Rotational kinetic energy with angular acceleration',
-      operator: 'L = r × p, τ = dL/dt',
-      physicsLaw: 'Angular Momentum Conservation / Torque Dynamics',
-      application: 'Gyroscopic motion, planetary rotation, spin angular momentum',
-      equation: 'τ = Iα (rotational analog of F = ma)',
-      verification: 'Dimensional: [τ] = [L²M/T²] ✓'
-    },
-    taurus: {
-      name: 'Taurus (Bull)',
-      description: 'V-shaped cluster with prominent bright stars',
-      geometry: 'Gravitational binding energy, cluster dynamics',
-      constraint: 'Stable bound system under mutual gravitational attraction',
-      operator: 'E = -GM²/2R (virial theorem)',
-      physicsLaw: 'Gravitational Binding / Virial Equilibrium',
-      application: 'Star cluster dynamics, galactic structure, dark matter halos',
-      equation: '2K + U = 0 (virial equilibrium)',
-      verification: 'Dimensional: [E] = [GM²/R] ✓'
-    },
-    gemini: {
-      name: 'Gemini (Twins)',
-      description: 'Two parallel bright stars in close proximity',
-      geometry: 'Binary system orbital mechanics, coupled oscillators',
-      constraint: 'Two-body problem with mutual gravitational interaction',
-      operator: 'μ d²r/dt² = -GMm/r² (reduced mass system)',
-      physicsLaw: 'Kepler Laws / Binary Star Dynamics',
-      application: 'Binary star systems, exoplanet detection, tidal forces',
-      equation: 'T² = 4π²a³/G(M₁+M₂) (Kepler\'s third law)',
-      verification: 'Dimensional: [T²] = [a³/GM] ✓'
-    },
-    cancer: {
-      name: 'Cancer (Crab)',
-      description: 'Faint cluster formation with central concentration',
-      geometry: 'Spherical symmetry with central density enhancement',
-      constraint: 'Hydrostatic equilibrium in spherical geometry',
-      operator: 'dP/dr = -ρ GM(r)/r² (hydrostatic equation)',
-      physicsLaw: 'Hydrostatic Equilibrium / Stellar Structure',
-      application: 'Stellar interiors, planetary atmospheres, gas giant structure',
-      equation: 'M(r) = 4π ∫₀ʳ ρ(r\')r\'² dr\'',
-      verification: 'Dimensional: [dP/dr] = [ρ][GM/r²] ✓'
-    },
-    leo: {
-      name: 'Leo (Lion)',
-      description: 'Distinctive sickle shape with bright central star',
-      geometry: 'Curved trajectory with central force field',
-      constraint: 'Orbital motion under inverse square law force',
-      operator: 'F = -GMm/r² r̂ (central force)',
-      physicsLaw: 'Central Force Motion / Orbital Mechanics',
-      application: 'Planetary orbits, satellite trajectories, comet paths',
-      equation: 'r = a(1-e²)/(1+e cos θ) (orbital equation)',
-      verification: 'Dimensional: [F] = [GMm/r²] ✓'
-    },
-    virgo: {
-      name: 'Virgo (Virgin)',
-      description: 'Large constellation with distributed stellar pattern',
-      geometry: 'Statistical mechanics of large N-body system',
-      constraint: 'Thermodynamic equilibrium in stellar population',
-      operator: 'S = k ln Ω (entropy of microstate distribution)',
-      physicsLaw: 'Statistical Mechanics / Thermodynamic Equilibrium',
-      application: 'Stellar populations, galactic evolution, phase transitions',
-      equation: 'dS = (1/T)dU + (P/T)dV - (μ/T)dN',
-      verification: 'Dimensional: [S] = [k] (entropy units) ✓'
-    },
-    libra: {
-      name: 'Libra (Scales)',
-      description: 'Balanced pattern suggesting equilibrium',
-      geometry: 'Dynamic equilibrium, force balance symmetry',
-      constraint: 'Mechanical equilibrium with balanced forces',
-      operator: 'ΣF = 0, Στ = 0 (equilibrium conditions)',
-      physicsLaw: 'Static Equilibrium / Force Balance',
-      application: 'Structural mechanics, lever systems, pressure equilibrium',
-      equation: 'F₁d₁ = F₂d₂ (lever principle)',
-      verification: 'Dimensional: [F][d] = [F][d] ✓'
-    },
-    scorpius: {
-      name: 'Scorpius (Scorpion)',
-      description: 'Curved S-shaped stellar arrangement',
-      geometry: 'Non-linear dynamics, chaotic trajectory patterns',
-      constraint: 'Sensitive dependence on initial conditions',
-      operator: 'dx/dt = f(x,y), dy/dt = g(x,y) (coupled ODEs)',
-      physicsLaw: 'Chaos Theory / Non-linear Dynamics',
-      application: 'Weather systems, fluid turbulence, population dynamics',
-      equation: 'λ = lim(t→∞) (1/t) ln|δx(t)/δx₀| (Lyapunov exponent)',
-      verification: 'Dimensional: [λ] = [1/T] ✓'
-    },
-    sagittarius: {
-      name: 'Sagittarius (Archer)',
-      description: 'Arrow-like directional pattern toward galactic center',
-      geometry: 'Directional vector field, flow toward central attractor',
-      constraint: 'Radial inflow with central mass concentration',
-      operator: '∇·v = -∇²Φ/4πG (continuity + Poisson)',
-      physicsLaw: 'Gravitational Flow / Accretion Dynamics',
-      application: 'Black hole accretion, galactic center dynamics, fluid inflow',
-      equation: 'dm/dt = 4πρ(r)r²v(r) (mass flow rate)',
-      verification: 'Dimensional: [dm/dt] = [ρ][r²][v] ✓'
-    },
-    capricornus: {
-      name: 'Capricornus (Sea Goat)',
-      description: 'Triangular pattern with hierarchical structure',
-      geometry: 'Fractal hierarchy, self-similar scaling structure',
-      constraint: 'Scale-invariant organization with power-law distribution',
-      operator: 'P(k) ∝ k^(-γ) (power-law scaling)',
-      physicsLaw: 'Scale-Free Networks / Critical Phenomena',
-      application: 'Phase transitions, percolation, network topology',
-      equation: 'ξ ∝ |T-Tc|^(-ν) (correlation length)',
-      verification: 'Dimensional: [ξ] = [L] ✓'
-    },
-    aquarius: {
-      name: 'Aquarius (Water Bearer)',
-      description: 'Flowing pattern suggesting fluid motion',
-      geometry: 'Fluid streamlines, continuous medium flow',
-      constraint: 'Incompressible fluid with conservation of mass',
-      operator: '∇·v = 0, ∂v/∂t + (v·∇)v = -∇P/ρ + ν∇²v',
-      physicsLaw: 'Navier-Stokes Equations / Fluid Dynamics',
-      application: 'Atmospheric flow, ocean currents, plasma dynamics',
-      equation: 'Re = ρvL/μ (Reynolds number)',
-      verification: 'Dimensional: [Re] = dimensionless ✓'
-    },
-    pisces: {
-      name: 'Pisces (Fish)',
-      description: 'Two connected loops suggesting wave interference',
-      geometry: 'Interfering wave patterns, standing wave formation',
-      constraint: 'Constructive/destructive interference of wave modes',
-      operator: 'ψ = ψ₁ + ψ₂ = A₁e^(ik₁·r) + A₂e^(ik₂·r)',
-      physicsLaw: 'Wave Interference / Superposition Principle',
-      application: 'Double-slit experiment, optical interference, quantum superposition',
-      equation: 'I = |ψ|² = |A₁|² + |A₂|² + 2Re(A₁*A₂e^(i(k₁-k₂)·r))',
-      verification: 'Dimensional: [I] = [|ψ|²] ✓'
+  useEffect(() => whenIdle(() => {
+    loadProjection()
+      .then((projection) => {
+        projectionRef.current = projection;
+      })
+      .catch(() => {});
+  }), []);
+
+  useEffect(() => {
+    if (imageAnalysis?.histogram) loadThreshold().catch(() => {});
+  }, [imageAnalysis]);
+
+  const getDecoder = () => {
+    if (!decoderRef.current) {
+      decoderRef.current = new DecoderClient();
     }
+    return decoderRef.current;
   };
 
-  const pipelineSteps = [
-    'Input Symbol Geometry',
-    'Extract Constraint Properties',
-    'Apply Field Operators',
-    'Solve Governing Equation',
-    'Verify Physical Validity'
-  ];
+  const pipelineSteps = PIPELINE_STAGE_LABELS.map(({ label }) => label);
+
+  // Kernel results are cached raw; nearest presets are looked up on display so
+  // they follow the current index (empty until it has loaded).
+  const presentResult = ({ analysis, features, pyramid, tiles, histogram, threshold: cutoff }, cached = false) => ({
+    ...analysis,
+    primitives: features.primitives,
+    features,
+    histogram,
+    threshold: cutoff,
+    pyramid,
+    tiles,
+    cached,
+    matches: projectionRef.current
+      ? projectionRef.current.index.search(projectionRef.current.signatureFromFeatures(features), 3)
+      : [],
+    projection: projectCurrentUpload(features)
+  });
+
+  // Each uploaded file is one row of the similarity matrix, keyed by its hash
+  // (or by the upload when hashing failed); decoding it again, at another
+  // threshold, replaces that row's features.
+  const projectCurrentUpload = (features) => {
+    if (!projectionRef.current) return null;
+    const { similarity, projectUpload, signatureFromFeatures } = projectionRef.current;
+    const { hash, file, token } = uploadRef.current;
+    const id = hash || `session-${token}`;
+    uploadNamesRef.current.set(id, file?.name || id);
+    const { presets, uploads } = projectUpload(similarity, id, signatureFromFeatures(features));
+    return {
+      fit: presets[0],
+      uploads: uploads.map(({ id: other, similarity }) => ({ name: uploadNamesRef.current.get(other) || other, similarity }))
+    };
+  };
 
-  const analyzeGeometricImage = (imageData, canvas) => {
+  const analyzeGeometricImage = async (canvas, cutoff) => {
     const ctx = canvas.getContext('2d');
     const width = canvas.width;
     const height = canvas.height;
 
     if (!ctx || width === 0 || height === 0) {
-      setError('Invalid canvas context or dimensions');
-      return null;
+      throw new Error('Invalid canvas context or dimensions');
     }
 
-    const data = ctx.getImageData(0, 0, width, height).data;
-    
-    let analysis = {
-      name: 'Custom Geometry',
-      description: 'Uploaded geometric form',
-      geometry: '',
-      constraint: '',
-      operator: '',
-      physicsLaw: '',
-      application: '',
-      equation: '',
-      verification: ''
-    };
+    const imageData = perf.time('getImageData', () => ctx.getImageData(0, 0, width, height));
+    return getDecoder().decode(imageData, {
+      onProgress: ({ index }) => setCurrentStep(index),
+      threshold: cutoff,
+      histogram: true
+    });
+  };
+
+  const drawPreview = (canvas, source) => {
+    const ctx = canvas.getContext('2d');
+
+    const maxSize = 400;
+    const scale = Math.min(maxSize / source.width, maxSize / source.height);
+    sizeCanvas(canvas, Math.floor(source.width * scale), Math.floor(source.height * scale));
+
+    perf.time('canvas draw', () => {
+      ctx.fillStyle = 'white';
+      ctx.fillRect(0, 0, canvas.width, canvas.height);
+      ctx.drawImage(source, 0, 0, canvas.width, canvas.height);
+    });
+  };
+
+  const trackDecode = (job, cacheKey) => {
+    setIsProcessing(true);
+    setCurrentStep(0);
+    setTileProgress(null);
+    job
+      .then((result) => {
+        if (cacheKey) putCachedResult(cacheKey, result);
+        setThresholdPreview(null);
+        setImageAnalysis(presentResult(result));
+        setMode('upload');
+        setIsProcessing(false);
+      })
+      .catch((err) => {
+        if (err.name === 'AbortError') return;
+        setError(err.message);
+        setIsProcessing(false);
+      });
+  };
+
+  const decodeCanvas = (canvas, cacheKey, cutoff) => trackDecode(analyzeGeometricImage(canvas, cutoff), cacheKey);
 
-    let pixelCount = 0;
-    let centerX = 0, centerY = 0;
-    let minX = width, maxX = 0, minY = height, maxY = 0;
-    
-    for (let y = 0; y < height; y++) {
-      for (let x = 0; x < width; x++) {
-        const idx = (y * width + x) * 4;
-        const r = data[idx];
-        const g = data[idx + 1];
-        const b = data[idx + 2];
-        const brightness = (r + g + b) / 3;
-        
-        if (brightness < 200) {
-          pixelCount++;
-          centerX += x;
-          centerY += y;
-          minX = Math.min(minX, x);
-          maxX = Math.max(maxX, x);
-          minY = Math.min(minY, y);
-          maxY = Math.max(maxY, y);
+  // Decodes straight from the File (no data URL) and lets the worker classify
+  // coarse-to-fine, only refining near a decision boundary.
+  const decodeFilePyramid = (file, cacheKey) => {
+    const token = uploadRef.current.token;
+    const job = perf.timeAsync('image decode', () => createImageBitmap(file))
+      .then((bitmap) => {
+        if (token !== uploadRef.current.token) {
+          bitmap.close();
+          throw abortError();
         }
-      }
-    }
+        if (canvasRef.current) drawPreview(canvasRef.current, bitmap);
+        return getDecoder().decodePyramid(bitmap, {
+          onProgress: ({ index }) => setCurrentStep(index)
+        });
+      });
+    trackDecode(job, cacheKey);
+  };
 
-    if (pixelCount < 100) {
-      setError('No significant geometric features detected in the image');
-      return null;
-    }
+  // Paints a downscaled preview once a tiled decode knows the full size.
+  const drawLargePreview = (file, { width, height }) => {
+    const scale = Math.min(1, 400 / Math.max(width, height));
+    createImageBitmap(file, {
+      resizeWidth: Math.max(1, Math.round(width * scale)),
+      resizeHeight: Math.max(1, Math.round(height * scale)),
+      resizeQuality: 'low'
+    })
+      .then((bitmap) => {
+        trackBitmap(bitmap);
+        if (canvasRef.current) drawPreview(canvasRef.current, bitmap);
+        closeBitmap(bitmap);
+      })
+      .catch(() => {});
+  };
+
+  const decodeFileTiled = (file, cacheKey) => {
+    setUploadedImage(file);
+    const job = getDecoder()
+      .decodeTiled(file, {
+        onProgress: ({ stage, index, total }) => {
+          if (stage === 'tile') setTileProgress({ index, total });
+          else setCurrentStep(index);
+        }
+      })
+      .then((result) => {
+        drawLargePreview(file, result.tiles);
+        return result;
+      });
+    trackDecode(job, cacheKey);
+  };
 
-    centerX = pixelCount > 0 ? centerX / pixelCount : width / 2;
-    centerY = pixelCount > 0 ? centerY / pixelCount : height / 2;
-
-    const aspectRatio = (maxX - minX) / (maxY - minY + 0.0001);
-    const fillRatio = pixelCount / (width * height);
-    const compactness = pixelCount / ((maxX - minX + 1) * (maxY - minY + 1));
-
-    let radialSymmetry = 0;
-    let circularityScore = 0;
-    const maxRadius = Math.min(width, height) / 2;
-    const angles = 32;
-    const radialSamples = [];
-
-    for (let angle = 0; angle < Math.PI * 2; angle += Math.PI / angles) {
-      let radialPixels = 0;
-      for (let r = 0; r < maxRadius; r += 2) {
-        const x = Math.round(centerX + r * Math.cos(angle));
-        const y = Math.round(centerY + r * Math.sin(angle));
-        if (x >= 0 && x < width && y >= 0 && y < height) {
-          const idx = (y * width + x) * 4;
-          const brightness = (data[idx] + data[idx + 1] + data[idx + 2]) / 3;
-          if (brightness < 200) radialPixels++;
+  // Decodes the File straight to a bitmap, paints the preview canvas and
+  // closes it; only the File itself stays referenced (no data URL or image
+  // element).
+  const decodeFileCanvas = (file, cacheKey, cutoff) => {
+    const token = uploadRef.current.token;
+    setUploadedImage(file);
+    perf.timeAsync('image decode', () => createImageBitmap(file))
+      .then((bitmap) => {
+        trackBitmap(bitmap);
+        const canvas = canvasRef.current;
+        if (token !== uploadRef.current.token || !canvas) {
+          closeBitmap(bitmap);
+          if (token === uploadRef.current.token) setIsProcessing(false);
+          return;
         }
-      }
-      radialSamples.push(radialPixels);
-      circularityScore += radialPixels;
+        drawPreview(canvas, bitmap);
+        closeBitmap(bitmap);
+        decodeCanvas(canvas, cacheKey, cutoff);
+      })
+      .catch((err) => {
+        setError(`Could not read that image: ${err.message}`);
+        setIsProcessing(false);
+      });
+  };
+
+  // A hit returns the stored analysis without drawing or decoding anything;
+  // the preview is painted afterwards and is not on the result path.
+  const showCachedResult = (file, result) => {
+    setThresholdPreview(null);
+    setImageAnalysis(presentResult(result, true));
+    setMode('upload');
+    setIsProcessing(false);
+    setCurrentStep(pipelineSteps.length);
+    setUploadedImage((current) => current || file);
+    if (result.tiles) {
+      drawLargePreview(file, result.tiles);
+      return;
     }
+    createImageBitmap(file)
+      .then((bitmap) => {
+        trackBitmap(bitmap);
+        if (canvasRef.current) drawPreview(canvasRef.current, bitmap);
+        closeBitmap(bitmap);
+      })
+      .catch(() => {});
+  };
 
-    const meanRadial = radialSamples.reduce((sum, val) => sum + val, 0) / radialSamples.length;
-    radialSymmetry = 1 - (radialSamples.reduce((sum, val) => sum + Math.abs(val - meanRadial), 0) / (meanRadial * radialSamples.length));
-
-    if (radialSymmetry > 0.85 && aspectRatio > 0.8 && aspectRatio < 1.2 && compactness > 0.3) {
-      analysis.geometry = 'Circular symmetry, high radial consistency';
-      analysis.constraint = 'Radial field divergence with central source';
-      analysis.operator = '∇ · E = ρ/ε₀';
-      analysis.physicsLaw = 'Coulomb Field / Point Source Divergence';
-      analysis.application = 'Electric monopole, gravitational point mass, scalar field source';
-      analysis.equation = '∇²Φ = -ρ/ε₀ (Poisson equation)';
-      analysis.verification = 'Dimensional: [∇²Φ] = [ρ]/[ε₀] ✓';
-    } else if (aspectRatio > 2 || aspectRatio < 0.5) {
-      analysis.geometry = 'Linear extension, directional anisotropy';
-      analysis.constraint = 'Unidirectional field propagation';
-      analysis.operator = '∂²u/∂x² = (1/c²)∂²u/∂t²';
-      analysis.physicsLaw = 'Wave Equation / Linear Propagation';
-      analysis.application = 'Electromagnetic waves, sound waves, vibrating strings';
-      analysis.equation = 'u(x,t) = A sin(kx - ωt)';
-      analysis.verification = 'Dimensional: [k²u] = [ω²u/c²] ✓';
-    } else if (fillRatio < 0.1) {
-      analysis.geometry = 'Sparse network topology, discrete nodes';
-      analysis.constraint = 'Discrete lattice with nearest-neighbor coupling';
-      analysis.operator = 'H|ψ⟩ = E|ψ⟩ with tight-binding model';
-      analysis.physicsLaw = 'Quantum Lattice / Tight-Binding Hamiltonian';
-      analysis.application = 'Crystal band structure, quantum dots, molecular orbitals';
-      analysis.equation = 'E = -2t cos(ka) (1D tight-binding)';
-      analysis.verification = 'Dimensional: [E] = [t] (energy units) ✓';
-    } else if (compactness < 0.5 && radialSymmetry < 0.7) {
-      analysis.geometry = 'Self-similar structure, fractal boundary conditions';
-      analysis.constraint = 'Scale-invariant field behavior with fractal dimension';
-      analysis.operator = '(-∇²)^(α/2) u = f (fractional Laplacian)';
-      analysis.physicsLaw = 'Fractional Diffusion / Anomalous Transport';
-      analysis.application = 'Turbulent mixing, porous media flow, biological membranes';
-      analysis.equation = '∂u/∂t = D_α (-∇²)^(α/2) u';
-      analysis.verification = 'Dimensional: [D_α] = [L^α]/[T] ✓';
+  // Hashes the file once per upload, then serves from the result cache or
+  // falls through to the selected decode path. Only the canvas path takes a
+  // threshold; tiled and coarse-to-fine decodes use the default.
+  const decodeUpload = async (file, cutoff = threshold) => {
+    const token = uploadRef.current.token;
+    const tiled = file.size > TILED_DECODE_THRESHOLD;
+    const params = {
+      multiResolution: multiResolution && !tiled,
+      maxSize: 400,
+      tiled,
+      threshold: tiled || multiResolution ? BRIGHTNESS_THRESHOLD : cutoff
+    };
+    setIsProcessing(true);
+    setCurrentStep(0);
+
+    let cacheKey = null;
+    let cached = null;
+    try {
+      uploadRef.current.hash = uploadRef.current.hash || await hashBlob(file);
+      cacheKey = resultCacheKey(uploadRef.current.hash, params);
+      cached = await getCachedResult(cacheKey);
+      setCacheStats(resultCacheStats());
+    } catch (err) {
+      // Hashing is an optimization; fall back to a plain decode.
+    }
+    if (token !== uploadRef.current.token) return;
+
+    if (cached) {
+      showCachedResult(file, cached);
+    } else if (tiled) {
+      decodeFileTiled(file, cacheKey);
+    } else if (multiResolution) {
+      setUploadedImage(file);
+      decodeFilePyramid(file, cacheKey);
     } else {
-      analysis.geometry = 'Complex multi-modal structure with mixed symmetries';
-      analysis.constraint = 'Superposition of multiple geometric modes';
-      analysis.operator = 'Φ(x) = Σ_i c_i φ_i(x) with ∇²φ_i = λ_iφ_i';
-      analysis.physicsLaw = 'Eigenmode Decomposition / Spectral Analysis';
-      analysis.application = 'Cavity resonances, structural vibrations, quantum confined states';
-      analysis.equation = 'λ_i = (nπ/L)² for 1D cavity modes';
-      analysis.verification = 'Dimensional: [λ] = [L⁻²] ✓';
+      decodeFileCanvas(file, cacheKey, cutoff);
     }
+  };
+
+  // Scrubbing re-derives the threshold-dependent features and the rule from
+  // the last decode's histogram (O(256), no pixels touched); releasing the
+  // slider or toggling Otsu re-decodes at the chosen threshold.
+  const scrubThreshold = (cutoff) => {
+    if (!imageAnalysis?.histogram) return;
+    const { histogram, features } = imageAnalysis;
+    loadThreshold()
+      .then(({ previewThreshold }) => setThresholdPreview(previewThreshold(histogram, cutoff, features)))
+      .catch(() => {});
+  };
+
+  // Only the canvas path takes a threshold (see decodeUpload), so the
+  // slider is disabled while a multi-resolution decode would ignore it.
+  const thresholdLocked = multiResolution;
 
-    analysis.description = `Analyzed geometric form with aspect ratio ${aspectRatio.toFixed(2)}, fill ratio ${fillRatio.toFixed(3)}, radial symmetry ${radialSymmetry.toFixed(2)}`;
-    
-    return analysis;
+  const commitThreshold = (cutoff) => {
+    if (thresholdLocked) return;
+    if (cutoff === threshold && cutoff === imageAnalysis?.threshold) return;
+    setThreshold(cutoff);
+    setError(null);
+    if (uploadRef.current.file) decodeUpload(uploadRef.current.file, cutoff);
   };
 
   const handleImageUpload = (event) => {
     setError(null);
+    decoderRef.current?.cancel();
+    uploadRef.current = { file: null, hash: null, token: uploadRef.current.token + 1 };
     const file = event.target.files[0];
     if (!file) {
       setError('No file selected');
@@ -363,63 +733,33 @@ const SacredGeometryDecoder = () => {
       setError('Please upload a valid image file (PNG, JPG, GIF)');
       return;
     }
-    if (file.size > 10 * 1024 * 1024) {
-      setError('Image size exceeds 10MB limit');
-      return;
-    }
 
-    const reader = new FileReader();
-    reader.onload = (e) => {
-      const img = new Image();
-      img.onload = () => {
-        setUploadedImage(img);
-        
-        const canvas = canvasRef.current;
-        const ctx = canvas.getContext('2d');
-        
-        const maxSize = 400;
-        const scale = Math.min(maxSize / img.width, maxSize / img.height);
-        canvas.width = img.width * scale;
-        canvas.height = img.height * scale;
-        
-        ctx.fillStyle = 'white';
-        ctx.fillRect(0, 0, canvas.width, canvas.height);
-        ctx.drawImage(img, 0, 0, canvas.width, canvas.height);
-        
-        const analysis = analyzeGeometricImage(e, canvas);
-        if (analysis) {
-          setImageAnalysis(analysis);
-          setMode('upload');
-        }
-      };
-      img.src = e.target.result;
-    };
-    reader.readAsDataURL(file);
+    uploadRef.current.file = file;
+    decodeUpload(file);
   };
 
+  // Uploads re-run the staged decode; presets already carry their derivation,
+  // so there is nothing to compute and the pipeline completes immediately.
   const runAnalysis = () => {
-    setIsProcessing(true);
-    setCurrentStep(0);
-    
-    const interval = setInterval(() => {
-      setCurrentStep(prev => {
-        if (prev < pipelineSteps.length - 1) {
-          return prev + 1;
-        } else {
-          setIsProcessing(false);
-          clearInterval(interval);
-          return prev;
-        }
-      });
-    }, 800);
+    setError(null);
+    if (mode === 'upload' && uploadRef.current.file) {
+      decodeUpload(uploadRef.current.file);
+      return;
+    }
+    setIsProcessing(false);
+    setCurrentStep(pipelineSteps.length);
   };
 
   const resetAnalysis = () => {
+    if (canvasRef.current) releaseCanvas(canvasRef.current);
     setCurrentStep(0);
     setIsProcessing(false);
     setUploadedImage(null);
     setImageAnalysis(null);
+    setThresholdPreview(null);
     setError(null);
+    decoderRef.current?.cancel();
+    uploadRef.current = { file: null, hash: null, token: uploadRef.current.token + 1 };
     setMode('preset');
     if (fileInputRef.current) {
       fileInputRef.current.value = '';
@@ -427,10 +767,24 @@ const SacredGeometryDecoder = () => {
   };
 
   const getCurrentSymbol = () => {
-    return mode === 'upload' && imageAnalysis ? imageAnalysis : presetSymbols[selectedSymbol];
+    if (mode !== 'upload' || !imageAnalysis) return presetEntry;
+    if (!thresholdPreview) return imageAnalysis;
+    const { features, rule } = thresholdPreview;
+    return {
+      ...imageAnalysis,
+      geometry: rule.geometry,
+      constraint: rule.constraint,
+      operator: rule.operator,
+      physicsLaw: rule.physicsLaw,
+      application: rule.application,
+      equation: rule.equation,
+      verification: rule.verification,
+      features
+    };
   };
 
   const currentSymbol = getCurrentSymbol();
+  const foreground = thresholdPreview?.features || imageAnalysis?.features;
 
   return (
     <div className="min-h-screen bg-gradient-to-br from-purple-900 via-blue-900 to-indigo-900 p-6">
@@ -443,6 +797,13 @@ const SacredGeometryDecoder = () => {
           <p className="text-blue-200 text-lg">
             Decode geometric patterns into fundamental physics equations
           </p>
+          <button
+            onClick={() => setShowPerfHud((shown) => !shown)}
+            className="mt-2 inline-flex items-center gap-1 text-xs text-blue-300 hover:text-white"
+          >
+            <Timer className="w-3 h-3" />
+            {showPerfHud ? 'Hide' : 'Show'} performance HUD
+          </button>
         </div>
 
         <div className="grid grid-cols-1 lg:grid-cols-2 gap-8">
@@ -453,7 +814,7 @@ const SacredGeometryDecoder = () => {
               Input Geometry
             </h2>
             
-            <div className="flex gap-4 mb-4">
+            <div className="flex flex-wrap gap-4 mb-4">
               <button
                 onClick={() => setMode('preset')}
                 className={`px-4 py-2 rounded-lg font-medium transition-colors ${
@@ -474,26 +835,33 @@ const SacredGeometryDecoder = () => {
               >
                 Upload Image
               </button>
+              <button
+                onClick={() => setMode('batch')}
+                className={`px-4 py-2 rounded-lg font-medium transition-colors ${
+                  mode === 'batch'
+                    ? 'bg-blue-500 text-white'
+                    : 'bg-white/10 text-blue-200 hover:bg-white/20'
+                }`}
+              >
+                Batch Decode
+              </button>
+              <button
+                onClick={() => setMode('video')}
+                className={`px-4 py-2 rounded-lg font-medium transition-colors ${
+                  mode === 'video'
+                    ? 'bg-blue-500 text-white'
+                    : 'bg-white/10 text-blue-200 hover:bg-white/20'
+                }`}
+              >
+                Live Video
+              </button>
             </div>
 
-            {mode === 'preset' ? (
-              <div className="space-y-3">
-                {Object.entries(presetSymbols).map(([key, symbol]) => (
-                  <button
-                    key={key}
-                    onClick={() => setSelectedSymbol(key)}
-                    className={`w-full p-3 rounded-lg text-left transition-colors ${
-                      selectedSymbol === key
-                        ? 'bg-blue-500/30 border border-blue-400'
-                        : 'bg-white/5 hover:bg-white/10 border border-white/10'
-                    }`}
-                  >
-                    <div className="text-white font-medium">{symbol.name}</div>
-                    <div className="text-blue-200 text-sm">{symbol.description}</div>
-                  </button>
-                ))}
-              </div>
-            ) : (
+            {mode === 'preset' && (
+              <CatalogPicker catalog={catalog} selected={selectedSymbol} onSelect={setSelectedSymbol} />
+            )}
+
+            {mode === 'upload' && (
               <div className="space-y-4">
                 <div className="border-2 border-dashed border-blue-400 rounded-lg p-8 text-center">
                   <input
@@ -511,6 +879,65 @@ const SacredGeometryDecoder = () => {
                     <span>Click to upload geometric image</span>
                   </button>
                 </div>
+
+                <label className="flex items-center gap-2 text-blue-200 text-sm">
+                  <input
+                    type="checkbox"
+                    checked={multiResolution}
+                    onChange={(e) => setMultiResolution(e.target.checked)}
+                  />
+                  Multi-resolution decode (coarse-to-fine)
+                </label>
+
+                {imageAnalysis?.histogram && (
+                  <div className="space-y-1">
+                    <label className="flex items-center justify-between text-blue-200 text-sm">
+                      Brightness threshold
+                      <span className="font-mono text-white">{thresholdPreview?.threshold ?? imageAnalysis.threshold}</span>
+                    </label>
+                    <input
+                      type="range"
+                      min="1"
+                      max="255"
+                      step="1"
+                      value={thresholdPreview?.threshold ?? imageAnalysis.threshold}
+                      onChange={(e) => scrubThreshold(Number(e.target.value))}
+                      onPointerUp={(e) => commitThreshold(Number(e.target.value))}
+                      onKeyUp={(e) => commitThreshold(Number(e.target.value))}
+                      disabled={thresholdLocked}
+                      className="w-full"
+                    />
+                    <label className="flex items-center gap-2 text-blue-200 text-sm">
+                      <input
+                        type="checkbox"
+                        checked={threshold === OTSU}
+                        disabled={thresholdLocked}
+                        onChange={(e) => {
+                          const cutoff = e.target.checked ? OTSU : imageAnalysis.threshold;
+                          scrubThreshold(cutoff);
+                          commitThreshold(cutoff);
+                        }}
+                      />
+                      Auto (Otsu)
+                    </label>
+                    {thresholdLocked && (
+                      <p className="text-blue-200 text-xs">
+                        Multi-resolution decodes use the default threshold ({BRIGHTNESS_THRESHOLD}).
+                      </p>
+                    )}
+                    <p className="text-blue-200 text-xs font-mono">
+                      {foreground.pixelCount} px · centroid ({Math.round(foreground.centerX)}, {Math.round(foreground.centerY)})
+                      {' '}· fill {foreground.fillRatio.toFixed(3)} · {currentSymbol.physicsLaw}
+                    </p>
+                  </div>
+                )}
+
+                <p className="text-blue-200 text-sm">
+                  Result cache: {cacheStats.hits} hits · {cacheStats.misses} misses
+                </p>
+                <p className="text-blue-200 text-sm">
+                  Image memory: {formatBytes(memoryStats.retainedBytes)} retained · {formatBytes(memoryStats.peakBytes)} peak
+                </p>
                 
                 {uploadedImage && (
                   <div className="bg-white/5 rounded-lg p-4">
@@ -523,6 +950,14 @@ const SacredGeometryDecoder = () => {
               </div>
             )}
 
+            <div className={mode === 'batch' ? '' : 'hidden'}>
+              <BatchDecoder />
+            </div>
+
+            <div className={mode === 'video' ? '' : 'hidden'}>
+              <VideoDecoder active={mode === 'video'} />
+            </div>
+
             {error && (
               <div className="mt-4 p-3 bg-red-500/20 border border-red-500/50 rounded-lg">
                 <p className="text-red-200 text-sm">{error}</p>
@@ -565,6 +1000,12 @@ const SacredGeometryDecoder = () => {
               ))}
             </div>
 
+            {isProcessing && tileProgress && (
+              <p className="text-blue-200 text-sm mb-4">
+                Decoding tile {tileProgress.index} of {tileProgress.total}
+              </p>
+            )}
+
             <div className="flex gap-3">
               <button
                 onClick={runAnalysis}
@@ -585,7 +1026,7 @@ const SacredGeometryDecoder = () => {
         </div>
 
         {/* Results Section */}
-        {currentStep >= pipelineSteps.length - 1 && (
+        {currentStep >= pipelineSteps.length && currentSymbol && (
           <div className="mt-8 bg-white/10 backdrop-blur-sm rounded-xl p-6 border border-white/20">
             <h2 className="text-xl font-semibold text-white mb-4 flex items-center gap-2">
               <Eye className="w-5 h-5" />
@@ -636,6 +1077,114 @@ const SacredGeometryDecoder = () => {
               <h3 className="text-green-300 font-medium mb-2">Dimensional Verification</h3>
               <p className="text-green-200 font-mono text-sm">{currentSymbol.verification}</p>
             </div>
+
+            {currentSymbol.matches?.length > 0 && (
+              <div className="mt-6 bg-white/5 rounded-lg p-4">
+                <h3 className="text-blue-300 font-medium mb-2">Nearest Presets</h3>
+                <div className="space-y-1">
+                  {currentSymbol.matches.map(({ key, distance }) => (
+                    <div key={key} className="flex justify-between text-sm">
+                      <span className="text-blue-200">{catalog ? catalog.name(key) : key}</span>
+                      <span className="text-white font-mono">{distance.toFixed(2)}</span>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
+
+            {currentSymbol.projection?.fit && (
+              <div className="mt-6 bg-white/5 rounded-lg p-4">
+                <h3 className="text-blue-300 font-medium mb-2">Cross-Domain Fit</h3>
+                <div className="flex justify-between text-sm">
+                  <span className="text-blue-200">{catalog ? catalog.name(currentSymbol.projection.fit.key) : currentSymbol.projection.fit.key}</span>
+                  <span className="text-white font-mono">{(currentSymbol.projection.fit.similarity * 100).toFixed(1)}%</span>
+                </div>
+                {currentSymbol.projection.uploads.length > 0 && (
+                  <div className="space-y-1 mt-3">
+                    <p className="text-blue-200 text-sm">Similar uploads</p>
+                    {currentSymbol.projection.uploads.map(({ name, similarity }) => (
+                      <div key={name} className="flex justify-between text-sm">
+                        <span className="text-blue-200 truncate">{name}</span>
+                        <span className="text-white font-mono">{(similarity * 100).toFixed(1)}%</span>
+                      </div>
+                    ))}
+                  </div>
+                )}
+              </div>
+            )}
+
+            {currentSymbol.primitives && (
+              <div className="mt-6 bg-white/5 rounded-lg p-4">
+                <h3 className="text-blue-300 font-medium mb-2">Geometric Primitives</h3>
+                <p className="text-blue-200 text-sm mb-2">
+                  {currentSymbol.primitives.circles.length} circles, {currentSymbol.primitives.lines.length} line segments
+                  {' '}from {currentSymbol.primitives.edgeCount} edge pixels
+                </p>
+                <div className="space-y-1">
+                  {currentSymbol.primitives.circles.slice(0, 8).map(({ x, y, r }, i) => (
+                    <div key={`c${i}`} className="flex justify-between text-sm">
+                      <span className="text-blue-200">Circle</span>
+                      <span className="text-white font-mono">({x.toFixed(0)}, {y.toFixed(0)}) r {r.toFixed(0)}</span>
+                    </div>
+                  ))}
+                  {currentSymbol.primitives.lines.slice(0, 8).map(({ x1, y1, x2, y2 }, i) => (
+                    <div key={`l${i}`} className="flex justify-between text-sm">
+                      <span className="text-blue-200">Line</span>
+                      <span className="text-white font-mono">({x1.toFixed(0)}, {y1.toFixed(0)}) → ({x2.toFixed(0)}, {y2.toFixed(0)})</span>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
+
+            {currentSymbol.features?.componentCount !== undefined && (
+              <div className="mt-6 bg-white/5 rounded-lg p-4">
+                <h3 className="text-blue-300 font-medium mb-2">Component Network</h3>
+                <p className="text-blue-200 text-sm mb-2">
+                  {currentSymbol.features.componentCount} components, {currentSymbol.features.componentEdges} adjacencies,
+                  {' '}mean degree {currentSymbol.features.meanDegree.toFixed(2)}, largest component {(currentSymbol.features.largestComponentShare * 100).toFixed(0)}% of the foreground
+                  {currentSymbol.features.degreeExponent !== null && (
+                    <>, power-law exponent γ = {currentSymbol.features.degreeExponent.toFixed(2)} (k ≥ {currentSymbol.features.degreeExponentMin})</>
+                  )}
+                </p>
+                <div className="space-y-1">
+                  {currentSymbol.features.degreeDistribution.slice(0, 8).map((nodes, degree) => (
+                    <div key={degree} className="flex justify-between text-sm">
+                      <span className="text-blue-200">Degree {degree}</span>
+                      <span className="text-white font-mono">{nodes} nodes</span>
+                    </div>
+                  ))}
+                </div>
+              </div>
+            )}
+
+            {currentSymbol.timings && (
+              <div className="mt-6 bg-white/5 rounded-lg p-4">
+                <h3 className="text-blue-300 font-medium mb-2">Stage Timings</h3>
+                <div className="space-y-1">
+                  {currentSymbol.timings.map(({ id, label, ms }) => (
+                    <div key={id} className="flex justify-between text-sm">
+                      <span className="text-blue-200">{label}</span>
+                      <span className="text-white font-mono">{ms.toFixed(2)} ms</span>
+                    </div>
+                  ))}
+                </div>
+                {currentSymbol.pyramid && (
+                  <p className="text-blue-200 text-sm mt-2">
+                    Decoded at {currentSymbol.pyramid.level.width}×{currentSymbol.pyramid.level.height} (1/{currentSymbol.pyramid.level.factor} scale),
+                    {' '}{currentSymbol.pyramid.attempts.length} of {currentSymbol.pyramid.levels} levels
+                  </p>
+                )}
+                {currentSymbol.tiles && (
+                  <p className="text-blue-200 text-sm mt-2">
+                    Decoded {currentSymbol.tiles.width}×{currentSymbol.tiles.height} {currentSymbol.tiles.scale > 1 ? `at 1/${currentSymbol.tiles.scale} scale` : 'at full resolution'} in {currentSymbol.tiles.count} tiles of {currentSymbol.tiles.tileSize}px
+                  </p>
+                )}
+                {currentSymbol.cached && (
+                  <p className="text-green-300 text-sm mt-2">Served from the result cache (timings are from the original decode)</p>
+                )}
+              </div>
+            )}
           </div>
         )}
       </div>
@@ -643,4 +1192,16 @@ const SacredGeometryDecoder = () => {
   );
 };
 
-export default SacredGeometryDecoder;
+// React commit times join the decode spans in the perf recorder (React only
+// calls onRender in development and profiling builds).
+const recordRender = (id, phase, actualDuration, baseDuration, startTime) => {
+  perf.record(`react ${phase}`, startTime, actualDuration);
+};
+
+const ProfiledDecoder = () => (
+  <Profiler id="decoder" onRender={recordRender}>
+    <SacredGeometryDecoder />
+  </Profiler>
+);
+
+export default ProfiledDecoder;
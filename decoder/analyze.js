@@ -0,0 +1,146 @@
+// The decoding kernel shared by the React decoder and index.html. Runs
+// without DOM access so it can execute inside a worker on a transferred pixel
+// buffer, and is deterministic: the same pixels always give the same output.
+// The stages mirror the pipeline shown in the React UI.
+//
+// Output schema (ANALYSIS_VERSION):
+//   features    raw measurements from features.js, connected components and
+//               their network from components.js, primitives from hough.js,
+//               spiral fit from logpolar.js
+//   analysis    the React decoder's symbol-shaped description, plus timings
+//   transcoder  index.html's result panel fields (transcoder.js), plus timings
+//   threshold   the brightness cutoff the foreground mask was built with
+//   histogram   only when requested: per-bin brightness stats (threshold.js)
+
+import { ANALYSIS_VERSION, BRIGHTNESS_THRESHOLD, PIPELINE_STAGE_LABELS } from './defaults.js';
+import { buildForegroundMask, extractFeatures, foregroundMaskFromBins } from './features.js';
+import { bufferPool } from './memory.js';
+import { describeFeatures, selectRule } from './classify.js';
+import { componentFeatures } from './components.js';
+import { primitiveFeatures } from './hough.js';
+import { spiralFeatures } from './logpolar.js';
+import { runStages } from './pipeline.js';
+import { OTSU, buildBrightnessHistogram, resolveThreshold } from './threshold.js';
+import { transcodeFeatures } from './transcoder.js';
+
+// The version lives in defaults.js so startup code can read it without the
+// kernel; bump it there whenever the output changes.
+export { ANALYSIS_VERSION };
+
+const inputGeometry = (state) => {
+  if (state.width === 0 || state.height === 0) {
+    throw new Error('Invalid canvas context or dimensions');
+  }
+  const { data, width, height } = state;
+  // The histogram is only built when asked for or needed to pick an Otsu
+  // threshold; its pass also records every pixel's bin, and the mask is cut
+  // from those instead of reading the RGBA buffer a second time.
+  if (state.keepHistogram || state.threshold === OTSU) {
+    const bins = bufferPool.acquire(Uint8Array, width * height);
+    state.histogram = buildBrightnessHistogram(data, width, height, bins);
+    state.threshold = resolveThreshold(state.histogram, state.threshold);
+    state.mask = foregroundMaskFromBins(bins, width, height, state.threshold);
+    bufferPool.release(bins);
+  } else {
+    state.mask = buildForegroundMask(data, width, height, state.threshold);
+  }
+};
+
+const extractConstraints = (state) => {
+  state.features = extractFeatures(state.mask);
+  if (state.features.pixelCount < 100) {
+    throw new Error('No significant geometric features detected in the image');
+  }
+};
+
+// Connected components, their adjacency graph and its degree distribution
+// (components.js).
+const labelConnectedComponents = (state) => {
+  Object.assign(state.features, componentFeatures(state.mask));
+};
+
+// Circles and line segments (hough.js); counts join the features so the
+// classification rules can use them.
+const extractGeometricPrimitives = (state) => {
+  Object.assign(state.features, primitiveFeatures(state.mask));
+};
+
+// Logarithmic-spiral growth rate from the log-polar remap (logpolar.js).
+const fitSpiral = (state) => {
+  Object.assign(state.features, spiralFeatures(state.mask, state.features));
+};
+
+const applyFieldOperators = (state) => {
+  const rule = selectRule(state.features);
+  state.rule = rule;
+  state.analysis = {
+    name: 'Custom Geometry',
+    description: 'Uploaded geometric form',
+    geometry: rule.geometry,
+    constraint: rule.constraint,
+    operator: rule.operator
+  };
+};
+
+const solveGoverningEquation = ({ rule, analysis }) => {
+  analysis.physicsLaw = rule.physicsLaw;
+  analysis.application = rule.application;
+  analysis.equation = rule.equation;
+};
+
+const verifyPhysicalValidity = ({ rule, analysis, features }) => {
+  analysis.verification = rule.verification;
+  analysis.description = describeFeatures(features);
+};
+
+const STAGE_RUNNERS = {
+  input: inputGeometry,
+  constraints: extractConstraints,
+  components: labelConnectedComponents,
+  primitives: extractGeometricPrimitives,
+  spiral: fitSpiral,
+  operators: applyFieldOperators,
+  equation: solveGoverningEquation,
+  verify: verifyPhysicalValidity
+};
+
+// Ids and labels come from defaults.js, which the front ends read at startup.
+export const PIPELINE_STAGES = PIPELINE_STAGE_LABELS.map((stage) => ({ ...stage, run: STAGE_RUNNERS[stage.id] }));
+
+const buildResult = (state, timings) => ({
+  version: ANALYSIS_VERSION,
+  features: state.features,
+  analysis: { ...state.analysis, timings },
+  transcoder: { ...transcodeFeatures(state.features, state.rule), timings },
+  threshold: state.threshold ?? BRIGHTNESS_THRESHOLD,
+  ...(state.keepHistogram && { histogram: state.histogram })
+});
+
+// `threshold` is a brightness cutoff or OTSU; with `histogram` the result
+// carries the brightness histogram for live threshold previews. The mask
+// buffer goes back to the pool afterwards; no output refers to it.
+export const analyzeGeometry = (data, width, height, {
+  onProgress,
+  threshold = BRIGHTNESS_THRESHOLD,
+  histogram = false
+} = {}) => {
+  const state = { data, width, height, threshold, keepHistogram: histogram };
+  try {
+    const timings = runStages(PIPELINE_STAGES, state, { onProgress });
+    return buildResult(state, timings);
+  } finally {
+    if (state.mask) bufferPool.release(state.mask.mask);
+  }
+};
+
+// Runs the stages after input on a mask assembled elsewhere (e.g. merged from
+// tiles); `inputMs` is reported as the input stage's time.
+export const analyzeMask = (mask, { onProgress, inputMs = 0 } = {}) => {
+  const [input, ...rest] = PIPELINE_STAGES;
+  const state = { mask, width: mask.width, height: mask.height };
+  onProgress?.(input.id, 1, PIPELINE_STAGES.length, inputMs);
+  const timings = runStages(rest, state, {
+    onProgress: (id, index, total, ms) => onProgress?.(id, index + 1, total + 1, ms)
+  });
+  return buildResult(state, [{ id: input.id, label: input.label, ms: inputMs }, ...timings]);
+};
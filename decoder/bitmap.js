@@ -0,0 +1,36 @@
+// ImageBitmap → RGBA helpers for worker-side decoding. Bitmaps are drawn onto
+// a white OffscreenCanvas (matching the upload path) and closed immediately.
+// The canvas is one reused scratch canvas, so decodes do not each allocate a
+// new backing store.
+
+import { scratchCanvas } from './memory.js';
+
+export const rasterize = (bitmap, width, height) => {
+  const canvas = scratchCanvas('rasterize', width, height);
+  const ctx = canvas.getContext('2d', { willReadFrequently: true });
+
+  ctx.fillStyle = 'white';
+  ctx.fillRect(0, 0, width, height);
+  ctx.drawImage(bitmap, 0, 0, width, height);
+  bitmap.close();
+
+  return ctx.getImageData(0, 0, width, height);
+};
+
+export const rasterizeToFit = (bitmap, maxSize) => {
+  const scale = Math.min(maxSize / bitmap.width, maxSize / bitmap.height);
+  return rasterize(bitmap, Math.floor(bitmap.width * scale), Math.floor(bitmap.height * scale));
+};
+
+// Rasterizes one region of `source` at full resolution, leaving `source` open
+// so a large image decoded once can be read tile by tile.
+export const rasterizeRegion = (source, x, y, width, height) => {
+  const canvas = scratchCanvas('rasterize', width, height);
+  const ctx = canvas.getContext('2d', { willReadFrequently: true });
+
+  ctx.fillStyle = 'white';
+  ctx.fillRect(0, 0, width, height);
+  ctx.drawImage(source, x, y, width, height, 0, 0, width, height);
+
+  return ctx.getImageData(0, 0, width, height);
+};
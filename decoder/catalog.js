@@ -0,0 +1,174 @@
+// Symbol catalog: the physics descriptions behind the preset picker and the
+// results panel. Full entries live in fixed-size JSON chunks under
+// catalog/chunks and are fetched only when an entry is opened;
+// catalog/index.json holds just what the picker renders (key, name,
+// description, category, chunk) plus a search index built ahead of time by
+// tools/build-catalog.mjs from catalog/source/*.json.
+//
+// The search index is the sorted list of every token with one posting list
+// (entry numbers, ascending) per token, so a prefix query is a binary search
+// to the first token with that prefix and a scan over its neighbours.
+
+export const CATALOG_VERSION = 1;
+export const CATALOG_CHUNK_SIZE = 64;
+
+const CHUNK_CACHE_LIMIT = 8;
+const CATALOG_ROOT = new URL('../catalog/', import.meta.url);
+const SEARCH_FIELDS = ['name', 'description', 'category', 'physicsLaw', 'application'];
+
+// Lowercase ASCII words with diacritics folded and camelCase split, so
+// "Ampère" finds "ampere" and the key "seedOfLife" finds "life".
+export const tokenize = (text) => (
+  text
+    .replace(/([a-z])([A-Z])/g, '$1 $2')
+    .normalize('NFKD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .split(/[^a-z0-9]+/)
+    .filter((token) => token.length > 1 || /\d/.test(token))
+);
+
+export const chunkFileName = (chunk) => `${String(chunk).padStart(3, '0')}.json`;
+
+// Index record for [key, entry] pairs in catalog order.
+export const buildCatalogIndex = (entries, chunkSize = CATALOG_CHUNK_SIZE) => {
+  const postings = new Map();
+  entries.forEach(([key, entry], i) => {
+    const texts = [key, ...SEARCH_FIELDS.map((field) => entry[field]), ...(entry.keywords || [])];
+    texts.filter(Boolean).forEach((text) => tokenize(text).forEach((token) => {
+      let list = postings.get(token);
+      if (!list) postings.set(token, list = []);
+      if (list[list.length - 1] !== i) list.push(i);
+    }));
+  });
+
+  const tokens = [...postings.keys()].sort();
+  return {
+    version: CATALOG_VERSION,
+    chunkSize,
+    entries: entries.map(([key, { name, description, category }], i) => (
+      [key, name, description, category, Math.floor(i / chunkSize)]
+    )),
+    tokens,
+    postings: tokens.map((token) => postings.get(token))
+  };
+};
+
+const lowerBound = (sorted, value) => {
+  let lo = 0;
+  let hi = sorted.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >> 1;
+    if (sorted[mid] < value) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+};
+
+export class CatalogIndex {
+  constructor(record, root = CATALOG_ROOT) {
+    this.root = root;
+    this.entries = record.entries;
+    this.tokens = record.tokens;
+    this.postings = record.postings;
+    this.positions = new Map(this.entries.map(([key], i) => [key, i]));
+    this.chunks = new Map();
+    this.all = this.entries.map((entry, i) => i);
+  }
+
+  get size() {
+    return this.entries.length;
+  }
+
+  has(key) {
+    return this.positions.has(key);
+  }
+
+  summary(i) {
+    const [key, name, description, category] = this.entries[i];
+    return { key, name, description, category };
+  }
+
+  name(key) {
+    const i = this.positions.get(key);
+    return i === undefined ? key : this.entries[i][1];
+  }
+
+  // Entry numbers matching every query term as a token prefix, best first:
+  // exact token matches beat prefix matches, then names starting with the
+  // query, then catalog order. An empty query lists the whole catalog.
+  search(query, limit = Infinity) {
+    const terms = tokenize(query);
+    if (!terms.length) return this.all.slice(0, limit);
+
+    const n = this.entries.length;
+    const scores = new Float64Array(n);
+    let candidates = null;
+    terms.forEach((term) => {
+      const termScores = new Uint8Array(n);
+      for (let t = lowerBound(this.tokens, term); t < this.tokens.length && this.tokens[t].startsWith(term); t++) {
+        const score = this.tokens[t] === term ? 2 : 1;
+        this.postings[t].forEach((i) => {
+          if (score > termScores[i]) termScores[i] = score;
+        });
+      }
+      candidates = (candidates || this.all).filter((i) => termScores[i] > 0);
+      candidates.forEach((i) => {
+        scores[i] += termScores[i];
+      });
+    });
+
+    const prefix = query.trim().toLowerCase();
+    candidates.forEach((i) => {
+      if (this.entries[i][1].toLowerCase().startsWith(prefix)) scores[i] += 1;
+    });
+    return candidates.sort((a, b) => scores[b] - scores[a] || a - b).slice(0, limit);
+  }
+
+  // Full entry, fetching its chunk on first use. Chunks are kept in a small
+  // LRU so browsing back and forth does not refetch.
+  async get(key) {
+    const i = this.positions.get(key);
+    if (i === undefined) return null;
+    const chunk = await this.loadChunk(this.entries[i][4]);
+    return { key, ...chunk[key] };
+  }
+
+  loadChunk(chunk) {
+    let promise = this.chunks.get(chunk);
+    if (promise) {
+      this.chunks.delete(chunk);
+    } else {
+      promise = fetch(new URL(`chunks/${chunkFileName(chunk)}`, this.root)).then((response) => {
+        if (!response.ok) throw new Error(`Catalog chunk ${chunk}: HTTP ${response.status}`);
+        return response.json();
+      });
+      promise.catch(() => this.chunks.delete(chunk));
+      if (this.chunks.size >= CHUNK_CACHE_LIMIT) {
+        this.chunks.delete(this.chunks.keys().next().value);
+      }
+    }
+    this.chunks.set(chunk, promise);
+    return promise;
+  }
+}
+
+let indexPromise = null;
+
+export const loadCatalogIndex = () => {
+  if (!indexPromise) {
+    indexPromise = fetch(new URL('index.json', CATALOG_ROOT))
+      .then((response) => {
+        if (!response.ok) throw new Error(`Catalog index: HTTP ${response.status}`);
+        return response.json();
+      })
+      .then((record) => {
+        if (record.version !== CATALOG_VERSION) throw new Error(`Catalog index is version ${record.version}`);
+        return new CatalogIndex(record);
+      });
+    indexPromise.catch(() => {
+      indexPromise = null;
+    });
+  }
+  return indexPromise;
+};
@@ -0,0 +1,150 @@
+// Classification rules that map extracted image features onto a physics
+// description with the same shape as the preset symbols. Rules are checked in
+// order; the last one always matches.
+
+export const CLASSIFICATION_RULES = [
+  {
+    id: 'interference',
+    test: ({ uniformCircleCount, lineCount }) => uniformCircleCount >= 13 && lineCount < 4,
+    geometry: 'Multiple interference nodes, periodic lattice of equal circles',
+    constraint: 'Multiple radial modes in interference pattern',
+    operator: 'Φ(x,t) = Σₙ ψₙ(x)e^(-iωₙt)',
+    physicsLaw: 'Wave Superposition / Harmonic Fields',
+    application: 'Optical interference, acoustic resonance, quantum superposition',
+    equation: '∇²ψₙ = -kₙ²ψₙ',
+    verification: 'Dimensional: [k²][ψ] = [∇²ψ] ✓'
+  },
+  {
+    id: 'spiral',
+    test: ({ spiralCoherence }) => spiralCoherence > 0.85,
+    geometry: 'Self-similar scaling, constant angular growth rate',
+    constraint: 'Logarithmic radial curve conserving angular growth',
+    operator: 'r(θ) = ae^(bθ)',
+    physicsLaw: 'Minimum Energy Scaling Path',
+    application: 'Galaxy arms, shell growth, fluid vortices, optimization paths',
+    equation: 'dE/dr = minimal for φ-scaling',
+    verification: 'Dimensional: [r] vs [θ] scaling consistent ✓'
+  },
+  {
+    id: 'hexagonal',
+    test: ({ symmetryOrder, symmetryStrength }) => symmetryOrder === 6 && symmetryStrength > 0.8,
+    geometry: 'Hexagonal arrangement, 6-fold rotational symmetry about a central point',
+    constraint: 'Radial divergence from core point',
+    operator: '∇ · Φ = ρ',
+    physicsLaw: "Gauss's Law / Field Divergence",
+    application: 'Electric field from point charges, gravitational field mapping',
+    equation: 'div(E) = ρ/ε₀',
+    verification: 'Dimensional: [E]/[L] = [ρ]/[ε₀] ✓'
+  },
+  {
+    id: 'radial',
+    test: ({ aspectRatio, compactness, radialSymmetry }) => (
+      radialSymmetry > 0.85 && aspectRatio > 0.8 && aspectRatio < 1.2 && compactness > 0.3
+    ),
+    geometry: 'Circular symmetry, high radial consistency',
+    constraint: 'Radial field divergence with central source',
+    operator: '∇ · E = ρ/ε₀',
+    physicsLaw: 'Coulomb Field / Point Source Divergence',
+    application: 'Electric monopole, gravitational point mass, scalar field source',
+    equation: '∇²Φ = -ρ/ε₀ (Poisson equation)',
+    verification: 'Dimensional: [∇²Φ] = [ρ]/[ε₀] ✓'
+  },
+  {
+    id: 'linear',
+    test: ({ aspectRatio }) => aspectRatio > 2 || aspectRatio < 0.5,
+    geometry: 'Linear extension, directional anisotropy',
+    constraint: 'Unidirectional field propagation',
+    operator: '∂²u/∂x² = (1/c²)∂²u/∂t²',
+    physicsLaw: 'Wave Equation / Linear Propagation',
+    application: 'Electromagnetic waves, sound waves, vibrating strings',
+    equation: 'u(x,t) = A sin(kx - ωt)',
+    verification: 'Dimensional: [k²u] = [ω²u/c²] ✓'
+  },
+  {
+    id: 'network',
+    test: ({ fillRatio }) => fillRatio < 0.1,
+    geometry: 'Sparse network topology, discrete nodes',
+    constraint: 'Discrete lattice with nearest-neighbor coupling',
+    operator: 'H|ψ⟩ = E|ψ⟩ with tight-binding model',
+    physicsLaw: 'Quantum Lattice / Tight-Binding Hamiltonian',
+    application: 'Crystal band structure, quantum dots, molecular orbitals',
+    equation: 'E = -2t cos(ka) (1D tight-binding)',
+    verification: 'Dimensional: [E] = [t] (energy units) ✓'
+  },
+  {
+    id: 'fractal',
+    test: ({ compactness, radialSymmetry }) => compactness < 0.5 && radialSymmetry < 0.7,
+    geometry: 'Self-similar structure, fractal boundary conditions',
+    constraint: 'Scale-invariant field behavior with fractal dimension',
+    operator: '(-∇²)^(α/2) u = f (fractional Laplacian)',
+    physicsLaw: 'Fractional Diffusion / Anomalous Transport',
+    application: 'Turbulent mixing, porous media flow, biological membranes',
+    equation: '∂u/∂t = D_α (-∇²)^(α/2) u',
+    verification: 'Dimensional: [D_α] = [L^α]/[T] ✓'
+  },
+  {
+    id: 'multimodal',
+    test: () => true,
+    geometry: 'Complex multi-modal structure with mixed symmetries',
+    constraint: 'Superposition of multiple geometric modes',
+    operator: 'Φ(x) = Σ_i c_i φ_i(x) with ∇²φ_i = λ_iφ_i',
+    physicsLaw: 'Eigenmode Decomposition / Spectral Analysis',
+    application: 'Cavity resonances, structural vibrations, quantum confined states',
+    equation: 'λ_i = (nπ/L)² for 1D cavity modes',
+    verification: 'Dimensional: [λ] = [L⁻²] ✓'
+  }
+];
+
+export const selectRule = (features) => CLASSIFICATION_RULES.find((rule) => rule.test(features));
+
+// Every feature a rule compares against a cutoff. symmetryOrder is left out:
+// the hexagonal rule matches it exactly, so any nudge would flip it.
+const SENSITIVE_FEATURES = [
+  'uniformCircleCount', 'lineCount', 'spiralCoherence', 'symmetryStrength',
+  'radialSymmetry', 'aspectRatio', 'compactness', 'fillRatio'
+];
+
+// True when nudging any single feature by ±tolerance (relative) would select a
+// different rule, i.e. the result is not stable under resampling.
+export const isNearBoundary = (features, tolerance = 0.05) => {
+  const { id } = selectRule(features);
+  return SENSITIVE_FEATURES.some((key) => {
+    const value = features[key];
+    if (!Number.isFinite(value)) return true;
+    return [1 - tolerance, 1 + tolerance].some((factor) => (
+      selectRule({ ...features, [key]: value * factor }).id !== id
+    ));
+  });
+};
+
+const describePrimitives = ({ primitives, circleCount, lineCount }) => {
+  if (!primitives) return '';
+  const radii = [...new Set(primitives.circles.map(({ r }) => Math.round(r)))].sort((a, b) => a - b);
+  const circles = circleCount
+    ? `${circleCount} circle${circleCount === 1 ? '' : 's'} (r ${radii.join(', ')}px)`
+    : 'no circles';
+  return `, ${circles} and ${lineCount} line segment${lineCount === 1 ? '' : 's'}`;
+};
+
+const describeComponents = ({ componentCount, componentEdges, degreeExponent }) => {
+  if (componentCount === undefined || componentCount < 2) return '';
+  const exponent = degreeExponent === null ? '' : `, degree exponent γ = ${degreeExponent.toFixed(2)}`;
+  return `, ${componentCount} connected components (${componentEdges} adjacencies${exponent})`;
+};
+
+const describeSpiral = ({ spiralCoherence, spiralGrowth, spiralPhiDeviation }) => (
+  spiralCoherence > 0.85
+    ? `, logarithmic spiral growth b = ${Math.abs(spiralGrowth).toFixed(3)} (${spiralPhiDeviation.toFixed(3)} from ln(φ)/π)`
+    : ''
+);
+
+const describeOrder = ({ symmetryOrder, symmetryStrength }) => (
+  symmetryOrder === 0
+    ? 'continuous rotational symmetry'
+    : `${symmetryOrder}-fold rotational symmetry (strength ${symmetryStrength.toFixed(2)})`
+);
+
+export const describeFeatures = (features) => {
+  const { aspectRatio, fillRatio, radialSymmetry } = features;
+  return `Analyzed geometric form with aspect ratio ${aspectRatio.toFixed(2)}, fill ratio ${fillRatio.toFixed(3)}, radial symmetry ${radialSymmetry.toFixed(2)}, ${describeOrder(features)}${describePrimitives(features)}${describeComponents(features)}${describeSpiral(features)}`;
+};
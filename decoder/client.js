@@ -0,0 +1,139 @@
+// Main-thread handle on the decode worker. Pixel buffers are transferred, not
+// copied, and starting a new decode aborts whatever is still in flight. Every
+// job's round trip (failed and aborted ones under their own span names) and
+// the worker's per-stage timings feed the perf recorder.
+
+import { memory } from './memory.js';
+import { perf } from './perf.js';
+
+export const createDecoderWorker = () => (
+  new Worker(new URL('./worker.js', import.meta.url), { type: 'module' })
+);
+
+export const abortError = () => new DOMException('Decode cancelled', 'AbortError');
+
+let clientCount = 0;
+
+export class DecoderClient {
+  constructor() {
+    this.worker = null;
+    this.pending = null;
+    this.nextId = 1;
+    this.memoryName = `worker ${++clientCount}`;
+  }
+
+  ensureWorker() {
+    if (!this.worker) {
+      this.worker = createDecoderWorker();
+      this.worker.onmessage = ({ data }) => this.handleMessage(data);
+      this.worker.onerror = (event) => {
+        event.preventDefault();
+        this.fail(new Error(event.message || 'Decoder worker failed'));
+      };
+    }
+    return this.worker;
+  }
+
+  handleMessage(message) {
+    if (message.type === 'memory') {
+      memory.setRemote(this.memoryName, message.stats);
+      return;
+    }
+
+    const job = this.pending;
+    if (!job || message.id !== job.id) return;
+
+    if (message.type === 'progress') {
+      if (message.at && message.ms !== undefined) {
+        perf.recordRemote(`stage:${message.stage}`, message.at, message.ms);
+      }
+      job.onProgress?.(message);
+    } else if (message.type === 'result') {
+      this.pending = null;
+      job.end();
+      const { type, id, ...result } = message;
+      job.resolve(result);
+    } else if (message.type === 'error') {
+      this.pending = null;
+      job.end('error');
+      job.reject(new Error(message.message));
+    }
+  }
+
+  run(message, transfer, onProgress) {
+    this.cancel();
+
+    return new Promise((resolve, reject) => {
+      const id = this.nextId++;
+      const end = perf.start(`worker ${message.type}`);
+      this.pending = { id, resolve, reject, onProgress, end };
+      this.ensureWorker().postMessage({ ...message, id }, transfer);
+    });
+  }
+
+  // `threshold` (a brightness cutoff or 'otsu') and `histogram` are passed
+  // to analyzeGeometry.
+  decode(imageData, { onProgress, threshold, histogram } = {}) {
+    const { data, width, height } = imageData;
+    return this.run(
+      { type: 'decode', width, height, buffer: data.buffer, threshold, histogram },
+      [data.buffer],
+      onProgress
+    );
+  }
+
+  decodeBitmap(bitmap, { maxSize } = {}) {
+    return this.run({ type: 'decodeBitmap', bitmap, maxSize }, [bitmap]);
+  }
+
+  decodePyramid(bitmap, { maxSize, tolerance, onProgress } = {}) {
+    return this.run(
+      { type: 'decodePyramid', bitmap, maxSize, tolerance },
+      [bitmap],
+      onProgress
+    );
+  }
+
+  // Files are structured-cloned by reference, so nothing needs transferring.
+  decodeTiled(file, { tileSize, onProgress } = {}) {
+    return this.run({ type: 'decodeTiled', file, tileSize }, [], onProgress);
+  }
+
+  // PLY/XYZ point clouds and raw volumes (volume-io.js). Progress reports
+  // bytes read as `index` of `total`; raw volumes take `width`, `height`,
+  // `depth`, `type` and `threshold`, or their size from the file name.
+  decodeVolume(file, { onProgress, ...options } = {}) {
+    return this.run({ type: 'decodeVolume', file, name: file.name, ...options }, [], onProgress);
+  }
+
+  fail(err) {
+    const job = this.pending;
+    this.pending = null;
+    if (this.worker) {
+      this.worker.terminate();
+      this.worker = null;
+      memory.removeRemote(this.memoryName);
+    }
+    if (job) {
+      job.end(err.name === 'AbortError' ? 'aborted' : 'error');
+      job.reject(err);
+    }
+  }
+
+  // A synchronous decode cannot observe messages, so the only way to stop it
+  // is to terminate the worker; a fresh one is spawned for the next job.
+  cancel() {
+    if (this.pending) {
+      this.fail(abortError());
+    }
+  }
+
+  dispose() {
+    this.cancel();
+    if (this.worker) {
+      this.worker.terminate();
+      this.worker = null;
+      memory.removeRemote(this.memoryName);
+    }
+  }
+}
@@ -0,0 +1,310 @@
+// Connected components and the network they form (node and network analysis).
+//
+// Labeling is the classic two-pass scheme with 8-connectivity: the first pass
+// gives every foreground pixel a provisional label from its already-visited
+// neighbours (W, NW, N, NE) and records equivalences in a flat-array
+// union-find; the second resolves every label to a compact component id and
+// accumulates area, centroid sums and bounding box per component in typed
+// arrays. Both passes are linear in the pixel count.
+//
+// Components never touch, so the graph links components that come within
+// about 2 × COMPONENT_LINK_RADIUS background pixels of each other: every
+// component grows into the background by breadth-first search, one front per
+// component, and an edge is recorded wherever two fronts meet. That is one
+// more linear pass, however many components there are.
+
+import { bufferPool } from './memory.js';
+import { poolMask } from './features.js';
+
+export const COMPONENT_LINK_RADIUS = 3;
+export const COMPONENT_MAX_SIZE = 1024;
+
+// Clauset-style fit: every distinct degree with at least this many nodes at
+// or above it is tried as k_min, keeping the one whose tail fits best.
+const POWER_LAW_MIN_TAIL = 10;
+
+const find = (parent, label) => {
+  let l = label;
+  while (parent[l] !== l) {
+    parent[l] = parent[parent[l]];
+    l = parent[l];
+  }
+  return l;
+};
+
+// The smaller root wins, so every root is the lowest label in its set.
+const union = (parent, a, b) => {
+  const ra = find(parent, a);
+  const rb = find(parent, b);
+  if (ra < rb) {
+    parent[rb] = ra;
+    return ra;
+  }
+  parent[ra] = rb;
+  return rb;
+};
+
+// Open-addressing set of component pairs (a < b, both 1-based) in typed
+// arrays. Packed a * count + b keys in a Set leave the small-integer fast
+// path once they pass 2^31, which dominated the graph pass on images with
+// tens of thousands of components.
+class PairSet {
+  constructor(capacity = 1024) {
+    this.size = 0;
+    this.allocate(capacity);
+  }
+
+  allocate(capacity) {
+    this.mask = capacity - 1;
+    this.first = new Int32Array(capacity);
+    this.second = new Int32Array(capacity);
+  }
+
+  add(a, b) {
+    let slot = (Math.imul(a, 0x9e3779b1) ^ Math.imul(b, 0x85ebca6b)) & this.mask;
+    while (this.first[slot]) {
+      if (this.first[slot] === a && this.second[slot] === b) return;
+      slot = (slot + 1) & this.mask;
+    }
+    this.first[slot] = a;
+    this.second[slot] = b;
+    if (++this.size * 2 > this.mask) this.grow();
+  }
+
+  grow() {
+    const { first, second } = this;
+    this.size = 0;
+    this.allocate(first.length * 2);
+    for (let slot = 0; slot < first.length; slot++) {
+      if (first[slot]) this.add(first[slot], second[slot]);
+    }
+  }
+
+  forEach(callback) {
+    for (let slot = 0; slot <= this.mask; slot++) {
+      if (this.first[slot]) callback(this.first[slot], this.second[slot]);
+    }
+  }
+}
+
+// `labels` holds 1-based component ids (0 is background) and comes from the
+// buffer pool; release it when done. Component ids follow raster order of
+// each component's first pixel.
+export const labelComponents = (mask, width, height) => {
+  const total = width * height;
+  const labels = bufferPool.acquire(Int32Array, total);
+  // New labels are never 8-adjacent, which bounds how many the first pass
+  // can create.
+  const parent = bufferPool.acquire(Int32Array, Math.ceil(width / 2) * Math.ceil(height / 2) + 1);
+  let next = 1;
+
+  for (let y = 0, i = 0; y < height; y++) {
+    for (let x = 0; x < width; x++, i++) {
+      if (!mask[i]) continue;
+      // A set N already joins W, NW and NE; otherwise W and NW are one set
+      // and only NE can bring in another.
+      let label = y > 0 ? labels[i - width] : 0;
+      if (!label) {
+        label = x > 0 ? labels[i - 1] || (y > 0 ? labels[i - width - 1] : 0) : 0;
+        const ne = y > 0 && x < width - 1 ? labels[i - width + 1] : 0;
+        if (ne) label = label ? union(parent, label, ne) : ne;
+      }
+      if (!label) {
+        label = next++;
+        parent[label] = label;
+      }
+      labels[i] = label;
+    }
+  }
+
+  // Links only ever point to lower labels, so in ascending order every
+  // non-root's parent already holds its set's compact id.
+  let count = 0;
+  for (let l = 1; l < next; l++) {
+    parent[l] = parent[l] === l ? ++count : parent[parent[l]];
+  }
+
+  const area = new Uint32Array(count);
+  const sumX = new Float64Array(count);
+  const sumY = new Float64Array(count);
+  const minX = new Int32Array(count).fill(width);
+  const maxX = new Int32Array(count).fill(-1);
+  const minY = new Int32Array(count).fill(height);
+  const maxY = new Int32Array(count).fill(-1);
+  for (let y = 0, i = 0; y < height; y++) {
+    for (let x = 0; x < width; x++, i++) {
+      if (!labels[i]) continue;
+      const id = parent[labels[i]];
+      labels[i] = id;
+      const c = id - 1;
+      area[c]++;
+      sumX[c] += x;
+      sumY[c] += y;
+      if (x < minX[c]) minX[c] = x;
+      if (x > maxX[c]) maxX[c] = x;
+      if (maxY[c] < 0) minY[c] = y;
+      maxY[c] = y;
+    }
+  }
+  bufferPool.release(parent);
+
+  const centerX = new Float64Array(count);
+  const centerY = new Float64Array(count);
+  for (let c = 0; c < count; c++) {
+    centerX[c] = sumX[c] / area[c];
+    centerY[c] = sumY[c] / area[c];
+  }
+
+  return { labels, count, area, centerX, centerY, minX, maxX, minY, maxY };
+};
+
+// Adjacency of the components in `labels` (as from labelComponents): the
+// degree of every component and the number of distinct edges.
+export const componentGraph = (labels, width, height, count, radius = COMPONENT_LINK_RADIUS) => {
+  const total = width * height;
+  const owner = bufferPool.acquire(Int32Array, total);
+  const depth = bufferPool.acquire(Uint8Array, total);
+  const queue = bufferPool.acquire(Int32Array, total);
+  const edges = new PairSet();
+  let tail = 0;
+
+  // Only foreground pixels on a component's edge can reach the background.
+  owner.set(labels.subarray(0, total));
+  for (let y = 0, i = 0; y < height; y++) {
+    for (let x = 0; x < width; x++, i++) {
+      if (owner[i] && (
+        (x > 0 && !owner[i - 1]) || (x < width - 1 && !owner[i + 1])
+        || (y > 0 && !owner[i - width]) || (y < height - 1 && !owner[i + width])
+      )) queue[tail++] = i;
+    }
+  }
+
+  // The same two fronts usually meet along a run of pixels, so repeats of
+  // the last pair skip the set.
+  let lastA = 0;
+  let lastB = 0;
+  for (let head = 0; head < tail; head++) {
+    const p = queue[head];
+    const a = owner[p];
+    const grow = depth[p] < radius;
+    const x = p % width;
+    for (let n = 0; n < 4; n++) {
+      let q;
+      if (n === 0) {
+        if (x === 0) continue;
+        q = p - 1;
+      } else if (n === 1) {
+        if (x === width - 1) continue;
+        q = p + 1;
+      } else if (n === 2) {
+        if (p < width) continue;
+        q = p - width;
+      } else {
+        if (p >= total - width) continue;
+        q = p + width;
+      }
+      const b = owner[q];
+      if (!b) {
+        if (grow) {
+          owner[q] = a;
+          depth[q] = depth[p] + 1;
+          queue[tail++] = q;
+        }
+      } else if (b !== a && !((a === lastA && b === lastB) || (a === lastB && b === lastA))) {
+        lastA = a;
+        lastB = b;
+        if (a < b) edges.add(a, b);
+        else edges.add(b, a);
+      }
+    }
+  }
+  bufferPool.release(owner);
+  bufferPool.release(depth);
+  bufferPool.release(queue);
+
+  const degrees = new Uint32Array(count);
+  edges.forEach((a, b) => {
+    degrees[a - 1]++;
+    degrees[b - 1]++;
+  });
+  return { degrees, edgeCount: edges.size };
+};
+
+// Nodes per degree: distribution[k] is the number of components with k
+// neighbours.
+export const degreeDistribution = (degrees) => {
+  let max = 0;
+  degrees.forEach((k) => {
+    if (k > max) max = k;
+  });
+  const distribution = new Array(max + 1).fill(0);
+  degrees.forEach((k) => {
+    distribution[k]++;
+  });
+  return distribution;
+};
+
+// Discrete power-law fit P(k) ∝ k^-γ by maximum likelihood (the k_min - 1/2
+// approximation), with k_min chosen to minimize the Kolmogorov-Smirnov
+// distance of the tail. Null when no tail has POWER_LAW_MIN_TAIL nodes.
+export const fitPowerLaw = (distribution, minTail = POWER_LAW_MIN_TAIL) => {
+  let best = null;
+  let tail = 0;
+  // Walking k_min downwards keeps the tail size incremental; the likelihood
+  // and KS sums depend on k_min and are recomputed over the distinct degrees.
+  for (let kMin = distribution.length - 1; kMin >= 1; kMin--) {
+    if (!distribution[kMin]) continue;
+    tail += distribution[kMin];
+    if (tail < minTail) continue;
+
+    let logSum = 0;
+    for (let k = kMin; k < distribution.length; k++) {
+      if (distribution[k]) logSum += distribution[k] * Math.log((k - 0.5) / (kMin - 0.5));
+    }
+    if (logSum <= 0) continue;
+    const exponent = 1 + tail / logSum;
+
+    // KS distance between the empirical and fitted P(K ≥ k) over the tail.
+    let above = tail;
+    let distance = 0;
+    for (let k = kMin; k < distribution.length; k++) {
+      if (!distribution[k]) continue;
+      const model = ((k - 0.5) / (kMin - 0.5)) ** (1 - exponent);
+      distance = Math.max(distance, Math.abs(above / tail - model));
+      above -= distribution[k];
+    }
+    if (!best || distance < best.distance) best = { exponent, kMin, tail, distance };
+  }
+  return best;
+};
+
+// Component and network features for a foreground mask from features.js.
+// Tiled decodes never hold the full mask, so their overview is labeled
+// instead (areas and the link radius are then in overview pixels). Masks are
+// OR-pooled to COMPONENT_MAX_SIZE first, like the other shape stages.
+export const componentFeatures = ({ mask, width, height, overview }) => {
+  const source = mask ? { mask, width, height } : overview;
+  const work = poolMask(source.mask, source.width, source.height, COMPONENT_MAX_SIZE);
+  const components = labelComponents(work.mask, work.width, work.height);
+  const { labels, count, area } = components;
+  const { degrees, edgeCount } = componentGraph(labels, work.width, work.height, count);
+  bufferPool.release(labels);
+
+  let largest = 0;
+  let covered = 0;
+  area.forEach((a) => {
+    if (a > largest) largest = a;
+    covered += a;
+  });
+  const distribution = degreeDistribution(degrees);
+  const fit = fitPowerLaw(distribution);
+  return {
+    componentCount: count,
+    componentEdges: edgeCount,
+    largestComponentShare: covered ? largest / covered : 0,
+    meanDegree: count ? (2 * edgeCount) / count : 0,
+    degreeDistribution: distribution,
+    degreeExponent: fit ? fit.exponent : null,
+    degreeExponentMin: fit ? fit.kMin : null
+  };
+};
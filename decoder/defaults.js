@@ -0,0 +1,22 @@
+// What the front ends need from the kernel before it has loaded: the output
+// version, the default threshold and the pipeline's stage ids and labels.
+// This module has no imports, so startup code can use it without pulling in
+// analyze.js and everything behind it; the kernel loads on first decode.
+
+// Bump whenever the output changes for the same pixels; persisted results and
+// the golden corpus (tools/golden.mjs) from older versions are then stale.
+export const ANALYSIS_VERSION = 8;
+
+export const BRIGHTNESS_THRESHOLD = 200;
+export const OTSU = 'otsu';
+
+export const PIPELINE_STAGE_LABELS = [
+  { id: 'input', label: 'Input Symbol Geometry' },
+  { id: 'constraints', label: 'Extract Constraint Properties' },
+  { id: 'components', label: 'Label Connected Components' },
+  { id: 'primitives', label: 'Extract Geometric Primitives' },
+  { id: 'spiral', label: 'Fit Log-Polar Spiral' },
+  { id: 'operators', label: 'Apply Field Operators' },
+  { id: 'equation', label: 'Solve Governing Equation' },
+  { id: 'verify', label: 'Verify Physical Validity' }
+];
@@ -0,0 +1,163 @@
+// Foreground feature extraction for uploaded geometry.
+//
+// The RGBA buffer is read exactly once, through a Uint32Array view, into a
+// packed foreground mask plus per-row and per-column counts. Every later
+// feature (centroid, bounding box, fill, compactness, radial profile) is
+// derived from those arrays instead of going back to the raw pixels.
+
+import { BRIGHTNESS_THRESHOLD } from './defaults.js';
+import { bufferPool } from './memory.js';
+import { angularProfile, polarTable, rotationalSymmetry } from './polar.js';
+
+export { BRIGHTNESS_THRESHOLD };
+
+const LITTLE_ENDIAN = new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+const R_SHIFT = LITTLE_ENDIAN ? 0 : 24;
+const G_SHIFT = LITTLE_ENDIAN ? 8 : 16;
+const B_SHIFT = LITTLE_ENDIAN ? 16 : 8;
+
+const pixelView = (data, pixelCount) => {
+  if (data.byteOffset % 4 === 0) {
+    return new Uint32Array(data.buffer, data.byteOffset, pixelCount);
+  }
+  return new Uint32Array(data.slice(0, pixelCount * 4).buffer);
+};
+
+export const buildForegroundMask = (data, width, height, threshold = BRIGHTNESS_THRESHOLD) => {
+  const total = width * height;
+  const pixels = pixelView(data, total);
+  const mask = bufferPool.acquire(Uint8Array, total);
+  const rowSums = new Uint32Array(height);
+  const colSums = new Uint32Array(width);
+  // (r + g + b) / 3 < threshold, compared on the integer channel sum.
+  const limit = threshold * 3;
+  let count = 0;
+  let i = 0;
+
+  for (let y = 0; y < height; y++) {
+    let rowCount = 0;
+    for (let x = 0; x < width; x++, i++) {
+      const p = pixels[i];
+      const sum = ((p >>> R_SHIFT) & 0xff) + ((p >>> G_SHIFT) & 0xff) + ((p >>> B_SHIFT) & 0xff);
+      if (sum < limit) {
+        mask[i] = 1;
+        colSums[x]++;
+        rowCount++;
+      }
+    }
+    rowSums[y] = rowCount;
+    count += rowCount;
+  }
+
+  return { mask, rowSums, colSums, count, width, height };
+};
+
+// The same mask from per-pixel brightness bins (buildBrightnessHistogram's
+// `bins`): bin < threshold ⇔ r + g + b < 3 · threshold, so it matches
+// buildForegroundMask bit for bit.
+export const foregroundMaskFromBins = (bins, width, height, threshold = BRIGHTNESS_THRESHOLD) => {
+  const mask = bufferPool.acquire(Uint8Array, width * height);
+  const rowSums = new Uint32Array(height);
+  const colSums = new Uint32Array(width);
+  let count = 0;
+  let i = 0;
+
+  for (let y = 0; y < height; y++) {
+    let rowCount = 0;
+    for (let x = 0; x < width; x++, i++) {
+      if (bins[i] < threshold) {
+        mask[i] = 1;
+        colSums[x]++;
+        rowCount++;
+      }
+    }
+    rowSums[y] = rowCount;
+    count += rowCount;
+  }
+
+  return { mask, rowSums, colSums, count, width, height };
+};
+
+// OR-pools a mask so its longer side is at most maxSize.
+export const poolMask = (mask, width, height, maxSize) => {
+  const scale = Math.max(1, Math.ceil(Math.max(width, height) / maxSize));
+  if (scale === 1) return { mask, width, height, scale };
+
+  const w = Math.ceil(width / scale);
+  const h = Math.ceil(height / scale);
+  const pooled = new Uint8Array(w * h);
+  for (let y = 0, i = 0; y < height; y++) {
+    const row = Math.floor(y / scale) * w;
+    for (let x = 0; x < width; x++, i++) {
+      if (mask[i]) pooled[row + Math.floor(x / scale)] = 1;
+    }
+  }
+  return { mask: pooled, width: w, height: h, scale };
+};
+
+// `overview` (optional) is a downsampled mask used for the polar profile when
+// the full-resolution mask was never held in memory, as in tiled decoding.
+const polarProfile = (mask, width, height, centerX, centerY, overview) => {
+  if (!overview) return angularProfile(mask, polarTable(width, height, centerX, centerY));
+  const { scale } = overview;
+  return angularProfile(overview.mask, polarTable(
+    overview.width,
+    overview.height,
+    (centerX + 0.5) / scale - 0.5,
+    (centerY + 0.5) / scale - 0.5
+  ));
+};
+
+export const extractFeatures = ({ mask, rowSums, colSums, count, width, height, overview }) => {
+  let sumX = 0, sumY = 0;
+  let minX = width, maxX = 0, minY = height, maxY = 0;
+
+  for (let x = 0; x < width; x++) {
+    const n = colSums[x];
+    if (n) {
+      sumX += x * n;
+      if (x < minX) minX = x;
+      maxX = x;
+    }
+  }
+  for (let y = 0; y < height; y++) {
+    const n = rowSums[y];
+    if (n) {
+      sumY += y * n;
+      if (y < minY) minY = y;
+      maxY = y;
+    }
+  }
+
+  const centerX = count > 0 ? sumX / count : width / 2;
+  const centerY = count > 0 ? sumY / count : height / 2;
+
+  const aspectRatio = (maxX - minX) / (maxY - minY + 0.0001);
+  const fillRatio = count / (width * height);
+  const compactness = count / ((maxX - minX + 1) * (maxY - minY + 1));
+
+  const { hits: radialSamples, extent } = polarProfile(mask, width, height, centerX, centerY, overview);
+  const { symmetryOrder, symmetryStrength } = rotationalSymmetry(extent);
+  const meanRadial = radialSamples.reduce((sum, val) => sum + val, 0) / radialSamples.length;
+  const radialSymmetry = 1 - (radialSamples.reduce((sum, val) => sum + Math.abs(val - meanRadial), 0) / (meanRadial * radialSamples.length));
+
+  return {
+    width,
+    height,
+    pixelCount: count,
+    centerX,
+    centerY,
+    minX,
+    maxX,
+    minY,
+    maxY,
+    aspectRatio,
+    fillRatio,
+    compactness,
+    radialSamples,
+    radialExtent: extent,
+    radialSymmetry,
+    symmetryOrder,
+    symmetryStrength
+  };
+};
@@ -0,0 +1,63 @@
+// Iterative radix-2 FFT for short real signals (angular profiles). Twiddle
+// factors are computed once per transform size.
+
+const twiddleCache = new Map();
+
+const twiddles = (n) => {
+  let table = twiddleCache.get(n);
+  if (!table) {
+    table = { cos: new Float64Array(n / 2), sin: new Float64Array(n / 2) };
+    for (let k = 0; k < n / 2; k++) {
+      table.cos[k] = Math.cos((2 * Math.PI * k) / n);
+      table.sin[k] = -Math.sin((2 * Math.PI * k) / n);
+    }
+    twiddleCache.set(n, table);
+  }
+  return table;
+};
+
+// Returns |X_k|² for k = 0..n/2. `signal.length` must be a power of two.
+export const powerSpectrum = (signal) => {
+  const n = signal.length;
+  if (n & (n - 1)) {
+    throw new Error(`FFT size must be a power of two, got ${n}`);
+  }
+
+  const re = Float64Array.from(signal);
+  const im = new Float64Array(n);
+
+  for (let i = 1, j = 0; i < n; i++) {
+    let bit = n >> 1;
+    for (; j & bit; bit >>= 1) j ^= bit;
+    j ^= bit;
+    if (i < j) {
+      const t = re[i]; re[i] = re[j]; re[j] = t;
+    }
+  }
+
+  const { cos, sin } = twiddles(n);
+  for (let size = 2; size <= n; size <<= 1) {
+    const half = size >> 1;
+    const stride = n / size;
+    for (let start = 0; start < n; start += size) {
+      for (let k = 0; k < half; k++) {
+        const wr = cos[k * stride];
+        const wi = sin[k * stride];
+        const a = start + k;
+        const b = a + half;
+        const tr = re[b] * wr - im[b] * wi;
+        const ti = re[b] * wi + im[b] * wr;
+        re[b] = re[a] - tr;
+        im[b] = im[a] - ti;
+        re[a] += tr;
+        im[a] += ti;
+      }
+    }
+  }
+
+  const power = new Float64Array(n / 2 + 1);
+  for (let k = 0; k <= n / 2; k++) {
+    power[k] = re[k] * re[k] + im[k] * im[k];
+  }
+  return power;
+};
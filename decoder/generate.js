@@ -0,0 +1,88 @@
+// Encode-mode geometry generators. Each pattern is built into a single path
+// (a Path2D in browsers) and stroked once, in a 400×400 coordinate space, so
+// the same code serves the generator worker and the headless benchmark corpus.
+
+export const GENERATOR_SIZE = 400;
+export const GENERATOR_PATTERNS = ['radial', 'linear', 'network', 'fractal'];
+export const FRACTAL_DEPTH = 3;
+
+// Iterative so depth is bounded by memory, not the call stack.
+const addFractal = (path, x, y, size, depth) => {
+  const stack = [[x, y, size, depth]];
+  while (stack.length) {
+    const [cx, cy, s, d] = stack.pop();
+    if (d === 0) continue;
+    path.rect(cx - s/2, cy - s/2, s, s);
+
+    const next = s / 3;
+    stack.push(
+      [cx - s/3, cy - s/3, next, d - 1],
+      [cx + s/3, cy - s/3, next, d - 1],
+      [cx - s/3, cy + s/3, next, d - 1],
+      [cx + s/3, cy + s/3, next, d - 1]
+    );
+  }
+};
+
+export const buildGeometryPath = (params, path) => {
+  const centerX = 200, centerY = 200, scale = params.scaleFactor;
+
+  switch (params.patternType) {
+    case 'radial':
+      for (let i = 0; i < 8; i++) {
+        const angle = (i / 8) * Math.PI * 2;
+        const radius = scale * params.symmetryScore;
+        const x = centerX + Math.cos(angle) * radius/2;
+        const y = centerY + Math.sin(angle) * radius/2;
+        // Start a new subpath so consecutive circles are not joined.
+        path.moveTo(x + 20, y);
+        path.arc(x, y, 20, 0, Math.PI * 2);
+      }
+      break;
+    case 'linear':
+      for (let i = 0; i < 5; i++) {
+        path.moveTo(50, 100 + i * 50);
+        path.lineTo(350, 100 + i * 50 + Math.sin(i) * 20);
+      }
+      break;
+    case 'network': {
+      const gridSize = 40;
+      for (let x = 0; x < 10; x++) {
+        for (let y = 0; y < 10; y++) {
+          path.rect(x * gridSize, y * gridSize, gridSize/2, gridSize/2);
+        }
+      }
+      break;
+    }
+    case 'fractal':
+      addFractal(path, centerX, centerY, scale/2, params.fractalDepth ?? FRACTAL_DEPTH);
+      break;
+  }
+  return path;
+};
+
+export const drawGeometry = (ctx, params, createPath = () => new Path2D()) => {
+  ctx.fillStyle = 'white';
+  ctx.fillRect(0, 0, GENERATOR_SIZE, GENERATOR_SIZE);
+  ctx.strokeStyle = '#1e40af';
+  ctx.lineWidth = 2;
+  ctx.stroke(buildGeometryPath(params, createPath()));
+};
+
+// The parameters each pattern's path actually reads; the others leave its
+// pixels unchanged.
+export const GENERATOR_INPUTS = {
+  radial: ['symmetryScore', 'scaleFactor'],
+  linear: [],
+  network: [],
+  fractal: ['scaleFactor', 'fractalDepth']
+};
+
+// Identifies the rendered pixels: the pattern and the inputs it reads, in a
+// fixed order, so parameter sets that draw the same image share one key.
+export const geometryKey = (params) => {
+  const { patternType } = params;
+  const inputs = GENERATOR_INPUTS[patternType] || ['symmetryScore', 'scaleFactor', 'fractalDepth'];
+  const value = (name) => (name === 'fractalDepth' ? params.fractalDepth ?? FRACTAL_DEPTH : params[name]);
+  return [patternType, ...inputs.map(value)].join('|');
+};
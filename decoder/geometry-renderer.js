@@ -0,0 +1,73 @@
+// Main-thread front for encode-mode rendering. Geometry is drawn on an
+// OffscreenCanvas in the worker and returned as an ImageBitmap; bitmaps are
+// memoized by parameter tuple, and while one render is in flight only the most
+// recent request is kept, so scrubbing a slider never queues stale frames.
+
+import { DecoderClient } from './client.js';
+import { geometryKey } from './generate.js';
+import { closeBitmap, trackBitmap } from './memory.js';
+
+export const GEOMETRY_CACHE_SIZE = 64;
+
+export class GeometryRenderer {
+  constructor({ cacheSize = GEOMETRY_CACHE_SIZE } = {}) {
+    this.client = new DecoderClient();
+    this.cacheSize = cacheSize;
+    this.cache = new Map();
+    this.busy = false;
+    this.queued = null;
+  }
+
+  remember(key, bitmap) {
+    this.cache.set(key, trackBitmap(bitmap));
+    if (this.cache.size > this.cacheSize) {
+      const [oldest, evicted] = this.cache.entries().next().value;
+      this.cache.delete(oldest);
+      closeBitmap(evicted);
+    }
+  }
+
+  // Resolves to an ImageBitmap owned by the cache (draw it, do not close it),
+  // or to null when a newer request superseded this one before it started.
+  render(params) {
+    const key = geometryKey(params);
+    const hit = this.cache.get(key);
+    if (hit) {
+      this.cache.delete(key);
+      this.cache.set(key, hit);
+      return Promise.resolve(hit);
+    }
+
+    return new Promise((resolve, reject) => {
+      if (this.busy) {
+        this.queued?.resolve(null);
+        this.queued = { params, resolve, reject };
+        return;
+      }
+      this.start(key, params, resolve, reject);
+    });
+  }
+
+  start(key, params, resolve, reject) {
+    this.busy = true;
+    this.client.run({ type: 'generate', params }, [])
+      .then(({ bitmap }) => {
+        this.remember(key, bitmap);
+        resolve(bitmap);
+      }, reject)
+      .finally(() => {
+        this.busy = false;
+        const next = this.queued;
+        this.queued = null;
+        if (next) this.render(next.params).then(next.resolve, next.reject);
+      });
+  }
+
+  dispose() {
+    this.client.dispose();
+    this.cache.forEach(closeBitmap);
+    this.cache.clear();
+    this.queued?.resolve(null);
+    this.queued = null;
+  }
+}
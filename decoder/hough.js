@@ -0,0 +1,483 @@
+// Primitive extraction (Pipeline.md stage 1, Symbolic Abstraction): circles
+// and line segments recovered from the foreground mask with gradient-directed
+// Hough transforms.
+//
+// Only boundary pixels vote, and each votes along its own gradient: a circle
+// edge votes for centres along its normal (one line of radii, not a cone), a
+// line edge for the few (θ, ρ) cells near its normal angle. Votes go into
+// block-sparse accumulators, so cost and memory follow the edge count rather
+// than image area × radius range. Large masks are OR-pooled down to
+// HOUGH_MAX_SIZE first and results are scaled back to image pixels.
+//
+// Circle voting is bounded on both axes: radii are voted on a ladder every
+// RADIUS_STEP pixels, and at most MAX_VOTING_EDGES edges vote, each sampled
+// vote weighted to stand for the ones skipped. Only candidates whose smoothed
+// peak is a fair share of the strongest go on to the O(edges) verification,
+// and masks with too few edges for any primitive, or so many that they are
+// texture rather than strokes, skip detection altogether.
+
+import { poolMask } from './features.js';
+
+export const HOUGH_MAX_SIZE = 512;
+export const HOUGH_MIN_RADIUS = 8;
+export const HOUGH_MIN_LINE = 24;
+
+const THETA_BINS = 180;
+const THETA_SPREAD = 3;
+const GRADIENT_RADIUS = 3;
+const RADIAL_ALIGNMENT = 0.95;
+const CIRCLE_DENSITY = 0.5;
+const CIRCLE_SECTORS = 32;
+const CIRCLE_COVERAGE = 0.8;
+const MAX_CENTER_CANDIDATES = 1024;
+const RADIUS_STEP = 2;
+const MAX_VOTING_EDGES = 4096;
+const CANDIDATE_PEAK_FRACTION = 0.1;
+const CONFIRMED_SPACING = 3;
+const MAX_EDGE_FRACTION = 0.25;
+// Fewest edges that can make the shortest line or a minimum-radius circle.
+const MIN_PRIMITIVE_EDGES = Math.min(HOUGH_MIN_LINE, Math.ceil(CIRCLE_DENSITY * 2 * Math.PI * HOUGH_MIN_RADIUS));
+const MIN_CELL_VOTES = 3;
+const PREFILTER_STRIDE = 4;
+const PREFILTER_SLACK = 0.5;
+const RADIUS_MARGIN = 2;
+const GRID_CELL = 16;
+const LINE_TOLERANCE = 2;
+const LINE_GAP = 4;
+
+// Block-sparse vote grid: 16×16 blocks of counts are allocated the first time
+// a vote lands in them, so memory follows the region the edges actually reach
+// rather than the whole parameter space.
+const BLOCK_BITS = 4;
+const BLOCK_MASK = (1 << BLOCK_BITS) - 1;
+
+export class SparseAccumulator {
+  constructor(width, height) {
+    this.width = width;
+    this.height = height;
+    this.blocksX = (width + BLOCK_MASK) >> BLOCK_BITS;
+    this.blocks = new Array(this.blocksX * ((height + BLOCK_MASK) >> BLOCK_BITS)).fill(null);
+  }
+
+  add(x, y, votes = 1) {
+    const b = (y >> BLOCK_BITS) * this.blocksX + (x >> BLOCK_BITS);
+    const block = this.blocks[b] || (this.blocks[b] = new Uint32Array(1 << (2 * BLOCK_BITS)));
+    block[((y & BLOCK_MASK) << BLOCK_BITS) | (x & BLOCK_MASK)] += votes;
+  }
+
+  // Sets `bits` in the cell instead of counting, for per-cell flags.
+  or(x, y, bits) {
+    const b = (y >> BLOCK_BITS) * this.blocksX + (x >> BLOCK_BITS);
+    const block = this.blocks[b] || (this.blocks[b] = new Uint32Array(1 << (2 * BLOCK_BITS)));
+    block[((y & BLOCK_MASK) << BLOCK_BITS) | (x & BLOCK_MASK)] |= bits;
+  }
+
+  get(x, y) {
+    if (x < 0 || y < 0 || x >= this.width || y >= this.height) return 0;
+    const block = this.blocks[(y >> BLOCK_BITS) * this.blocksX + (x >> BLOCK_BITS)];
+    return block ? block[((y & BLOCK_MASK) << BLOCK_BITS) | (x & BLOCK_MASK)] : 0;
+  }
+
+  forEach(callback) {
+    for (let b = 0; b < this.blocks.length; b++) {
+      const block = this.blocks[b];
+      if (!block) continue;
+      const x0 = (b % this.blocksX) << BLOCK_BITS;
+      const y0 = Math.floor(b / this.blocksX) << BLOCK_BITS;
+      for (let i = 0; i < block.length; i++) {
+        if (block[i]) callback(x0 + (i & BLOCK_MASK), y0 + (i >> BLOCK_BITS), block[i]);
+      }
+    }
+  }
+}
+
+// Boundary pixels with a unit normal. The normal is perpendicular to the
+// principal axis of the foreground pixels in the surrounding window (a small
+// structure tensor), which follows thin strokes and filled boundaries alike;
+// its sign is ambiguous, so voters use both ±normal.
+export const extractEdges = (mask, width, height) => {
+  const xs = [];
+  const ys = [];
+  const nx = [];
+  const ny = [];
+
+  for (let y = 0, i = 0; y < height; y++) {
+    for (let x = 0; x < width; x++, i++) {
+      if (!mask[i]) continue;
+      const boundary = x === 0 || y === 0 || x === width - 1 || y === height - 1
+        || !mask[i - 1] || !mask[i + 1] || !mask[i - width] || !mask[i + width];
+      if (!boundary) continue;
+
+      let n = 0, sx = 0, sy = 0, sxx = 0, sxy = 0, syy = 0;
+      for (let dy = -GRADIENT_RADIUS; dy <= GRADIENT_RADIUS; dy++) {
+        const yy = y + dy;
+        if (yy < 0 || yy >= height) continue;
+        for (let dx = -GRADIENT_RADIUS; dx <= GRADIENT_RADIUS; dx++) {
+          const xx = x + dx;
+          if (xx >= 0 && xx < width && mask[yy * width + xx]) {
+            n++;
+            sx += dx;
+            sy += dy;
+            sxx += dx * dx;
+            sxy += dx * dy;
+            syy += dy * dy;
+          }
+        }
+      }
+      const cxx = sxx / n - (sx / n) ** 2;
+      const cxy = sxy / n - (sx / n) * (sy / n);
+      const cyy = syy / n - (sy / n) ** 2;
+      if (cxx + cyy === 0) continue;
+      const axis = 0.5 * Math.atan2(2 * cxy, cxx - cyy);
+      xs.push(x);
+      ys.push(y);
+      nx.push(-Math.sin(axis));
+      ny.push(Math.cos(axis));
+    }
+  }
+
+  return {
+    count: xs.length,
+    x: Int32Array.from(xs),
+    y: Int32Array.from(ys),
+    nx: Float32Array.from(nx),
+    ny: Float32Array.from(ny)
+  };
+};
+
+// Sector (of CIRCLE_SECTORS) of the direction (dx, dy) from a centre.
+const sectorOf = (dx, dy) => (
+  Math.floor(((Math.atan2(dy, dx) + Math.PI) / (2 * Math.PI)) * CIRCLE_SECTORS) % CIRCLE_SECTORS
+);
+
+// Each edge votes for centres along ±normal at every RADIUS_STEP-th radius;
+// a ray through a centre still lands in its 3×3 neighbourhood, which is what
+// centerCandidates scores. Beyond MAX_VOTING_EDGES only every n-th edge
+// votes. Both skips are made up in the vote weight, so the counts keep their
+// scale. Alongside the counts, `sectors` records which directions around a
+// cell its votes came from. Only the blocks some edge actually reached are
+// ever allocated.
+const voteCircleCenters = (edges, width, height, minRadius, maxRadius) => {
+  const acc = new SparseAccumulator(width, height);
+  const sectors = new SparseAccumulator(width, height);
+  const stride = Math.ceil(edges.count / MAX_VOTING_EDGES);
+  const weight = stride * RADIUS_STEP;
+  for (let e = 0; e < edges.count; e += stride) {
+    const x = edges.x[e] + 0.5, y = edges.y[e] + 0.5, nx = edges.nx[e], ny = edges.ny[e];
+    // The edge seen from a centre along +normal lies at −normal, and vice versa.
+    const behind = 1 << sectorOf(-nx, -ny);
+    const ahead = 1 << sectorOf(nx, ny);
+    for (let r = minRadius; r <= maxRadius; r += RADIUS_STEP) {
+      const ox = r * nx, oy = r * ny;
+      let cx = Math.floor(x + ox), cy = Math.floor(y + oy);
+      if (cx >= 0 && cx < width && cy >= 0 && cy < height) {
+        acc.add(cx, cy, weight);
+        sectors.or(cx, cy, behind);
+      }
+      cx = Math.floor(x - ox);
+      cy = Math.floor(y - oy);
+      if (cx >= 0 && cx < width && cy >= 0 && cy < height) {
+        acc.add(cx, cy, weight);
+        sectors.or(cx, cy, ahead);
+      }
+    }
+  }
+  return { acc, sectors, weight };
+};
+
+const bitCount = (v) => {
+  let n = 0;
+  for (; v; n++) v &= v - 1;
+  return n;
+};
+
+// Share of CIRCLE_SECTORS that votes reached the 3×3 neighbourhood of (x, y)
+// from.
+const voteCoverage = (sectors, x, y) => {
+  let bits = 0;
+  for (let dy = -1; dy <= 1; dy++) {
+    for (let dx = -1; dx <= 1; dx++) bits |= sectors.get(x + dx, y + dy);
+  }
+  return bitCount(bits) / CIRCLE_SECTORS;
+};
+
+// Local maxima of the centre accumulator after a 3×3 box filter, which is far
+// steadier than the raw counts once votes have been rounded to whole pixels.
+// Before any edge is revisited, peaks are dropped when their votes come from
+// too few directions to surround a centre (where the rays of a few strokes
+// cross) or when they are far below the strongest peak.
+const centerCandidates = ({ acc, sectors, weight }, minVotes) => {
+  const { width, height } = acc;
+  const smoothed = new SparseAccumulator(width, height);
+  acc.forEach((x, y, count) => {
+    // Cells crossed by a stray ray or two cannot lift a neighbourhood to a peak.
+    if (count < MIN_CELL_VOTES * weight) return;
+    for (let sy = Math.max(0, y - 1); sy <= Math.min(height - 1, y + 1); sy++) {
+      for (let sx = Math.max(0, x - 1); sx <= Math.min(width - 1, x + 1); sx++) smoothed.add(sx, sy, count);
+    }
+  });
+
+  const candidates = [];
+  smoothed.forEach((x, y, score) => {
+    if (score < minVotes) return;
+    for (let dy = -1; dy <= 1; dy++) {
+      for (let dx = -1; dx <= 1; dx++) {
+        const neighbour = smoothed.get(x + dx, y + dy);
+        // Ties go to the earlier cell in scan order, so a plateau gives one peak.
+        if (neighbour > score || (neighbour === score && (dy < 0 || (dy === 0 && dx < 0)))) return;
+      }
+    }
+    if (voteCoverage(sectors, x, y) < CIRCLE_COVERAGE * PREFILTER_SLACK) return;
+    candidates.push({ x, y, score });
+  });
+
+  candidates.sort((a, b) => b.score - a.score);
+  const floor = candidates.length ? candidates[0].score * CANDIDATE_PEAK_FRACTION : 0;
+  const strong = candidates.findIndex(({ score }) => score < floor);
+  return candidates.slice(0, Math.min(MAX_CENTER_CANDIDATES, strong < 0 ? candidates.length : strong));
+};
+
+// Edge indices bucketed into GRID_CELL-pixel cells (CSR: cell c owns
+// order[start[c]..start[c + 1]]), so a pass over the edges at some distance
+// from a centre only visits the cells its annulus overlaps.
+const edgeGrid = ({ count, x, y }, width, height) => {
+  const cols = Math.ceil(width / GRID_CELL);
+  const rows = Math.ceil(height / GRID_CELL);
+  const cellOf = (e) => Math.floor(y[e] / GRID_CELL) * cols + Math.floor(x[e] / GRID_CELL);
+  const start = new Int32Array(cols * rows + 1);
+  for (let e = 0; e < count; e++) start[cellOf(e) + 1]++;
+  for (let c = 0; c < cols * rows; c++) start[c + 1] += start[c];
+  const cursor = start.slice(0, cols * rows);
+  const order = new Int32Array(count);
+  for (let e = 0; e < count; e++) order[cursor[cellOf(e)]++] = e;
+  return { cols, rows, start, order };
+};
+
+// Calls `visit(e)` for the edges of every grid cell that reaches into the
+// annulus inner² ≤ d² ≤ outer² around (cx, cy).
+const forEdgesNear = ({ cols, rows, start, order }, cx, cy, inner, outer, visit) => {
+  const reach = Math.sqrt(outer);
+  const i0 = Math.max(0, Math.floor((cy - reach) / GRID_CELL));
+  const i1 = Math.min(rows - 1, Math.floor((cy + reach) / GRID_CELL));
+  const j0 = Math.max(0, Math.floor((cx - reach) / GRID_CELL));
+  const j1 = Math.min(cols - 1, Math.floor((cx + reach) / GRID_CELL));
+  for (let i = i0; i <= i1; i++) {
+    const y0 = i * GRID_CELL, y1 = y0 + GRID_CELL - 1;
+    const nearY = Math.max(y0 - cy, 0, cy - y1);
+    const farY = Math.max(Math.abs(cy - y0), Math.abs(cy - y1));
+    for (let j = j0; j <= j1; j++) {
+      const x0 = j * GRID_CELL, x1 = x0 + GRID_CELL - 1;
+      const nearX = Math.max(x0 - cx, 0, cx - x1);
+      const farX = Math.max(Math.abs(cx - x0), Math.abs(cx - x1));
+      const near = nearY * nearY + nearX * nearX;
+      if (near > outer || farY * farY + farX * farX < inner) continue;
+      const c = i * cols + j;
+      for (let k = start[c]; k < start[c + 1]; k++) visit(order[k]);
+    }
+  }
+};
+
+// Radii at which edges around a candidate centre are dense, radially oriented
+// and spread around enough of the circumference to form (most of) a circle.
+// `sparse` samples every PREFILTER_STRIDE-th edge with thresholds relaxed by
+// PREFILTER_SLACK, a cheap first pass that rejects most candidates. Only
+// radii `from` to `to` are tested, and the full pass visits only the edges
+// that can count towards them.
+const circleRadii = (edges, grid, cx, cy, minRadius, maxRadius, {
+  sparse = false, from = minRadius, to = maxRadius
+} = {}) => {
+  const histogram = new Float64Array(maxRadius + 3);
+  const sectors = new Uint32Array(maxRadius + 3);
+  const slack = sparse ? PREFILTER_SLACK : 1;
+  // A radius's support and peak test read histogram[r - 2] to [r + 2].
+  const inner = Math.max(minRadius - 1, from - 2.5) ** 2;
+  const outer = Math.min(maxRadius + 1, to + 2.5) ** 2;
+  const alignment = RADIAL_ALIGNMENT ** 2;
+  const { x: xs, y: ys, nx, ny } = edges;
+  const visit = (e, weight) => {
+    const dx = xs[e] - cx;
+    const dy = ys[e] - cy;
+    const d2 = dx * dx + dy * dy;
+    if (d2 < inner || d2 > outer) return;
+    const dot = dx * nx[e] + dy * ny[e];
+    if (dot * dot < alignment * d2) return;
+    const r = Math.round(Math.sqrt(d2));
+    histogram[r] += weight;
+    sectors[r] |= 1 << sectorOf(dx, dy);
+  };
+  if (sparse) {
+    for (let e = 0; e < edges.count; e += PREFILTER_STRIDE) visit(e, PREFILTER_STRIDE);
+  } else {
+    forEdgesNear(grid, cx, cy, inner, outer, (e) => visit(e, 1));
+  }
+
+  const radii = [];
+  for (let r = from; r <= to; r++) {
+    const support = histogram[r - 1] + histogram[r] + histogram[r + 1];
+    if (support / (2 * Math.PI * r) < CIRCLE_DENSITY * slack) continue;
+    const prev = histogram[r - 2] + histogram[r - 1] + histogram[r];
+    const next = histogram[r] + histogram[r + 1] + histogram[r + 2];
+    if (support < prev || support <= next) continue;
+    const coverage = bitCount(sectors[r - 1] | sectors[r] | sectors[r + 1]) / CIRCLE_SECTORS;
+    if (coverage >= CIRCLE_COVERAGE * slack) radii.push({ r, coverage });
+  }
+  return radii;
+};
+
+// Candidates go through the sparse pass first; the full pass then only
+// covers the radii it flagged, give or take RADIUS_MARGIN.
+export const detectCircles = (edges, width, height, { minRadius = HOUGH_MIN_RADIUS } = {}) => {
+  const maxRadius = Math.floor(Math.min(width, height) / 2);
+  if (maxRadius < minRadius || !edges.count) return [];
+
+  const votes = voteCircleCenters(edges, width, height, minRadius, maxRadius);
+  const grid = edgeGrid(edges, width, height);
+  const circles = [];
+  // Centres already confirmed; a weaker peak right next to one would only
+  // find the same circles again.
+  const confirmed = [];
+  for (const { x, y } of centerCandidates(votes, Math.PI * minRadius)) {
+    if (confirmed.some((c) => Math.abs(c.x - x) <= CONFIRMED_SPACING && Math.abs(c.y - y) <= CONFIRMED_SPACING)) continue;
+    const flagged = circleRadii(edges, grid, x, y, minRadius, maxRadius, { sparse: true });
+    if (!flagged.length) continue;
+    const radii = circleRadii(edges, grid, x, y, minRadius, maxRadius, {
+      from: Math.max(minRadius, flagged[0].r - RADIUS_MARGIN),
+      to: Math.min(maxRadius, flagged[flagged.length - 1].r + RADIUS_MARGIN)
+    });
+    if (radii.length) confirmed.push({ x, y });
+    for (const { r, coverage } of radii) {
+      const duplicate = circles.find((c) => (
+        Math.hypot(c.x - x, c.y - y) <= Math.max(3, r * 0.25) && Math.abs(c.r - r) <= Math.max(2, r * 0.1)
+      ));
+      if (duplicate) {
+        if (coverage > duplicate.coverage) Object.assign(duplicate, { x, y, r, coverage });
+      } else {
+        circles.push({ x, y, r, coverage });
+      }
+    }
+  }
+  return circles;
+};
+
+const onCircle = (x, y, circles) => circles.some((c) => Math.abs(Math.hypot(x - c.x, y - c.y) - c.r) <= 2);
+
+// Splits the edges lying on one (θ, ρ) line into gap-separated segments.
+const lineSegments = (edges, members, cos, sin, minLength) => {
+  const points = members
+    .map((e) => ({ e, t: -edges.x[e] * sin + edges.y[e] * cos }))
+    .sort((a, b) => a.t - b.t);
+  const segments = [];
+  let start = 0;
+  for (let i = 1; i <= points.length; i++) {
+    if (i === points.length || points[i].t - points[i - 1].t > LINE_GAP) {
+      const from = points[start];
+      const to = points[i - 1];
+      if (to.t - from.t >= minLength) {
+        segments.push({
+          members: points.slice(start, i).map(({ e }) => e),
+          x1: edges.x[from.e], y1: edges.y[from.e],
+          x2: edges.x[to.e], y2: edges.y[to.e],
+          length: to.t - from.t
+        });
+      }
+      start = i;
+    }
+  }
+  return segments;
+};
+
+const normalBin = (nx, ny) => {
+  let theta = Math.atan2(ny, nx);
+  if (theta < 0) theta += Math.PI;
+  return Math.round((theta * THETA_BINS) / Math.PI) % THETA_BINS;
+};
+
+export const detectLines = (edges, width, height, { minLength = HOUGH_MIN_LINE, exclude = [] } = {}) => {
+  const rhoMax = Math.ceil(Math.hypot(width, height));
+  const rhoBins = 2 * rhoMax + 1;
+  const cos = Float64Array.from({ length: THETA_BINS }, (_, t) => Math.cos((t * Math.PI) / THETA_BINS));
+  const sin = Float64Array.from({ length: THETA_BINS }, (_, t) => Math.sin((t * Math.PI) / THETA_BINS));
+
+  // Edges bucketed by normal angle, so a peak only inspects nearby angles.
+  const buckets = Array.from({ length: THETA_BINS }, () => []);
+  const acc = new SparseAccumulator(rhoBins, THETA_BINS);
+  for (let e = 0; e < edges.count; e++) {
+    if (onCircle(edges.x[e], edges.y[e], exclude)) continue;
+    const t0 = normalBin(edges.nx[e], edges.ny[e]);
+    buckets[t0].push(e);
+    for (let dt = -THETA_SPREAD; dt <= THETA_SPREAD; dt++) {
+      const t = (t0 + dt + THETA_BINS) % THETA_BINS;
+      const rho = Math.round(edges.x[e] * cos[t] + edges.y[e] * sin[t]) + rhoMax;
+      acc.add(rho, t);
+    }
+  }
+
+  const peaks = [];
+  acc.forEach((rho, t, count) => {
+    if (count >= minLength) peaks.push({ t, rho: rho - rhoMax, count });
+  });
+  peaks.sort((a, b) => b.count - a.count);
+
+  // Greedy: strongest peaks first, each edge belongs to at most one segment.
+  const used = new Uint8Array(edges.count);
+  const lines = [];
+  for (const { t, rho } of peaks) {
+    const members = [];
+    for (let dt = -THETA_SPREAD; dt <= THETA_SPREAD; dt++) {
+      for (const e of buckets[(t + dt + THETA_BINS) % THETA_BINS]) {
+        if (!used[e] && Math.abs(edges.x[e] * cos[t] + edges.y[e] * sin[t] - rho) <= LINE_TOLERANCE) members.push(e);
+      }
+    }
+    if (members.length < minLength) continue;
+
+    for (const segment of lineSegments(edges, members, cos[t], sin[t], minLength)) {
+      segment.members.forEach((e) => { used[e] = 1; });
+      const { x1, y1, x2, y2, length } = segment;
+      lines.push({ x1, y1, x2, y2, length });
+    }
+  }
+  return lines;
+};
+
+// `scale` maps the given mask's pixels onto image pixels, for masks that are
+// themselves a downsampled overview. Detection is skipped (and `skipped` set)
+// when the edge count is below MIN_PRIMITIVE_EDGES or above
+// MAX_EDGE_FRACTION of the working area.
+export const extractPrimitives = (mask, width, height, scale = 1) => {
+  const work = poolMask(mask, width, height, HOUGH_MAX_SIZE);
+  const edges = extractEdges(work.mask, work.width, work.height);
+  const skipped = edges.count < MIN_PRIMITIVE_EDGES || edges.count > MAX_EDGE_FRACTION * work.width * work.height;
+  const circles = skipped ? [] : detectCircles(edges, work.width, work.height);
+  const lines = skipped ? [] : detectLines(edges, work.width, work.height, { exclude: circles });
+
+  // Working-grid pixel centres back to image pixel centres.
+  const s = work.scale * scale;
+  const px = (v) => (v + 0.5) * s - 0.5;
+  return {
+    edgeCount: edges.count,
+    ...(skipped && { skipped }),
+    circles: circles.map(({ x, y, r, coverage }) => ({ x: px(x), y: px(y), r: r * s, coverage })),
+    lines: lines.map(({ x1, y1, x2, y2, length }) => ({ x1: px(x1), y1: px(y1), x2: px(x2), y2: px(y2), length: length * s }))
+  };
+};
+
+// Size of the largest group of circles whose radii agree within 10%: 7 for a
+// Seed of Life, 19 for a Flower of Life, regardless of stray arcs.
+const uniformCircleCount = (circles) => circles.reduce((best, { r }) => Math.max(
+  best,
+  circles.filter((c) => Math.abs(c.r - r) <= r * 0.1).length
+), 0);
+
+// Primitive features for a foreground mask from features.js. Tiled decodes
+// never hold the full mask, so their overview is used instead.
+export const primitiveFeatures = ({ mask, width, height, overview }) => {
+  const primitives = mask
+    ? extractPrimitives(mask, width, height)
+    : extractPrimitives(overview.mask, overview.width, overview.height, overview.scale);
+  return {
+    primitives,
+    circleCount: primitives.circles.length,
+    uniformCircleCount: uniformCircleCount(primitives.circles),
+    lineCount: primitives.lines.length
+  };
+};
@@ -0,0 +1,52 @@
+// Minimal promise wrapper around the decoder's IndexedDB database. Every
+// object store the decoder uses is declared here so upgrades stay in one place.
+
+const DB_NAME = 'universal-geometric-decoder';
+const DB_VERSION = 2;
+const STORES = {
+  signatures: {},
+  results: { keyPath: 'key', indexes: ['lastUsed'] }
+};
+
+let dbPromise = null;
+
+export const promisify = (request) => new Promise((resolve, reject) => {
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+});
+
+export const openDecoderDb = () => {
+  if (!dbPromise) {
+    const request = indexedDB.open(DB_NAME, DB_VERSION);
+    request.onupgradeneeded = () => {
+      const db = request.result;
+      Object.entries(STORES)
+        .filter(([name]) => !db.objectStoreNames.contains(name))
+        .forEach(([name, { keyPath, indexes = [] }]) => {
+          const store = db.createObjectStore(name, keyPath ? { keyPath } : undefined);
+          indexes.forEach((field) => store.createIndex(field, field));
+        });
+    };
+    dbPromise = promisify(request);
+    dbPromise.catch(() => {
+      dbPromise = null;
+    });
+  }
+  return dbPromise;
+};
+
+export const idbGet = async (store, key) => {
+  const db = await openDecoderDb();
+  return promisify(db.transaction(store).objectStore(store).get(key));
+};
+
+export const transactionDone = (tx) => new Promise((resolve, reject) => {
+  tx.oncomplete = () => resolve();
+  tx.onerror = () => reject(tx.error);
+  tx.onabort = () => reject(tx.error);
+});
+
+export const idbPut = async (store, key, value) => {
+  const db = await openDecoderDb();
+  return promisify(db.transaction(store, 'readwrite').objectStore(store).put(value, key));
+};
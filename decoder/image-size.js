@@ -0,0 +1,90 @@
+// Reads an image's pixel dimensions from its header bytes, so a tiled decode
+// can plan tiles without decoding the whole file first. Covers PNG, GIF, BMP,
+// WebP and JPEG; anything else resolves to null. Sizes are as displayed: a
+// JPEG's EXIF orientation is applied, as createImageBitmap does by default.
+
+const HEAD_BYTES = 64 * 1024;
+
+const readBytes = async (blob, start, length) => new DataView(await blob.slice(start, start + length).arrayBuffer());
+
+const pngSize = (view) => (
+  view.getUint32(0) === 0x89504e47 ? { width: view.getUint32(16), height: view.getUint32(20) } : null
+);
+
+const gifSize = (view) => (
+  view.getUint32(0) === 0x47494638 ? { width: view.getUint16(6, true), height: view.getUint16(8, true) } : null
+);
+
+const bmpSize = (view) => (
+  view.getUint16(0) === 0x424d ? { width: view.getInt32(18, true), height: Math.abs(view.getInt32(22, true)) } : null
+);
+
+const webpSize = (view) => {
+  if (view.getUint32(0) !== 0x52494646 || view.getUint32(8) !== 0x57454250) return null;
+  const chunk = view.getUint32(12);
+  if (chunk === 0x56503820) { // 'VP8 '
+    return { width: view.getUint16(26, true) & 0x3fff, height: view.getUint16(28, true) & 0x3fff };
+  }
+  if (chunk === 0x5650384c) { // 'VP8L'
+    const bits = view.getUint32(21, true);
+    return { width: (bits & 0x3fff) + 1, height: ((bits >>> 14) & 0x3fff) + 1 };
+  }
+  if (chunk === 0x56503858) { // 'VP8X'
+    const width = (view.getUint8(24) | (view.getUint8(25) << 8) | (view.getUint8(26) << 16)) + 1;
+    const height = (view.getUint8(27) | (view.getUint8(28) << 8) | (view.getUint8(29) << 16)) + 1;
+    return { width, height };
+  }
+  return null;
+};
+
+// EXIF Orientation 5 to 8 are rotated a quarter turn. createImageBitmap and
+// <img> apply the tag by default, so the stored width and height swap.
+const EXIF_ORIENTATION = 0x0112;
+const EXIF_HEADER = 0x45786966; // 'Exif'
+
+// Orientation from an APP1 segment's payload, or 1 (as stored) when there is
+// none: a TIFF header, then IFD0's 12-byte entries.
+const exifOrientation = (view) => {
+  if (view.byteLength < 14 || view.getUint32(0) !== EXIF_HEADER) return 1;
+  const tiff = 6;
+  const little = view.getUint16(tiff) === 0x4949; // 'II'
+  const ifd = tiff + view.getUint32(tiff + 4, little);
+  if (ifd + 2 > view.byteLength) return 1;
+  const entries = view.getUint16(ifd, little);
+  for (let i = 0; i < entries; i++) {
+    const entry = ifd + 2 + i * 12;
+    if (entry + 12 > view.byteLength) break;
+    if (view.getUint16(entry, little) === EXIF_ORIENTATION) return view.getUint16(entry + 8, little);
+  }
+  return 1;
+};
+
+// Walks JPEG segments until a start-of-frame marker; EXIF blocks can push it
+// past the first read, so later segments are fetched on demand. An EXIF
+// orientation seen on the way is applied to the frame size.
+const jpegSize = async (blob, head) => {
+  if (head.getUint16(0) !== 0xffd8) return null;
+  let offset = 2;
+  let orientation = 1;
+  while (offset + 9 < blob.size) {
+    const view = await readBytes(blob, offset, 10);
+    if (view.getUint8(0) !== 0xff) return null;
+    const marker = view.getUint8(1);
+    const length = view.getUint16(2);
+    const isFrame = marker >= 0xc0 && marker <= 0xcf && marker !== 0xc4 && marker !== 0xc8 && marker !== 0xcc;
+    if (isFrame) {
+      const width = view.getUint16(7);
+      const height = view.getUint16(5);
+      return orientation >= 5 && orientation <= 8 ? { width: height, height: width } : { width, height };
+    }
+    if (marker === 0xe1) orientation = exifOrientation(await readBytes(blob, offset + 4, length - 2));
+    offset += 2 + length;
+  }
+  return null;
+};
+
+export const imageSize = async (blob) => {
+  const head = await readBytes(blob, 0, Math.min(blob.size, HEAD_BYTES));
+  if (head.byteLength < 30) return null;
+  return pngSize(head) || gifSize(head) || bmpSize(head) || webpSize(head) || jpegSize(blob, head);
+};
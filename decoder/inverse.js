@@ -0,0 +1,217 @@
+// Inverse design: from a target classification and/or feature values back to
+// encode-mode parameters, by repeated generate → analyze evaluation.
+//
+// Only patternType, symmetryScore and scaleFactor change the rendered pixels
+// (and each pattern only reads some of them, per GENERATOR_INPUTS), so those
+// are searched; aspectRatio, phiDeviation and fillDensity are what the
+// decoder measures on the render and are filled in from that measurement.
+// Evaluations are memoized by geometryKey, so parameter points that render
+// the same image are decoded once, across searches too.
+//
+// Every pattern is seeded on a coarse grid and then refined by pattern
+// search: probe ± step along each free parameter, move to the best probe or
+// halve the step when none improves. All probes of a round are evaluated
+// concurrently, so a worker pool behind `evaluate` keeps every worker busy,
+// and the best candidates are reported after every evaluation.
+
+import { abortError } from './client.js';
+import { GENERATOR_INPUTS, GENERATOR_PATTERNS, geometryKey } from './generate.js';
+
+export const INVERSE_BUDGET = 120;
+export const INVERSE_TOP = 5;
+export const INVERSE_MEMO_SIZE = 2048;
+
+export const SEARCH_SPACE = {
+  symmetryScore: { min: 0, max: 1, step: 0.01 },
+  scaleFactor: { min: 10, max: 300, step: 1 }
+};
+
+// Feature targets use the transcoder's names (the encode form's fields); a
+// miss by one scale unit costs 1, aspect ratios are compared in log space and
+// a wrong classification costs CLASS_PENALTY.
+export const TARGET_SCALES = {
+  symmetryScore: 0.05,
+  aspectRatio: 0.1,
+  phiDeviation: 0.1,
+  fillDensity: 0.02
+};
+
+const CLASS_PENALTY = 100;
+const SEED_STEPS = 3;
+
+const decimals = (step) => Math.max(0, -Math.floor(Math.log10(step)));
+
+// Snaps to the slider grid, so equal points share a memo key.
+const quantize = (name, value) => {
+  const { min, max, step } = SEARCH_SPACE[name];
+  const clamped = Math.min(max, Math.max(min, value));
+  return Number((Math.round(clamped / step) * step).toFixed(decimals(step)));
+};
+
+const freeInputs = (patternType) => (
+  (GENERATOR_INPUTS[patternType] || []).filter((name) => SEARCH_SPACE[name])
+);
+
+export const designLoss = ({ classification, features = {} }, decoded) => {
+  let loss = classification && decoded.patternType !== classification ? CLASS_PENALTY : 0;
+  Object.entries(features).forEach(([name, value]) => {
+    const actual = decoded[name];
+    const diff = name === 'aspectRatio' ? Math.log(actual / value) : actual - value;
+    loss += (diff / TARGET_SCALES[name]) ** 2;
+  });
+  return Number.isFinite(loss) ? loss : Infinity;
+};
+
+export class InverseDesigner {
+  // `evaluate(params)` renders and decodes one parameter set, resolving to
+  // the transcoder view (e.g. DecoderPool#evaluate).
+  constructor(evaluate, { memoSize = INVERSE_MEMO_SIZE } = {}) {
+    this.evaluate = evaluate;
+    this.memoSize = memoSize;
+    this.memo = new Map();
+    this.generation = 0;
+  }
+
+  // Memoized evaluation. Renders too faint to decode are remembered as null;
+  // cancelled ones are forgotten.
+  lookup(key, params) {
+    let entry = this.memo.get(key);
+    if (entry) {
+      this.memo.delete(key);
+    } else {
+      entry = this.evaluate(params).catch((err) => {
+        if (err.name === 'AbortError') {
+          this.memo.delete(key);
+          throw err;
+        }
+        return null;
+      });
+      if (this.memo.size >= this.memoSize) this.memo.delete(this.memo.keys().next().value);
+    }
+    this.memo.set(key, entry);
+    return entry;
+  }
+
+  cancel() {
+    this.generation++;
+  }
+
+  // Resolves to the best `top` candidates, best first:
+  //   { key, loss, params, decoded }
+  // `params` is a full encode-form parameter set (unsearched fields from
+  // `base`, measured fields from the decode). `onCandidates(best, stats)` is
+  // called after every evaluation. A newer search or cancel() rejects with
+  // an AbortError.
+  async search(target, { base = {}, budget = INVERSE_BUDGET, top = INVERSE_TOP, onCandidates } = {}) {
+    const generation = ++this.generation;
+    const candidates = new Map();
+    const ranked = [];
+    const stats = { evaluated: 0, cached: 0, budget };
+
+    const check = () => {
+      if (generation !== this.generation) throw abortError();
+    };
+
+    const consider = (patternType, point) => {
+      const params = { ...base, patternType, ...point };
+      const key = geometryKey(params);
+      if (candidates.has(key)) return candidates.get(key);
+      if (this.memo.has(key)) stats.cached++;
+      else stats.evaluated++;
+
+      const pending = this.lookup(key, params).then((decoded) => {
+        check();
+        const candidate = {
+          key,
+          loss: decoded ? designLoss(target, decoded) : Infinity,
+          params: decoded
+            ? {
+              ...params,
+              aspectRatio: decoded.aspectRatio,
+              phiDeviation: decoded.phiDeviation,
+              fillDensity: decoded.fillDensity
+            }
+            : params,
+          decoded
+        };
+        if (decoded) {
+          let i = ranked.findIndex((other) => other.loss > candidate.loss);
+          if (i < 0) i = ranked.length;
+          ranked.splice(i, 0, candidate);
+          onCandidates?.(ranked.slice(0, top), { ...stats });
+        }
+        return candidate;
+      });
+      candidates.set(key, pending);
+      return pending;
+    };
+
+    const affordable = (patternType, point) => {
+      const key = geometryKey({ ...base, patternType, ...point });
+      return candidates.has(key) || this.memo.has(key) || stats.evaluated < budget;
+    };
+
+    // Seeds: a SEED_STEPS grid over each pattern's free inputs, at the
+    // centres of equal slices of the range rather than on its edges.
+    const searches = GENERATOR_PATTERNS.map((patternType) => {
+      const inputs = freeInputs(patternType);
+      let points = [{}];
+      inputs.forEach((name) => {
+        const { min, max } = SEARCH_SPACE[name];
+        points = points.flatMap((point) => Array.from({ length: SEED_STEPS }, (v, i) => (
+          { ...point, [name]: quantize(name, min + ((i + 0.5) / SEED_STEPS) * (max - min)) }
+        )));
+      });
+      const steps = Object.fromEntries(inputs.map((name) => {
+        const { min, max } = SEARCH_SPACE[name];
+        return [name, (max - min) / SEED_STEPS / 2];
+      }));
+      return { patternType, inputs, steps, points, center: null };
+    });
+
+    await Promise.all(searches.map(async (state) => {
+      const seeded = await Promise.all(state.points.map((point) => consider(state.patternType, point)));
+      state.center = seeded.reduce((best, candidate) => (candidate.loss < best.loss ? candidate : best));
+    }));
+
+    // Refinement rounds until every step is below the slider grid or the
+    // budget is spent. A pattern stuck on the wrong classification while
+    // another already has it is dropped.
+    const active = (state) => state.inputs.some((name) => state.steps[name] >= SEARCH_SPACE[name].step);
+    for (;;) {
+      check();
+      const bestLoss = ranked.length ? ranked[0].loss : Infinity;
+      const round = searches.filter((state) => (
+        active(state) && state.center.loss < bestLoss + CLASS_PENALTY / 2
+      ));
+      if (!round.length || stats.evaluated >= budget) break;
+
+      const probed = await Promise.all(round.map(async (state) => {
+        const probes = [];
+        state.inputs.forEach((name) => {
+          if (state.steps[name] < SEARCH_SPACE[name].step) return;
+          [-1, 1].forEach((sign) => {
+            const point = Object.fromEntries(state.inputs.map((input) => [input, state.center.params[input]]));
+            point[name] = quantize(name, point[name] + sign * state.steps[name]);
+            if (affordable(state.patternType, point)) probes.push(consider(state.patternType, point));
+          });
+        });
+        return { state, results: await Promise.all(probes) };
+      }));
+
+      probed.forEach(({ state, results }) => {
+        const best = results.reduce((a, b) => (b.loss < a.loss ? b : a), state.center);
+        if (best !== state.center) {
+          state.center = best;
+        } else {
+          state.inputs.forEach((name) => {
+            state.steps[name] /= 2;
+          });
+        }
+      });
+    }
+
+    check();
+    return ranked.slice(0, top);
+  }
+}
@@ -0,0 +1,334 @@
+// Log-polar spiral fitting for golden-ratio analysis.
+//
+// A logarithmic spiral r(θ) = a·e^(bθ) becomes a straight line u = ln a + bθ
+// in log-polar coordinates (θ, u = ln r), so successive turns cross every ray
+// at a constant spacing 2πb in u. The mask is remapped onto a θ × u grid around
+// a few candidate poles, b is estimated from that spacing and checked by how
+// coherently the crossings line up along u − bθ.
+//
+// The remap table is a list of pixel offsets per (θ, u) cell relative to the
+// pole, so it depends only on the image size: it is built once per size and
+// cached, and every pole and every later decode at that size only pays for
+// the lookups. The pole is searched on a copy pooled to POLE_SEARCH_SIZE and
+// only refined at full resolution, and one set of remap and crossing buffers
+// serves every pole of a fit.
+
+import { CLASSIFICATION_RULES } from './classify.js';
+import { poolMask } from './features.js';
+import { bufferPool } from './memory.js';
+
+export const SPIRAL_MAX_SIZE = 512;
+export const LOG_POLAR_ANGLES = 180;
+export const LOG_POLAR_RINGS = 96;
+export const GOLDEN_GROWTH = Math.log((1 + Math.sqrt(5)) / 2) / Math.PI;
+
+const MIN_RADIUS = 4;
+const TABLE_CACHE_LIMIT = 8;
+const POLE_SEARCH_SIZE = 64;
+const POLE_SEARCH_ANGLES = 90;
+const POLE_SEARCH_RINGS = 48;
+const POLE_GRID_HALF = 3;
+const POLE_SPAN = 0.25;
+const POLE_REFINEMENTS = 2;
+const COARSE_ANGLE_STEP = 3;
+const SYMMETRY_RULES_OUT = 0.8;
+const GROWTH_STEPS = 21;
+const GROWTH_REFINE = 0.15;
+const MIN_CROSSINGS = 12;
+
+const tableCache = new Map();
+
+// Offsets of every pixel along each ray, grouped by the log-radius ring they
+// fall in (CSR layout: cell c owns offsets start[c]..start[c + 1]). Rings are
+// wider than a pixel at large radii, so a cell holds every pixel it spans and
+// thin strokes cannot slip between samples.
+const buildLogPolarTable = (width, height, angles, rings) => {
+  const maxRadius = Math.hypot(width, height) / 2;
+  const logMin = Math.log(MIN_RADIUS);
+  const ringWidth = (Math.log(maxRadius) - logMin) / rings;
+  const start = new Int32Array(angles * rings + 1);
+  const dx = [];
+  const dy = [];
+
+  for (let a = 0; a < angles; a++) {
+    const cos = Math.cos((2 * Math.PI * a) / angles);
+    const sin = Math.sin((2 * Math.PI * a) / angles);
+    for (let k = 0; k < rings; k++) {
+      const inner = Math.exp(logMin + k * ringWidth);
+      const outer = Math.exp(logMin + (k + 1) * ringWidth);
+      // Half-pixel steps, and at least the ring's midpoint when it is narrower.
+      const steps = Math.max(1, Math.ceil((outer - inner) * 2));
+      let lastX = NaN, lastY = NaN;
+      for (let step = 0; step < steps; step++) {
+        const r = inner + ((step + 0.5) * (outer - inner)) / steps;
+        const x = Math.round(r * cos);
+        const y = Math.round(r * sin);
+        if (x === lastX && y === lastY) continue;
+        dx.push(x);
+        dy.push(y);
+        lastX = x;
+        lastY = y;
+      }
+      start[a * rings + k + 1] = dx.length;
+    }
+  }
+
+  return {
+    width,
+    height,
+    angles,
+    rings,
+    logMin,
+    ringWidth,
+    start,
+    dx: Int16Array.from(dx),
+    dy: Int16Array.from(dy),
+    offset: Int32Array.from(dx, (x, i) => dy[i] * width + x)
+  };
+};
+
+export const logPolarTable = (width, height, angles = LOG_POLAR_ANGLES, rings = LOG_POLAR_RINGS) => {
+  const key = `${width}x${height}/${angles}x${rings}`;
+  let table = tableCache.get(key);
+  if (table) {
+    // Re-insert so Map order doubles as LRU order.
+    tableCache.delete(key);
+  } else {
+    table = buildLogPolarTable(width, height, angles, rings);
+    if (tableCache.size >= TABLE_CACHE_LIMIT) {
+      tableCache.delete(tableCache.keys().next().value);
+    }
+  }
+  tableCache.set(key, table);
+  return table;
+};
+
+// θ × u occupancy image around (poleX, poleY): a cell is set when any pixel
+// it spans is foreground. Rings that stay inside the image use the flat
+// offsets directly; only the outer ones need per-pixel bounds checks.
+// `angleStep` > 1 fills only every n-th ray, for cheap coarse searches.
+// `image` is overwritten, so one buffer can serve every pole.
+export const logPolarRemap = (mask, table, poleX, poleY, angleStep = 1, image = new Uint8Array(table.angles * table.rings)) => {
+  const { width, height, angles, rings, logMin, ringWidth, start, dx, dy, offset } = table;
+  image.fill(0);
+  const px = Math.round(poleX);
+  const py = Math.round(poleY);
+  const inside = Math.min(px, py, width - 1 - px, height - 1 - py) - 1;
+  const safeRings = inside > 0
+    ? Math.max(0, Math.min(rings, Math.floor((Math.log(inside) - logMin) / ringWidth)))
+    : 0;
+  const origin = py * width + px;
+
+  for (let a = 0; a < angles; a += angleStep) {
+    const row = a * rings;
+    for (let k = 0; k < rings; k++) {
+      const c = row + k;
+      if (k < safeRings) {
+        for (let i = start[c]; i < start[c + 1]; i++) {
+          if (mask[origin + offset[i]]) {
+            image[c] = 1;
+            break;
+          }
+        }
+      } else {
+        for (let i = start[c]; i < start[c + 1]; i++) {
+          const x = px + dx[i];
+          const y = py + dy[i];
+          if (x >= 0 && x < width && y >= 0 && y < height && mask[y * width + x]) {
+            image[c] = 1;
+            break;
+          }
+        }
+      }
+    }
+  }
+  return image;
+};
+
+// Remap image and crossing buffers for fits against one table. A ray has at
+// most one crossing per two rings, which bounds the crossing arrays.
+const acquireScratch = (table) => {
+  const capacity = table.angles * Math.ceil(table.rings / 2);
+  return {
+    table,
+    image: bufferPool.acquire(Uint8Array, table.angles * table.rings),
+    theta: bufferPool.acquire(Float64Array, capacity),
+    u: bufferPool.acquire(Float64Array, capacity),
+    weight: bufferPool.acquire(Float64Array, capacity),
+    gaps: bufferPool.acquire(Float64Array, capacity),
+    length: 0
+  };
+};
+
+const releaseScratch = ({ image, theta, u, weight, gaps }) => {
+  bufferPool.release(image);
+  bufferPool.release(theta);
+  bufferPool.release(u);
+  bufferPool.release(weight);
+  bufferPool.release(gaps);
+};
+
+// Centre (in u) of every run of set rings along each ray, and its radius as
+// the coherence weight, written into the scratch crossing arrays.
+const rayCrossings = (scratch, angleStep = 1) => {
+  const { image, theta, u, weight, table: { angles, rings, logMin, ringWidth } } = scratch;
+  let length = 0;
+  for (let a = 0; a < angles; a += angleStep) {
+    const row = a * rings;
+    for (let k = 0; k < rings; k++) {
+      if (!image[row + k]) continue;
+      const first = k;
+      while (k + 1 < rings && image[row + k + 1]) k++;
+      theta[length] = (2 * Math.PI * a) / angles;
+      u[length] = logMin + ((first + k + 1) / 2) * ringWidth;
+      weight[length] = Math.exp(u[length]);
+      length++;
+    }
+  }
+  scratch.length = length;
+  return scratch;
+};
+
+// Median gap in u between consecutive crossings on the same ray.
+const turnSpacing = ({ theta, u, gaps, length }) => {
+  let count = 0;
+  for (let i = 1; i < length; i++) {
+    if (theta[i] === theta[i - 1]) gaps[count++] = u[i] - u[i - 1];
+  }
+  return count ? gaps.subarray(0, count).sort()[count >> 1] : 0;
+};
+
+// Mean resultant length of the crossings' phases along u − bθ with period
+// 2π|b|: 1 when every crossing lies on one spiral, near 0 when unrelated.
+// Crossings are weighted by radius: an error δ in the pole moves u by about
+// δ/r, so the outer turns keep the score smooth while the pole is searched.
+const spiralCoherence = ({ theta, u, weight, length }, growth) => {
+  const period = 2 * Math.PI * Math.abs(growth);
+  let c = 0, s = 0, total = 0;
+  for (let i = 0; i < length; i++) {
+    const phase = (2 * Math.PI * (u[i] - growth * theta[i])) / period;
+    c += weight[i] * Math.cos(phase);
+    s += weight[i] * Math.sin(phase);
+    total += weight[i];
+  }
+  return Math.hypot(c, s) / total;
+};
+
+// Growth rate implied by the turn spacing, with the handedness (sign, in
+// image coordinates) that lines the crossings up best. `refine` also searches
+// ±GROWTH_REFINE around the estimate.
+const fitGrowth = (crossings, refine = false) => {
+  const spacing = turnSpacing(crossings);
+  if (!(spacing > 0) || crossings.length < MIN_CROSSINGS) return { growth: 0, coherence: 0 };
+
+  const estimate = spacing / (2 * Math.PI);
+  const steps = refine ? GROWTH_STEPS : 1;
+  let best = { growth: 0, coherence: 0 };
+  for (let step = 0; step < steps; step++) {
+    const magnitude = refine
+      ? estimate * (1 - GROWTH_REFINE + (2 * GROWTH_REFINE * step) / (steps - 1))
+      : estimate;
+    for (const growth of [magnitude, -magnitude]) {
+      const coherence = spiralCoherence(crossings, growth);
+      if (coherence > best.coherence) best = { growth, coherence };
+    }
+  }
+  return best;
+};
+
+// Best pole on a (2·half + 1)² grid around (cx, cy), or `best` when none
+// beats it.
+const searchPoles = (mask, scratch, best, cx, cy, half, stepX, stepY, angleStep) => {
+  for (let i = -half; i <= half; i++) {
+    for (let j = -half; j <= half; j++) {
+      const poleX = cx + j * stepX;
+      const poleY = cy + i * stepY;
+      logPolarRemap(mask, scratch.table, poleX, poleY, angleStep, scratch.image);
+      const fit = fitGrowth(rayCrossings(scratch, angleStep));
+      if (fit.coherence > best.coherence) best = { poleX, poleY, ...fit };
+    }
+  }
+  return best;
+};
+
+// Fits r(θ) = a·e^(bθ) to the mask. A spiral's centroid is not its pole, so
+// the pole is searched coarse-to-fine on a copy pooled to POLE_SEARCH_SIZE: a
+// grid over the middle of the bounding box, then finer grids around the best
+// pole so far. Only the last grid, one pooled pixel wide, and the growth
+// refinement run at full resolution.
+export const fitLogSpiral = (mask, width, height, { minX, maxX, minY, maxY }) => {
+  const coarse = poolMask(mask, width, height, POLE_SEARCH_SIZE);
+  const toCoarse = (v) => (v + 0.5) / coarse.scale - 0.5;
+  const fromCoarse = (v) => (v + 0.5) * coarse.scale - 0.5;
+  const coarseScratch = acquireScratch(logPolarTable(coarse.width, coarse.height, POLE_SEARCH_ANGLES, POLE_SEARCH_RINGS));
+  const scratch = acquireScratch(logPolarTable(width, height));
+
+  try {
+    let best = {
+      poleX: toCoarse((minX + maxX) / 2),
+      poleY: toCoarse((minY + maxY) / 2),
+      growth: 0,
+      coherence: 0
+    };
+    let stepX = ((maxX - minX) * POLE_SPAN) / POLE_GRID_HALF / coarse.scale;
+    let stepY = ((maxY - minY) * POLE_SPAN) / POLE_GRID_HALF / coarse.scale;
+    for (let level = 0, half = POLE_GRID_HALF; level <= POLE_REFINEMENTS; level++, half = 1) {
+      best = searchPoles(coarse.mask, coarseScratch, best, best.poleX, best.poleY, half, stepX, stepY,
+        level === 0 ? COARSE_ANGLE_STEP : 1);
+      stepX /= 2;
+      stepY /= 2;
+    }
+
+    // One pooled pixel is several here, so a last grid that wide places the
+    // pole at full resolution, on every third ray like the coarse grid.
+    // Coherence is only comparable within one resolution, so it starts over.
+    const cx = fromCoarse(best.poleX);
+    const cy = fromCoarse(best.poleY);
+    const step = coarse.scale / 2;
+    best = searchPoles(mask, scratch, { poleX: cx, poleY: cy, growth: 0, coherence: 0 },
+      cx, cy, coarse.scale > 1 ? 1 : 0, step, step, COARSE_ANGLE_STEP);
+
+    logPolarRemap(mask, scratch.table, best.poleX, best.poleY, 1, scratch.image);
+    const fit = fitGrowth(rayCrossings(scratch), true);
+    return fit.coherence > best.coherence ? { ...best, ...fit } : best;
+  } finally {
+    releaseScratch(coarseScratch);
+    releaseScratch(scratch);
+  }
+};
+
+// Whether the features measured before this stage already rule a spiral out:
+// a classification rule ranked ahead of the spiral rule matches, or the
+// outline has continuous or strong n-fold (n ≥ 2) rotational symmetry. The
+// fit models a single arm, whose outline changes under every rotation.
+const SPIRAL_RULE = CLASSIFICATION_RULES.findIndex(({ id }) => id === 'spiral');
+
+export const spiralRuledOut = (features) => (
+  CLASSIFICATION_RULES.slice(0, SPIRAL_RULE).some((rule) => rule.test(features))
+  || features.symmetryOrder === 0
+  || (features.symmetryOrder >= 2 && features.symmetryStrength > SYMMETRY_RULES_OUT)
+);
+
+// Spiral features for a foreground mask from features.js, fitted on a copy
+// OR-pooled to SPIRAL_MAX_SIZE (tiled decodes start from their overview). The
+// pole is reported in image pixels; when `features` rule a spiral out the fit
+// is skipped and the pole and growth are null.
+export const spiralFeatures = ({ mask, width, height, overview }, features) => {
+  if (spiralRuledOut(features)) {
+    return { spiralPole: null, spiralGrowth: null, spiralCoherence: 0, spiralPhiDeviation: null };
+  }
+  const { minX, maxX, minY, maxY } = features;
+  const source = mask ? { mask, width, height, scale: 1 } : overview;
+  const work = poolMask(source.mask, source.width, source.height, SPIRAL_MAX_SIZE);
+  const scale = source.scale * work.scale;
+  const toWork = (v) => (v + 0.5) / scale - 0.5;
+  const fit = fitLogSpiral(work.mask, work.width, work.height, {
+    minX: toWork(minX), maxX: toWork(maxX), minY: toWork(minY), maxY: toWork(maxY)
+  });
+  return {
+    spiralPole: [(fit.poleX + 0.5) * scale - 0.5, (fit.poleY + 0.5) * scale - 0.5],
+    spiralGrowth: fit.growth,
+    spiralCoherence: fit.coherence,
+    spiralPhiDeviation: Math.abs(Math.abs(fit.growth) - GOLDEN_GROWTH)
+  };
+};
@@ -0,0 +1,196 @@
+// Managed image memory. Everything a decode keeps alive beyond a single call
+// (canvas backing stores, pooled pixel and mask buffers, open ImageBitmaps,
+// object URLs for uploads) goes through this module, which reuses what it can
+// and keeps a ledger of retained bytes, current and peak, per kind.
+//
+// Canvases are resized only when their dimensions actually change, and
+// scratch canvases only ever grow, so repeated decodes at the usual preview
+// size reuse one backing store. Typed-array buffers are pooled by byte length
+// up to POOL_MAX_BYTES. Bitmaps must be closed and object URLs revoked through
+// the helpers below for the ledger to stay accurate.
+
+export const POOL_MAX_BYTES = 32 * 1024 * 1024;
+
+export class MemoryLedger {
+  constructor() {
+    this.kinds = new Map();
+    this.remote = new Map();
+    this.peakBytes = 0;
+    this.listeners = new Set();
+  }
+
+  get retainedBytes() {
+    let total = 0;
+    this.kinds.forEach((bytes) => {
+      total += bytes;
+    });
+    this.remote.forEach(({ retainedBytes }) => {
+      total += retainedBytes;
+    });
+    return total;
+  }
+
+  adjust(kind, delta) {
+    if (!delta) return;
+    this.kinds.set(kind, Math.max(0, (this.kinds.get(kind) || 0) + delta));
+    this.changed();
+  }
+
+  // Stats reported by another realm (a worker's own ledger); removed again
+  // when that worker is terminated.
+  setRemote(name, stats) {
+    this.remote.set(name, stats);
+    this.changed();
+  }
+
+  removeRemote(name) {
+    if (this.remote.delete(name)) this.changed();
+  }
+
+  changed() {
+    this.peakBytes = Math.max(this.peakBytes, this.retainedBytes);
+    this.listeners.forEach((listener) => listener());
+  }
+
+  stats() {
+    const byKind = Object.fromEntries(this.kinds);
+    this.remote.forEach(({ retainedBytes }, name) => {
+      byKind[name] = retainedBytes;
+    });
+    return { retainedBytes: this.retainedBytes, peakBytes: this.peakBytes, byKind };
+  }
+
+  subscribe(listener) {
+    this.listeners.add(listener);
+    return () => this.listeners.delete(listener);
+  }
+}
+
+// One ledger per realm.
+export const memory = new MemoryLedger();
+
+export class BufferPool {
+  constructor(maxBytes = POOL_MAX_BYTES, ledger = memory) {
+    this.maxBytes = maxBytes;
+    this.ledger = ledger;
+    this.free = new Map();
+    this.pooledBytes = 0;
+  }
+
+  // A zeroed view of `length` elements, on a recycled buffer when one of the
+  // exact byte length is free.
+  acquire(Type, length) {
+    const byteLength = length * Type.BYTES_PER_ELEMENT;
+    const buffer = this.free.get(byteLength)?.pop();
+    if (!buffer) return new Type(length);
+
+    this.pooledBytes -= byteLength;
+    this.ledger.adjust('pool', -byteLength);
+    return new Type(buffer).fill(0);
+  }
+
+  // Returns a view's buffer to the pool, dropping the sizes pooled longest
+  // ago when it would overflow. Detached buffers (transferred to a worker)
+  // and buffers larger than the whole pool are left to the GC.
+  release(view) {
+    const { buffer } = view;
+    const byteLength = buffer.byteLength;
+    if (!byteLength || view.byteOffset !== 0 || view.byteLength !== byteLength) return;
+    if (byteLength > this.maxBytes || this.free.get(byteLength)?.includes(buffer)) return;
+
+    while (this.pooledBytes + byteLength > this.maxBytes) {
+      const [oldest, buffers] = this.free.entries().next().value;
+      buffers.pop();
+      if (!buffers.length) this.free.delete(oldest);
+      this.pooledBytes -= oldest;
+      this.ledger.adjust('pool', -oldest);
+    }
+
+    let list = this.free.get(byteLength);
+    if (!list) this.free.set(byteLength, list = []);
+    list.push(buffer);
+    this.pooledBytes += byteLength;
+    this.ledger.adjust('pool', byteLength);
+  }
+
+  clear() {
+    this.ledger.adjust('pool', -this.pooledBytes);
+    this.free.clear();
+    this.pooledBytes = 0;
+  }
+}
+
+export const bufferPool = new BufferPool();
+
+const canvasBytes = new WeakMap();
+
+// Sizes a canvas (DOM or Offscreen) without touching it when the dimensions
+// already match: assigning width or height always reallocates the backing
+// store, even to the same value.
+export const sizeCanvas = (canvas, width, height) => {
+  if (canvas.width !== width || canvas.height !== height) {
+    canvas.width = width;
+    canvas.height = height;
+  }
+  const bytes = width * height * 4;
+  memory.adjust('canvas', bytes - (canvasBytes.get(canvas) || 0));
+  canvasBytes.set(canvas, bytes);
+  return canvas;
+};
+
+export const releaseCanvas = (canvas) => {
+  memory.adjust('canvas', -(canvasBytes.get(canvas) || 0));
+  canvasBytes.delete(canvas);
+  canvas.width = 0;
+  canvas.height = 0;
+};
+
+const scratch = new Map();
+
+// A per-purpose OffscreenCanvas at least width × height. It only grows, so
+// callers draw into and read back the top-left width × height region.
+export const scratchCanvas = (name, width, height) => {
+  let canvas = scratch.get(name);
+  if (!canvas) {
+    canvas = new OffscreenCanvas(width, height);
+    scratch.set(name, canvas);
+  }
+  return sizeCanvas(canvas, Math.max(canvas.width, width), Math.max(canvas.height, height));
+};
+
+const bitmapBytes = new WeakMap();
+
+export const trackBitmap = (bitmap) => {
+  const bytes = bitmap.width * bitmap.height * 4;
+  bitmapBytes.set(bitmap, bytes);
+  memory.adjust('bitmaps', bytes);
+  return bitmap;
+};
+
+export const closeBitmap = (bitmap) => {
+  memory.adjust('bitmaps', -(bitmapBytes.get(bitmap) || 0));
+  bitmapBytes.delete(bitmap);
+  bitmap.close();
+};
+
+const urlBytes = new Map();
+
+export const createObjectUrl = (blob) => {
+  const url = URL.createObjectURL(blob);
+  urlBytes.set(url, blob.size);
+  memory.adjust('objectUrls', blob.size);
+  return url;
+};
+
+export const revokeObjectUrl = (url) => {
+  if (!url) return;
+  URL.revokeObjectURL(url);
+  memory.adjust('objectUrls', -(urlBytes.get(url) || 0));
+  urlBytes.delete(url);
+};
+
+export const formatBytes = (bytes) => {
+  if (bytes < 1024) return `${bytes} B`;
+  if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+  return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+};
@@ -0,0 +1,217 @@
+// Built-in latency instrumentation. Every span is also a User Timing measure
+// (performance.mark/measure), so it shows up in a DevTools recording; on top of
+// that each span name keeps a rolling window of durations for p50/p95, and a
+// bounded log of recent spans can be exported as Chrome trace-event JSON
+// (chrome://tracing, Perfetto) from a user's browser without a profiler.
+//
+// Kernel stages run in the decode worker; their spans are reported back with
+// an absolute end time and placed on a separate "worker" track.
+
+export const PERF_WINDOW = 200;
+export const PERF_TRACE_LIMIT = 5000;
+
+const HUD_REFRESH_MS = 250;
+const TRACKS = { main: 1, worker: 2 };
+
+const now = () => performance.now();
+const hasUserTiming = typeof performance !== 'undefined' && typeof performance.measure === 'function';
+
+// User Timing entries are cleared as soon as they are created: DevTools has
+// already captured them, and the global buffer would otherwise grow forever.
+export const userTimingSpan = (name, start, duration) => {
+  if (!hasUserTiming) return;
+  try {
+    performance.measure(name, { start, duration });
+    performance.clearMeasures(name);
+  } catch (err) {
+    // Older engines only take mark names; the rolling stats still work.
+  }
+};
+
+const percentile = (sorted, p) => sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+
+export class PerfRecorder {
+  constructor(windowSize = PERF_WINDOW, traceLimit = PERF_TRACE_LIMIT) {
+    this.windowSize = windowSize;
+    this.traceLimit = traceLimit;
+    this.windows = new Map();
+    this.events = [];
+    this.listeners = new Set();
+    this.nextMark = 0;
+  }
+
+  // Starts a span; call the returned function to end it. Ending it with an
+  // outcome ('error', 'aborted') records it as "name (outcome)", so failed
+  // runs get their own stats instead of skewing the successful ones.
+  start(name, track = 'main') {
+    // Unique mark names keep overlapping spans of one name apart.
+    const mark = `${name}:${this.nextMark++}`;
+    if (hasUserTiming) performance.mark(mark);
+    const start = now();
+    return (outcome) => {
+      const duration = now() - start;
+      const span = outcome ? `${name} (${outcome})` : name;
+      if (hasUserTiming) {
+        performance.measure(span, mark);
+        performance.clearMarks(mark);
+        performance.clearMeasures(span);
+      }
+      this.add(span, start, duration, track);
+      return duration;
+    };
+  }
+
+  time(name, fn, track) {
+    const end = this.start(name, track);
+    try {
+      return fn();
+    } finally {
+      end();
+    }
+  }
+
+  async timeAsync(name, fn, track) {
+    const end = this.start(name, track);
+    try {
+      return await fn();
+    } finally {
+      end();
+    }
+  }
+
+  // A span measured elsewhere, with `start` on this realm's performance.now()
+  // clock (e.g. React Profiler callbacks).
+  record(name, start, duration, track = 'main') {
+    userTimingSpan(name, start, duration);
+    this.add(name, start, duration, track);
+  }
+
+  // A span measured in another realm (a worker), ending at the absolute time
+  // `endEpochMs` = that realm's performance.timeOrigin + performance.now().
+  recordRemote(name, endEpochMs, duration, track = 'worker') {
+    const start = endEpochMs - performance.timeOrigin - duration;
+    this.add(name, start, duration, track);
+  }
+
+  add(name, start, duration, track) {
+    let samples = this.windows.get(name);
+    if (!samples) {
+      samples = { values: new Float64Array(this.windowSize), next: 0, count: 0 };
+      this.windows.set(name, samples);
+    }
+    samples.values[samples.next] = duration;
+    samples.next = (samples.next + 1) % this.windowSize;
+    samples.count++;
+
+    this.events.push({ name, start, duration, track });
+    if (this.events.length > this.traceLimit * 1.5) this.events.splice(0, this.events.length - this.traceLimit);
+    this.listeners.forEach((listener) => listener());
+  }
+
+  // p50/p95 over the last `windowSize` spans of each name, slowest p95 first.
+  stats() {
+    return [...this.windows].map(([name, { values, next, count }]) => {
+      const size = Math.min(count, this.windowSize);
+      const sorted = values.slice(0, size).sort();
+      return {
+        name,
+        count,
+        last: values[(next + this.windowSize - 1) % this.windowSize],
+        p50Ms: percentile(sorted, 0.5),
+        p95Ms: percentile(sorted, 0.95)
+      };
+    }).sort((a, b) => b.p95Ms - a.p95Ms);
+  }
+
+  // Chrome trace-event format: complete ('X') events in microseconds since
+  // this realm's time origin, one thread per track.
+  exportTrace() {
+    const pid = 1;
+    const metadata = Object.entries(TRACKS).map(([track, tid]) => ({
+      name: 'thread_name', ph: 'M', pid, tid, args: { name: track }
+    }));
+    const spans = this.events.slice(-this.traceLimit).map(({ name, start, duration, track }) => ({
+      name,
+      cat: track,
+      ph: 'X',
+      pid,
+      tid: TRACKS[track] || TRACKS.main,
+      ts: Math.round(start * 1000),
+      dur: Math.round(duration * 1000)
+    }));
+    return {
+      traceEvents: [...metadata, ...spans],
+      displayTimeUnit: 'ms',
+      otherData: { timeOrigin: performance.timeOrigin, stats: this.stats() }
+    };
+  }
+
+  subscribe(listener) {
+    this.listeners.add(listener);
+    return () => this.listeners.delete(listener);
+  }
+
+  reset() {
+    this.windows.clear();
+    this.events = [];
+    this.listeners.forEach((listener) => listener());
+  }
+}
+
+// One recorder per realm, shared by the front ends and the decoder client.
+export const perf = new PerfRecorder();
+
+export const downloadTrace = (recorder = perf, filename = 'decoder-trace.json') => {
+  const url = URL.createObjectURL(new Blob([JSON.stringify(recorder.exportTrace())], { type: 'application/json' }));
+  const link = document.createElement('a');
+  link.href = url;
+  link.download = filename;
+  link.click();
+  setTimeout(() => URL.revokeObjectURL(url), 0);
+};
+
+const formatMs = (ms) => (ms >= 100 ? ms.toFixed(0) : ms.toFixed(1));
+
+// Fixed-position overlay with the rolling stats and a trace export button.
+// Plain DOM so both front ends can mount it; redraws are throttled so the
+// HUD never adds measurable work to what it is measuring. Returns an unmount
+// function.
+export const mountPerfHud = (recorder = perf, parent = document.body) => {
+  const hud = document.createElement('div');
+  hud.style.cssText = 'position:fixed;right:12px;bottom:12px;z-index:9999;max-height:60vh;overflow:auto;'
+    + 'padding:8px 10px;border-radius:8px;background:rgba(10,10,20,0.88);color:#e5e7eb;'
+    + 'font:11px/1.4 ui-monospace,Menlo,monospace;box-shadow:0 4px 16px rgba(0,0,0,0.4)';
+  const table = document.createElement('table');
+  table.style.cssText = 'border-collapse:collapse;white-space:nowrap';
+  const actions = document.createElement('div');
+  actions.style.cssText = 'display:flex;gap:6px;margin-top:6px';
+  [['Export trace', () => downloadTrace(recorder)], ['Reset', () => recorder.reset()]].forEach(([label, onClick]) => {
+    const button = document.createElement('button');
+    button.textContent = label;
+    button.style.cssText = 'font:inherit;padding:2px 8px;border-radius:4px;border:1px solid #6b7280;background:#1f2937;color:inherit;cursor:pointer';
+    button.onclick = onClick;
+    actions.appendChild(button);
+  });
+  hud.append(table, actions);
+
+  let timer = null;
+  const render = () => {
+    timer = null;
+    const cell = (text, align = 'right') => `<td style="padding:1px 6px;text-align:${align}">${text}</td>`;
+    table.innerHTML = `<tr style="color:#9ca3af">${cell('span', 'left')}${cell('n')}${cell('last')}${cell('p50')}${cell('p95')}</tr>`
+      + recorder.stats().map(({ name, count, last, p50Ms, p95Ms }) => (
+        `<tr>${cell(name, 'left')}${cell(count)}${cell(formatMs(last))}${cell(formatMs(p50Ms))}${cell(formatMs(p95Ms))}</tr>`
+      )).join('');
+  };
+  const unsubscribe = recorder.subscribe(() => {
+    if (!timer) timer = setTimeout(render, HUD_REFRESH_MS);
+  });
+
+  render();
+  parent.appendChild(hud);
+  return () => {
+    unsubscribe();
+    clearTimeout(timer);
+    hud.remove();
+  };
+};
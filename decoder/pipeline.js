@@ -0,0 +1,23 @@
+// Staged execution for the decode kernel. Each stage is a plain function over
+// a shared state object; runStages times every stage and reports it the moment
+// it finishes, so progress reflects real work rather than a timer. Stages are
+// also User Timing measures, so they appear on the worker's DevTools track.
+
+import { userTimingSpan } from './perf.js';
+
+const now = () => (typeof performance !== 'undefined' ? performance.now() : Date.now());
+
+export const runStages = (stages, state, { onProgress } = {}) => {
+  const timings = [];
+
+  stages.forEach(({ id, label, run }, i) => {
+    const start = now();
+    run(state);
+    const ms = now() - start;
+    userTimingSpan(`stage:${id}`, start, ms);
+    timings.push({ id, label, ms });
+    onProgress?.(id, i + 1, stages.length, ms);
+  });
+
+  return timings;
+};
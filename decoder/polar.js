@@ -0,0 +1,122 @@
+// Polar resampling of the foreground mask and rotational symmetry detection.
+//
+// Sample positions are turned into flat mask indices once per (width, height,
+// centre bucket) and cached, so repeat decodes only pay for the lookups. The
+// silhouette profile is then run through an FFT to find the n-fold rotational
+// order of the figure.
+
+import { powerSpectrum } from './fft.js';
+
+export const POLAR_ANGLES = 128;
+const RADIAL_STEP = 1;
+const CENTER_BUCKET = 2;
+const TABLE_CACHE_LIMIT = 32;
+
+const trigCache = new Map();
+const tableCache = new Map();
+
+const trigTable = (angles) => {
+  let table = trigCache.get(angles);
+  if (!table) {
+    table = { cos: new Float64Array(angles), sin: new Float64Array(angles) };
+    for (let a = 0; a < angles; a++) {
+      table.cos[a] = Math.cos((2 * Math.PI * a) / angles);
+      table.sin[a] = Math.sin((2 * Math.PI * a) / angles);
+    }
+    trigCache.set(angles, table);
+  }
+  return table;
+};
+
+const buildPolarTable = (width, height, cx, cy, angles) => {
+  const { cos, sin } = trigTable(angles);
+  const radii = Math.ceil(Math.min(width, height) / 2 / RADIAL_STEP);
+  const indices = new Int32Array(angles * radii);
+
+  for (let a = 0, i = 0; a < angles; a++) {
+    for (let r = 0; r < radii; r++, i++) {
+      const x = Math.round(cx + r * RADIAL_STEP * cos[a]);
+      const y = Math.round(cy + r * RADIAL_STEP * sin[a]);
+      indices[i] = x >= 0 && x < width && y >= 0 && y < height ? y * width + x : -1;
+    }
+  }
+
+  return { width, height, cx, cy, angles, radii, indices };
+};
+
+export const polarTable = (width, height, centerX, centerY, angles = POLAR_ANGLES) => {
+  const cx = Math.round(centerX / CENTER_BUCKET) * CENTER_BUCKET;
+  const cy = Math.round(centerY / CENTER_BUCKET) * CENTER_BUCKET;
+  const key = `${width}x${height}@${cx},${cy}/${angles}`;
+
+  let table = tableCache.get(key);
+  if (table) {
+    // Re-insert so Map order doubles as LRU order.
+    tableCache.delete(key);
+  } else {
+    table = buildPolarTable(width, height, cx, cy, angles);
+    if (tableCache.size >= TABLE_CACHE_LIMIT) {
+      tableCache.delete(tableCache.keys().next().value);
+    }
+  }
+  tableCache.set(key, table);
+  return table;
+};
+
+// One pass over the table yields two profiles per ray: the number of
+// foreground samples (`hits`) and the radius of the outermost one (`extent`).
+export const angularProfile = (mask, { angles, radii, indices }) => {
+  const hits = new Array(angles);
+  const extent = new Array(angles);
+
+  for (let a = 0, i = 0; a < angles; a++) {
+    let count = 0;
+    let outer = 0;
+    for (let r = 0; r < radii; r++, i++) {
+      const idx = indices[i];
+      if (idx >= 0 && mask[idx]) {
+        count++;
+        outer = r;
+      }
+    }
+    hits[a] = count;
+    extent[a] = outer;
+  }
+
+  return { hits, extent };
+};
+
+const ISOTROPY_LIMIT = 0.02;
+const HARMONIC_SHARE = 0.6;
+
+// The symmetry order is the largest n whose harmonics (n, 2n, 3n, ...) carry
+// at least HARMONIC_SHARE of the angular variation of the silhouette; that
+// share is reported as the strength. A silhouette that barely varies with
+// angle (disc, ring) is reported as order 0.
+export const rotationalSymmetry = (extent) => {
+  const n = extent.length;
+  const mean = extent.reduce((sum, r) => sum + r, 0) / n;
+  const variance = extent.reduce((sum, r) => sum + (r - mean) * (r - mean), 0) / n;
+
+  if (mean === 0 || Math.sqrt(variance) / mean < ISOTROPY_LIMIT) {
+    return { symmetryOrder: 0, symmetryStrength: 0 };
+  }
+
+  const power = powerSpectrum(extent);
+  let harmonic = 0;
+  for (let k = 1; k < power.length; k++) harmonic += power[k];
+
+  const share = (order) => {
+    let sum = 0;
+    for (let k = order; k < power.length; k += order) sum += power[k];
+    return sum / harmonic;
+  };
+
+  for (let order = n / 4; order >= 2; order--) {
+    const strength = share(order);
+    if (strength >= HARMONIC_SHARE) {
+      return { symmetryOrder: order, symmetryStrength: strength };
+    }
+  }
+  return { symmetryOrder: 1, symmetryStrength: 1 };
+};
@@ -0,0 +1,135 @@
+// Fixed-size pool of decode workers for batch runs and inverse-design
+// searches. Files stay queued as lazy File handles; a file is only decoded
+// into an ImageBitmap once a worker is free to take it, so at most `size`
+// bitmaps are alive at any time.
+
+import { abortError, createDecoderWorker } from './client.js';
+
+const defaultPoolSize = () => (
+  (typeof navigator !== 'undefined' && navigator.hardwareConcurrency) || 4
+);
+
+export class DecoderPool {
+  constructor(size = defaultPoolSize()) {
+    this.size = size;
+    this.slots = [];
+    this.queue = [];
+    this.nextId = 1;
+  }
+
+  decodeFile(file, { maxSize = 400 } = {}) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ file, maxSize, resolve, reject });
+      this.pump();
+    });
+  }
+
+  // Renders encode-mode parameters and decodes the result in a worker;
+  // resolves to the transcoder view (inverse.js).
+  evaluate(params) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({
+        message: { type: 'evaluate', params },
+        resolve: ({ transcoder }) => resolve(transcoder),
+        reject
+      });
+      this.pump();
+    });
+  }
+
+  get pending() {
+    return this.queue.length + this.slots.filter((slot) => slot.job).length;
+  }
+
+  spawn() {
+    const slot = { worker: createDecoderWorker(), job: null };
+    slot.worker.onmessage = ({ data }) => this.handleMessage(slot, data);
+    slot.worker.onerror = (event) => {
+      event.preventDefault();
+      this.retire(slot, new Error(event.message || 'Decoder worker failed'));
+      this.pump();
+    };
+    this.slots.push(slot);
+    return slot;
+  }
+
+  idleSlot() {
+    const slot = this.slots.find((candidate) => !candidate.job);
+    if (slot) return slot;
+    return this.slots.length < this.size ? this.spawn() : null;
+  }
+
+  pump() {
+    while (this.queue.length) {
+      const slot = this.idleSlot();
+      if (!slot) return;
+      this.start(slot, this.queue.shift());
+    }
+  }
+
+  async start(slot, job) {
+    job.id = this.nextId++;
+    slot.job = job;
+    if (job.message) {
+      slot.worker.postMessage({ ...job.message, id: job.id });
+      return;
+    }
+    try {
+      const bitmap = await createImageBitmap(job.file);
+      if (slot.job !== job) {
+        bitmap.close();
+        return;
+      }
+      slot.worker.postMessage(
+        { type: 'decodeBitmap', id: job.id, maxSize: job.maxSize, bitmap },
+        [bitmap]
+      );
+    } catch (err) {
+      this.finish(slot, job, err);
+    }
+  }
+
+  handleMessage(slot, message) {
+    const job = slot.job;
+    if (!job || message.id !== job.id) return;
+
+    if (message.type === 'result') {
+      const { type, id, ...result } = message;
+      this.finish(slot, job, null, result);
+    } else if (message.type === 'error') {
+      this.finish(slot, job, new Error(message.message));
+    }
+  }
+
+  finish(slot, job, err, result) {
+    if (slot.job !== job) return;
+    slot.job = null;
+    if (err) {
+      job.reject(err);
+    } else {
+      job.resolve(result);
+    }
+    this.pump();
+  }
+
+  retire(slot, err) {
+    slot.worker.terminate();
+    this.slots = this.slots.filter((candidate) => candidate !== slot);
+    const job = slot.job;
+    slot.job = null;
+    job?.reject(err);
+  }
+
+  cancel() {
+    const queued = this.queue;
+    this.queue = [];
+    queued.forEach((job) => job.reject(abortError()));
+    this.slots.filter((slot) => slot.job).forEach((slot) => this.retire(slot, abortError()));
+  }
+
+  dispose() {
+    this.cancel();
+    this.slots.forEach((slot) => slot.worker.terminate());
+    this.slots = [];
+  }
+}
@@ -0,0 +1,32 @@
+// Main-thread access to the preset signature index. The index is built once in
+// a worker, persisted in IndexedDB under SIGNATURE_VERSION and reloaded from
+// there on later visits.
+
+import { DecoderClient } from './client.js';
+import { idbGet, idbPut } from './idb.js';
+import { SIGNATURE_VERSION, SignatureIndex } from './signatures.js';
+
+const RECORD_KEY = 'presets';
+
+const readStoredRecord = async () => {
+  try {
+    const record = await idbGet('signatures', RECORD_KEY);
+    return record && record.version === SIGNATURE_VERSION ? record : null;
+  } catch (err) {
+    return null;
+  }
+};
+
+export const loadPresetIndex = async () => {
+  const stored = await readStoredRecord();
+  if (stored) return SignatureIndex.fromRecord(stored);
+
+  const builder = new DecoderClient();
+  try {
+    const { record } = await builder.run({ type: 'buildPresetIndex' }, []);
+    idbPut('signatures', RECORD_KEY, record).catch(() => {});
+    return SignatureIndex.fromRecord(record);
+  } finally {
+    builder.dispose();
+  }
+};
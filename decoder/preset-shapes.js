@@ -0,0 +1,152 @@
+// Reference drawings for the preset symbols, used to derive their numeric
+// signatures. Each renderer draws onto a 2D context at SHAPE_SIZE × SHAPE_SIZE
+// using only beginPath/arc/moveTo/lineTo/stroke/fill, so any canvas-like
+// context (DOM, OffscreenCanvas or a headless rasterizer) can replay it.
+// Constellations are stylized star-and-line glyphs, not sky charts.
+
+export const SHAPE_SIZE = 400;
+
+const C = SHAPE_SIZE / 2;
+const PHI = (1 + Math.sqrt(5)) / 2;
+
+const circle = (ctx, x, y, r) => {
+  ctx.beginPath();
+  ctx.arc(x, y, r, 0, Math.PI * 2);
+  ctx.stroke();
+};
+
+const polyline = (ctx, points) => {
+  ctx.beginPath();
+  points.forEach(([x, y], i) => (i ? ctx.lineTo(x, y) : ctx.moveTo(x, y)));
+  ctx.stroke();
+};
+
+const star = (ctx, x, y, r = 5) => {
+  ctx.beginPath();
+  ctx.arc(x, y, r, 0, Math.PI * 2);
+  ctx.fill();
+};
+
+// Glyph coordinates are given in [-1, 1] and mapped onto the canvas.
+const toCanvas = ([x, y]) => [C + x * 170, C + y * 170];
+
+const constellation = (paths, extraStars = []) => (ctx) => {
+  paths.forEach((path) => {
+    const points = path.map(toCanvas);
+    polyline(ctx, points);
+    points.forEach(([x, y]) => star(ctx, x, y));
+  });
+  extraStars.forEach(([x, y, r]) => star(ctx, ...toCanvas([x, y]), r));
+};
+
+const hexRing = (distance, offset = 0) => (
+  Array.from({ length: 6 }, (_, i) => {
+    const angle = offset + (i * Math.PI) / 3;
+    return [distance * Math.cos(angle), distance * Math.sin(angle)];
+  })
+);
+
+const metatronCenters = [[0, 0], ...hexRing(60, -Math.PI / 2), ...hexRing(120, -Math.PI / 2)];
+
+export const PRESET_SHAPES = {
+  seedOfLife: (ctx) => {
+    [[0, 0], ...hexRing(60)].forEach(([x, y]) => circle(ctx, C + x, C + y, 60));
+  },
+  flowerOfLife: (ctx) => {
+    [[0, 0], ...hexRing(40), ...hexRing(80), ...hexRing(40 * Math.sqrt(3), Math.PI / 6)]
+      .forEach(([x, y]) => circle(ctx, C + x, C + y, 40));
+  },
+  torus: (ctx) => {
+    for (let i = 0; i < 12; i++) {
+      const angle = (i * Math.PI) / 6;
+      circle(ctx, C + 70 * Math.cos(angle), C + 70 * Math.sin(angle), 50);
+    }
+  },
+  goldenSpiral: (ctx) => {
+    // r(θ) = a·e^(bθ) with b = ln(φ)/π, as stated by the preset.
+    const b = Math.log(PHI) / Math.PI;
+    const points = [];
+    for (let theta = 0; theta <= 6 * Math.PI; theta += Math.PI / 90) {
+      const r = 10 * Math.exp(b * theta);
+      points.push([C + r * Math.cos(theta), C + r * Math.sin(theta)]);
+    }
+    polyline(ctx, points);
+  },
+  vesicaPiscis: (ctx) => {
+    circle(ctx, C - 45, C, 90);
+    circle(ctx, C + 45, C, 90);
+  },
+  metatronsCube: (ctx) => {
+    metatronCenters.forEach(([x, y]) => circle(ctx, C + x, C + y, 30));
+    metatronCenters.forEach(([x1, y1], i) => {
+      metatronCenters.slice(i + 1).forEach(([x2, y2]) => {
+        polyline(ctx, [[C + x1, C + y1], [C + x2, C + y2]]);
+      });
+    });
+  },
+  aries: constellation([[[-0.8, -0.3], [-0.1, 0.2], [0.4, 0.1], [0.8, -0.2]]]),
+  taurus: constellation(
+    [[[-0.8, -0.7], [-0.1, 0.2], [0.1, 0.4]], [[0.1, 0.4], [0.3, 0.1], [0.8, -0.6]]],
+    [[0.0, 0.3, 9], [-0.2, 0.35, 4], [0.05, 0.15, 4], [0.2, 0.45, 4]]
+  ),
+  gemini: constellation([
+    [[-0.4, -0.8], [-0.45, -0.3], [-0.4, 0.2], [-0.5, 0.8]],
+    [[0.3, -0.8], [0.25, -0.3], [0.35, 0.2], [0.3, 0.8]],
+    [[-0.45, -0.3], [0.25, -0.3]]
+  ], [[-0.4, -0.8, 9], [0.3, -0.8, 9]]),
+  cancer: constellation(
+    [[[0, -0.1], [0, -0.8]], [[0, -0.1], [-0.6, 0.6]], [[0, -0.1], [0.6, 0.6]]],
+    [[-0.1, 0.0, 3], [0.1, -0.05, 3], [0.05, 0.1, 3], [-0.08, -0.2, 3], [0.12, -0.18, 3], [-0.15, 0.12, 3]]
+  ),
+  leo: constellation([
+    [[0.1, 0.3], [0.0, -0.2], [0.2, -0.55], [0.5, -0.6], [0.65, -0.35], [0.5, -0.1]],
+    [[0.1, 0.3], [-0.5, 0.2], [-0.8, 0.35], [-0.45, 0.55], [0.1, 0.3]]
+  ], [[0.1, 0.3, 10]]),
+  virgo: constellation([
+    [[-0.8, -0.5], [-0.4, -0.2], [0.0, 0.0], [0.4, -0.3], [0.8, -0.6]],
+    [[0.0, 0.0], [-0.1, 0.5], [-0.4, 0.8]],
+    [[-0.1, 0.5], [0.3, 0.7], [0.7, 0.5]],
+    [[-0.4, -0.2], [-0.6, 0.2]]
+  ]),
+  libra: constellation([
+    [[0, -0.7], [-0.6, -0.1], [0, 0.3], [0.6, -0.1], [0, -0.7]],
+    [[-0.6, -0.1], [-0.7, 0.6]],
+    [[0.6, -0.1], [0.7, 0.6]]
+  ]),
+  scorpius: constellation([
+    [[0.7, -0.8], [0.5, -0.5], [0.2, -0.3], [0.0, 0.0], [-0.1, 0.3], [-0.2, 0.6], [-0.5, 0.8], [-0.8, 0.6], [-0.7, 0.35]],
+    [[0.7, -0.8], [0.85, -0.5]],
+    [[0.7, -0.8], [0.45, -0.85]]
+  ], [[0.2, -0.3, 9]]),
+  sagittarius: constellation([
+    [[-0.7, 0.5], [-0.2, 0.5], [0.2, 0.5], [0.2, 0.0], [-0.2, 0.0], [-0.7, 0.5]],
+    [[-0.2, 0.0], [0.0, -0.4], [0.2, 0.0]],
+    [[0.2, 0.0], [0.8, -0.3]],
+    [[0.8, -0.3], [0.6, -0.45]],
+    [[0.8, -0.3], [0.7, -0.1]]
+  ]),
+  capricornus: constellation([
+    [[-0.8, -0.5], [0.8, -0.6], [0.0, 0.7], [-0.8, -0.5]],
+    [[-0.4, -0.5], [0.4, -0.55], [0.0, 0.1], [-0.4, -0.5]],
+    [[-0.2, -0.5], [0.2, -0.52], [0.0, -0.2], [-0.2, -0.5]]
+  ]),
+  aquarius: constellation([
+    [[-0.9, -0.3], [-0.6, -0.5], [-0.3, -0.3], [0.0, -0.5], [0.3, -0.3], [0.6, -0.5], [0.9, -0.3]],
+    [[-0.9, 0.2], [-0.6, 0.0], [-0.3, 0.2], [0.0, 0.0], [0.3, 0.2], [0.6, 0.0], [0.9, 0.2]],
+    [[-0.6, 0.6], [-0.3, 0.4], [0.0, 0.6], [0.3, 0.4], [0.6, 0.6]]
+  ]),
+  pisces: constellation([
+    [[-0.85, -0.55], [-0.65, -0.75], [-0.45, -0.55], [-0.65, -0.35], [-0.85, -0.55]],
+    [[0.45, 0.55], [0.65, 0.35], [0.85, 0.55], [0.65, 0.75], [0.45, 0.55]],
+    [[-0.45, -0.55], [0.0, 0.6], [0.45, 0.55]]
+  ])
+};
+
+export const drawPresetShape = (ctx, key) => {
+  ctx.fillStyle = 'white';
+  ctx.fillRect(0, 0, SHAPE_SIZE, SHAPE_SIZE);
+  ctx.strokeStyle = '#1e40af';
+  ctx.fillStyle = '#1e40af';
+  ctx.lineWidth = 2;
+  PRESET_SHAPES[key](ctx);
+};
@@ -0,0 +1,59 @@
+// Coarse-to-fine decoding. The source bitmap is resampled with
+// createImageBitmap's resize options and classified at the coarsest level
+// first; finer levels are only decoded while the result sits close enough to a
+// classification boundary that resampling could flip it.
+
+import { analyzeGeometry } from './analyze.js';
+import { isNearBoundary } from './classify.js';
+import { rasterize } from './bitmap.js';
+
+export const PYRAMID_MAX_SIZE = 2048;
+export const PYRAMID_FACTORS = [4, 2, 1];
+
+export const pyramidLevels = (width, height, maxSize = PYRAMID_MAX_SIZE) => {
+  const fit = Math.min(1, maxSize / Math.max(width, height));
+  return PYRAMID_FACTORS.map((factor) => ({
+    factor,
+    width: Math.max(1, Math.round((width * fit) / factor)),
+    height: Math.max(1, Math.round((height * fit) / factor))
+  }));
+};
+
+export const decodePyramid = async (bitmap, { maxSize, tolerance, onProgress } = {}) => {
+  const levels = pyramidLevels(bitmap.width, bitmap.height, maxSize);
+  const attempts = [];
+  let result = null;
+  let failure = null;
+
+  try {
+    for (let i = 0; i < levels.length; i++) {
+      const { factor, width, height } = levels[i];
+      const scaled = await createImageBitmap(bitmap, {
+        resizeWidth: width,
+        resizeHeight: height,
+        resizeQuality: 'medium'
+      });
+      const { data } = rasterize(scaled, width, height);
+
+      try {
+        result = analyzeGeometry(data, width, height, {
+          onProgress: (stage, index, total, ms) => onProgress?.(stage, index, total, ms, i)
+        });
+        failure = null;
+      } catch (err) {
+        // Thin strokes can vanish at coarse scales; treat that as ambiguous.
+        result = null;
+        failure = err;
+      }
+
+      const ambiguous = !result || isNearBoundary(result.features, tolerance);
+      attempts.push({ factor, width, height, ambiguous });
+      if (!ambiguous) break;
+    }
+  } finally {
+    bitmap.close();
+  }
+
+  if (!result) throw failure;
+  return { ...result, pyramid: { level: attempts[attempts.length - 1], attempts, levels: levels.length } };
+};
@@ -0,0 +1,99 @@
+// Content-addressed cache of decode results, persisted in IndexedDB across
+// sessions. Entries are keyed by the SHA-256 of the file bytes, the analysis
+// version and the decode parameters, and evicted least-recently-used once the
+// store exceeds either cap.
+
+import { ANALYSIS_VERSION } from './defaults.js';
+import { openDecoderDb, promisify, transactionDone } from './idb.js';
+
+export const RESULT_CACHE_MAX_ENTRIES = 200;
+export const RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024;
+
+const STORE = 'results';
+const stats = { hits: 0, misses: 0 };
+
+export const resultCacheStats = () => ({ ...stats });
+
+const toHex = (buffer) => Array.from(new Uint8Array(buffer), (b) => b.toString(16).padStart(2, '0')).join('');
+
+export const HASH_CHUNK_SIZE = 16 * 1024 * 1024;
+
+const digest = async (buffer) => crypto.subtle.digest('SHA-256', buffer);
+
+// SubtleCrypto cannot stream, so blobs larger than one chunk are hashed as the
+// SHA-256 of their per-chunk digests; memory stays at one chunk.
+export const hashBlob = async (blob) => {
+  if (blob.size <= HASH_CHUNK_SIZE) return toHex(await digest(await blob.arrayBuffer()));
+
+  const chunks = Math.ceil(blob.size / HASH_CHUNK_SIZE);
+  const digests = new Uint8Array(chunks * 32);
+  for (let i = 0; i < chunks; i++) {
+    const chunk = await blob.slice(i * HASH_CHUNK_SIZE, (i + 1) * HASH_CHUNK_SIZE).arrayBuffer();
+    digests.set(new Uint8Array(await digest(chunk)), i * 32);
+  }
+  return toHex(await digest(digests));
+};
+
+const stableParams = (params) => Object.keys(params).sort().map((name) => `${name}=${params[name]}`).join('&');
+
+export const resultCacheKey = (hash, params = {}) => `${hash}/v${ANALYSIS_VERSION}/${stableParams(params)}`;
+
+// Resolves to the stored result or null, refreshing the entry's recency on a hit.
+export const getCachedResult = async (key) => {
+  let record = null;
+  try {
+    const db = await openDecoderDb();
+    const tx = db.transaction(STORE, 'readwrite');
+    const store = tx.objectStore(STORE);
+    record = await promisify(store.get(key));
+    if (record) store.put({ ...record, lastUsed: Date.now() });
+    await transactionDone(tx);
+  } catch (err) {
+    record = null;
+  }
+
+  if (record) {
+    stats.hits++;
+    return record.value;
+  }
+  stats.misses++;
+  return null;
+};
+
+const evict = (store) => new Promise((resolve, reject) => {
+  const entries = [];
+  const request = store.index('lastUsed').openCursor();
+  request.onerror = () => reject(request.error);
+  request.onsuccess = () => {
+    const cursor = request.result;
+    if (cursor) {
+      entries.push({ key: cursor.primaryKey, size: cursor.value.size });
+      cursor.continue();
+      return;
+    }
+
+    // Oldest first, so drop from the front until both caps hold.
+    let count = entries.length;
+    let bytes = entries.reduce((sum, { size }) => sum + size, 0);
+    for (const { key, size } of entries) {
+      if (count <= RESULT_CACHE_MAX_ENTRIES && bytes <= RESULT_CACHE_MAX_BYTES) break;
+      store.delete(key);
+      count--;
+      bytes -= size;
+    }
+    resolve();
+  }
+});
+
+export const putCachedResult = async (key, value) => {
+  try {
+    const db = await openDecoderDb();
+    const tx = db.transaction(STORE, 'readwrite');
+    const store = tx.objectStore(STORE);
+    store.put({ key, value, size: JSON.stringify(value).length, lastUsed: Date.now() });
+    await evict(store);
+    await transactionDone(tx);
+  } catch (err) {
+    // Caching is best-effort; a failed write only costs a future re-decode.
+  }
+};
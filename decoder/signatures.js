@@ -0,0 +1,157 @@
+// Numeric signatures for nearest-neighbour matching of uploads against the
+// preset catalog. Vectors live in one flat Float32Array; search standardizes
+// each dimension by its spread across the index and scans it linearly, which
+// stays well under a millisecond for thousands of entries.
+
+import { buildForegroundMask, extractFeatures } from './features.js';
+import { powerSpectrum } from './fft.js';
+import { PRESET_SHAPES, SHAPE_SIZE, drawPresetShape } from './preset-shapes.js';
+
+// Bump whenever the signature layout, feature extraction or preset shapes
+// change, so persisted indexes are rebuilt.
+export const SIGNATURE_VERSION = 1;
+
+const HARMONICS = 12;
+export const SIGNATURE_DIM = 4 + HARMONICS;
+
+// A dimension's spread is floored at this fraction of the index's median
+// spread, so one that barely varies across the presets (a harmonic share
+// that is nearly always 0) cannot dominate every distance.
+const MIN_RELATIVE_SPREAD = 0.1;
+
+const finite = (value) => (Number.isFinite(value) ? value : 0);
+
+// [log aspect, fill, compactness, radial symmetry, silhouette harmonic shares 1..12]
+export const signatureFromFeatures = (features) => {
+  const vector = new Float32Array(SIGNATURE_DIM);
+  vector[0] = finite(Math.log(Math.max(features.aspectRatio, 1e-3)));
+  vector[1] = finite(features.fillRatio);
+  vector[2] = finite(features.compactness);
+  vector[3] = finite(features.radialSymmetry);
+
+  const power = powerSpectrum(features.radialExtent);
+  let harmonic = 0;
+  for (let k = 1; k < power.length; k++) harmonic += power[k];
+  if (harmonic > 0) {
+    for (let k = 1; k <= HARMONICS; k++) vector[3 + k] = power[k] / harmonic;
+  }
+  return vector;
+};
+
+export class SignatureIndex {
+  constructor(dim = SIGNATURE_DIM) {
+    this.dim = dim;
+    this.keys = [];
+    this.vectors = new Float32Array(dim * 32);
+    this.scaled = null;
+    this.weights = null;
+  }
+
+  get size() {
+    return this.keys.length;
+  }
+
+  add(key, vector) {
+    const offset = this.keys.length * this.dim;
+    if (offset + this.dim > this.vectors.length) {
+      const grown = new Float32Array(this.vectors.length * 2);
+      grown.set(this.vectors);
+      this.vectors = grown;
+    }
+    this.vectors.set(vector, offset);
+    this.keys.push(key);
+    this.scaled = null;
+  }
+
+  // Inverse standard deviation per dimension (floored relative to the typical
+  // one), applied once to the whole index.
+  standardize() {
+    const { dim, vectors } = this;
+    const n = this.size;
+    const mean = new Float64Array(dim);
+    const spread = new Float64Array(dim);
+
+    for (let i = 0; i < n; i++) {
+      for (let j = 0; j < dim; j++) mean[j] += vectors[i * dim + j];
+    }
+    for (let j = 0; j < dim; j++) mean[j] /= n || 1;
+    for (let i = 0; i < n; i++) {
+      for (let j = 0; j < dim; j++) {
+        const d = vectors[i * dim + j] - mean[j];
+        spread[j] += d * d;
+      }
+    }
+
+    const deviation = spread.map((sum) => Math.sqrt(sum / (n || 1)));
+    const varying = deviation.filter((value) => value > 0).sort();
+    const floor = varying.length ? MIN_RELATIVE_SPREAD * varying[varying.length >> 1] : 1;
+    this.weights = new Float32Array(dim);
+    for (let j = 0; j < dim; j++) {
+      this.weights[j] = 1 / Math.max(deviation[j], floor);
+    }
+    this.scaled = new Float32Array(n * dim);
+    for (let i = 0; i < n * dim; i++) {
+      this.scaled[i] = vectors[i] * this.weights[i % dim];
+    }
+  }
+
+  search(query, k = 3) {
+    if (!this.size || k < 1) return [];
+    if (!this.scaled) this.standardize();
+    const { dim, scaled, weights } = this;
+    const q = new Float32Array(dim);
+    for (let j = 0; j < dim; j++) q[j] = query[j] * weights[j];
+
+    const count = Math.min(k, this.size);
+    const bestIndex = new Int32Array(count).fill(-1);
+    const bestDistance = new Float64Array(count).fill(Infinity);
+
+    for (let i = 0, offset = 0; i < this.size; i++, offset += dim) {
+      let distance = 0;
+      for (let j = 0; j < dim; j++) {
+        const d = scaled[offset + j] - q[j];
+        distance += d * d;
+      }
+      if (distance >= bestDistance[count - 1]) continue;
+
+      let slot = count - 1;
+      while (slot > 0 && bestDistance[slot - 1] > distance) {
+        bestDistance[slot] = bestDistance[slot - 1];
+        bestIndex[slot] = bestIndex[slot - 1];
+        slot--;
+      }
+      bestDistance[slot] = distance;
+      bestIndex[slot] = i;
+    }
+
+    return Array.from(bestIndex, (i, rank) => ({ key: this.keys[i], distance: Math.sqrt(bestDistance[rank]) }));
+  }
+
+  toRecord() {
+    return {
+      version: SIGNATURE_VERSION,
+      dim: this.dim,
+      keys: [...this.keys],
+      vectors: this.vectors.slice(0, this.size * this.dim)
+    };
+  }
+
+  static fromRecord({ dim, keys, vectors }) {
+    const index = new SignatureIndex(dim);
+    keys.forEach((key, i) => index.add(key, vectors.subarray(i * dim, (i + 1) * dim)));
+    return index;
+  }
+}
+
+// `createContext(size)` must return a 2D context (DOM, OffscreenCanvas or a
+// headless stand-in) with getImageData.
+export const buildPresetIndex = (createContext) => {
+  const index = new SignatureIndex();
+  Object.keys(PRESET_SHAPES).forEach((key) => {
+    const ctx = createContext(SHAPE_SIZE);
+    drawPresetShape(ctx, key);
+    const { data } = ctx.getImageData(0, 0, SHAPE_SIZE, SHAPE_SIZE);
+    index.add(key, signatureFromFeatures(extractFeatures(buildForegroundMask(data, SHAPE_SIZE, SHAPE_SIZE))));
+  });
+  return index;
+};
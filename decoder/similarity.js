@@ -0,0 +1,212 @@
+// Cross-domain similarity (Pipeline.md stage 4, Cross-Domain Validation &
+// Projection): pairwise similarity between every preset and decoded upload.
+//
+// Weighted signature vectors live in one contiguous Float32Array and the
+// similarities in a packed lower triangle, where row i holds entries 0..i and
+// starts at i(i+1)/2. A new entry is therefore appended as one new row (O(n)
+// dot products) without moving anything already computed; only bulk loads run
+// the blocked all-pairs pass. Weights and bandwidth are fixed when the matrix
+// is created, so earlier rows never go stale as entries are added.
+
+const BLOCK_SIZE = 64;
+const INITIAL_CAPACITY = 64;
+const BANDWIDTH_SAMPLE = 256;
+
+// Median weighted squared distance between (up to BANDWIDTH_SAMPLE of) the
+// given vectors: a typical pair then scores e^-1.
+const medianSquaredDistance = (vectors, dim, weights) => {
+  const n = Math.min(vectors.length / dim, BANDWIDTH_SAMPLE);
+  const distances = [];
+  for (let i = 0; i < n; i++) {
+    for (let j = 0; j < i; j++) {
+      let d2 = 0;
+      for (let d = 0; d < dim; d++) {
+        const diff = (vectors[i * dim + d] - vectors[j * dim + d]) * weights[d];
+        d2 += diff * diff;
+      }
+      distances.push(d2);
+    }
+  }
+  distances.sort((a, b) => a - b);
+  return distances[distances.length >> 1] || dim;
+};
+
+export class SimilarityMatrix {
+  // Similarity is exp(-d² / bandwidth) for the weighted squared distance d².
+  constructor(weights, bandwidth = weights.length) {
+    this.dim = weights.length;
+    this.weights = Float32Array.from(weights);
+    this.bandwidth = bandwidth;
+    this.keys = [];
+    this.indexOf = new Map();
+    this.capacity = 0;
+    this.vectors = new Float32Array(0);
+    this.norms = new Float64Array(0);
+    this.packed = new Float32Array(0);
+    this.reserve(INITIAL_CAPACITY);
+  }
+
+  // Seeds a matrix with every entry of a SignatureIndex, weighted by the
+  // index's per-dimension standardization and calibrated on its spread.
+  static fromIndex(index) {
+    if (!index.weights) index.standardize();
+    const vectors = index.vectors.subarray(0, index.size * index.dim);
+    const matrix = new SimilarityMatrix(index.weights, medianSquaredDistance(vectors, index.dim, index.weights));
+    matrix.addAll(index.keys.map((key, i) => [key, index.vectors.subarray(i * index.dim, (i + 1) * index.dim)]));
+    return matrix;
+  }
+
+  get size() {
+    return this.keys.length;
+  }
+
+  // Grows by doubling; the packed triangle only ever gains rows at the end,
+  // so existing similarities are copied once and never recomputed.
+  reserve(count) {
+    if (count <= this.capacity) return;
+    let capacity = Math.max(this.capacity, INITIAL_CAPACITY);
+    while (capacity < count) capacity *= 2;
+
+    const vectors = new Float32Array(capacity * this.dim);
+    vectors.set(this.vectors);
+    const norms = new Float64Array(capacity);
+    norms.set(this.norms);
+    const packed = new Float32Array((capacity * (capacity + 1)) / 2);
+    packed.set(this.packed);
+
+    Object.assign(this, { capacity, vectors, norms, packed });
+  }
+
+  store(i, vector) {
+    const { dim, weights, vectors } = this;
+    let norm = 0;
+    for (let d = 0, offset = i * dim; d < dim; d++) {
+      const value = vector[d] * weights[d];
+      vectors[offset + d] = value;
+      norm += value * value;
+    }
+    this.norms[i] = norm;
+  }
+
+  append(key, vector) {
+    const i = this.keys.length;
+    this.reserve(i + 1);
+    this.store(i, vector);
+    this.keys.push(key);
+    this.indexOf.set(key, i);
+    return i;
+  }
+
+  // Fills packed[i][j] for i in [i0, i1), j in [j0, min(j1, i + 1)). Four
+  // independent accumulators keep the multiply-add chain short enough for the
+  // JIT to pipeline; this is the only place similarities are computed.
+  computeBlock(i0, i1, j0, j1) {
+    const { dim, vectors, norms, packed } = this;
+    const scale = -1 / this.bandwidth;
+    for (let i = i0; i < i1; i++) {
+      const a = i * dim;
+      const rowStart = (i * (i + 1)) / 2;
+      const jEnd = Math.min(j1, i + 1);
+      for (let j = j0; j < jEnd; j++) {
+        const b = j * dim;
+        let s0 = 0, s1 = 0, s2 = 0, s3 = 0;
+        let d = 0;
+        for (; d + 3 < dim; d += 4) {
+          s0 += vectors[a + d] * vectors[b + d];
+          s1 += vectors[a + d + 1] * vectors[b + d + 1];
+          s2 += vectors[a + d + 2] * vectors[b + d + 2];
+          s3 += vectors[a + d + 3] * vectors[b + d + 3];
+        }
+        for (; d < dim; d++) s0 += vectors[a + d] * vectors[b + d];
+        const d2 = norms[i] + norms[j] - 2 * (s0 + s1 + s2 + s3);
+        packed[rowStart + j] = i === j ? 1 : Math.exp(Math.max(0, d2) * scale);
+      }
+    }
+  }
+
+  // Adds one entry and computes only its row. Re-adding a known key returns
+  // its existing index.
+  add(key, vector) {
+    if (this.indexOf.has(key)) return this.indexOf.get(key);
+    const i = this.append(key, vector);
+    this.computeBlock(i, i + 1, 0, i + 1);
+    return i;
+  }
+
+  // Adds an entry, or overwrites a known key's vector and recomputes its row
+  // and column; no other similarity changes.
+  set(key, vector) {
+    if (!this.indexOf.has(key)) return this.add(key, vector);
+    const i = this.indexOf.get(key);
+    this.store(i, vector);
+    this.computeBlock(i, i + 1, 0, i + 1);
+    this.computeBlock(i + 1, this.size, i, i + 1);
+    return i;
+  }
+
+  // Bulk load: appends everything, then fills the new rows block by block so
+  // each pair of vector blocks stays in cache while it is used.
+  addAll(entries) {
+    const first = this.size;
+    entries.forEach(([key, vector]) => {
+      if (!this.indexOf.has(key)) this.append(key, vector);
+    });
+    const n = this.size;
+
+    for (let ib = first; ib < n; ib += BLOCK_SIZE) {
+      const iEnd = Math.min(ib + BLOCK_SIZE, n);
+      for (let jb = 0; jb < iEnd; jb += BLOCK_SIZE) {
+        this.computeBlock(ib, iEnd, jb, Math.min(jb + BLOCK_SIZE, iEnd));
+      }
+    }
+  }
+
+  similarity(i, j) {
+    return i >= j ? this.packed[(i * (i + 1)) / 2 + j] : this.packed[(j * (j + 1)) / 2 + i];
+  }
+
+  // Entry i's similarity to every entry, gathered from its row (j ≤ i) and
+  // column (j > i) of the triangle.
+  row(i) {
+    const n = this.size;
+    const row = new Float32Array(n);
+    row.set(this.packed.subarray((i * (i + 1)) / 2, (i * (i + 1)) / 2 + i + 1));
+    for (let j = i + 1; j < n; j++) row[j] = this.packed[(j * (j + 1)) / 2 + i];
+    return row;
+  }
+
+  // Top-k most similar other entries, optionally restricted by key.
+  nearest(i, k = 3, accept = () => true) {
+    const row = this.row(i);
+    const best = [];
+    for (let j = 0; j < row.length; j++) {
+      if (j === i || !accept(this.keys[j])) continue;
+      if (best.length === k && row[j] <= best[k - 1].similarity) continue;
+      let slot = Math.min(best.length, k - 1);
+      best[slot] = { key: this.keys[j], similarity: row[j] };
+      while (slot > 0 && best[slot - 1].similarity < best[slot].similarity) {
+        [best[slot - 1], best[slot]] = [best[slot], best[slot - 1]];
+        slot--;
+      }
+    }
+    return best;
+  }
+}
+
+// Uploads share the matrix with the presets under prefixed keys.
+const UPLOAD_PREFIX = 'upload:';
+const isUploadKey = (key) => key.startsWith(UPLOAD_PREFIX);
+
+// Adds an upload and returns its closest presets and closest other uploads,
+// by id. Ids are per file (its hash), so decoding the same file again, say
+// at another threshold, replaces its row instead of adding a second one.
+export const projectUpload = (matrix, id, signature, k = 3) => {
+  const i = matrix.set(`${UPLOAD_PREFIX}${id}`, signature);
+  return {
+    presets: matrix.nearest(i, k, (key) => !isUploadKey(key)),
+    uploads: matrix.nearest(i, k, isUploadKey).map(({ key, similarity }) => ({
+      id: key.slice(UPLOAD_PREFIX.length),
+      similarity
+    }))
+  };
+};
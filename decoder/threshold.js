@@ -0,0 +1,141 @@
+// Brightness histogram behind the interactive threshold. One pass over the
+// RGBA buffer bins every pixel by its brightness (r + g + b) / 3 and keeps,
+// per bin, the pixel count, the sums of x and y and the bounding box. The
+// foreground at threshold T is exactly the bins below T (the same test as
+// buildForegroundMask), so the threshold-dependent features (pixel count,
+// centroid, bounding box, aspect, fill, compactness) are a sweep over at most
+// 256 bins instead of a rescan of the pixels.
+//
+// Features that need the mask itself (radial profile, symmetry, primitives,
+// spiral fit) are carried over from the last full decode while previewing;
+// the front ends re-decode at the chosen threshold once the slider settles.
+
+import { BRIGHTNESS_THRESHOLD, OTSU } from './defaults.js';
+import { selectRule } from './classify.js';
+
+export { OTSU };
+
+export const HISTOGRAM_BINS = 256;
+
+const LITTLE_ENDIAN = new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+const R_SHIFT = LITTLE_ENDIAN ? 0 : 24;
+const G_SHIFT = LITTLE_ENDIAN ? 8 : 16;
+const B_SHIFT = LITTLE_ENDIAN ? 16 : 8;
+
+// floor(sum / 3) for every channel sum, so sum < 3T ⇔ bin < T.
+const BIN_OF_SUM = Uint8Array.from({ length: 766 }, (v, sum) => Math.floor(sum / 3));
+
+// With `bins` (a Uint8Array of width * height), each pixel's bin is written
+// there too, so foregroundMaskFromBins can build the mask at the threshold
+// picked from this histogram without a second pass over the RGBA buffer.
+export const buildBrightnessHistogram = (data, width, height, bins = null) => {
+  const total = width * height;
+  const pixels = data.byteOffset % 4 === 0
+    ? new Uint32Array(data.buffer, data.byteOffset, total)
+    : new Uint32Array(data.slice(0, total * 4).buffer);
+  const counts = new Uint32Array(HISTOGRAM_BINS);
+  const sumX = new Float64Array(HISTOGRAM_BINS);
+  const sumY = new Float64Array(HISTOGRAM_BINS);
+  const minX = new Int32Array(HISTOGRAM_BINS).fill(width);
+  const maxX = new Int32Array(HISTOGRAM_BINS).fill(-1);
+  const minY = new Int32Array(HISTOGRAM_BINS).fill(height);
+  const maxY = new Int32Array(HISTOGRAM_BINS).fill(-1);
+  let i = 0;
+
+  for (let y = 0; y < height; y++) {
+    for (let x = 0; x < width; x++, i++) {
+      const p = pixels[i];
+      const bin = BIN_OF_SUM[((p >>> R_SHIFT) & 0xff) + ((p >>> G_SHIFT) & 0xff) + ((p >>> B_SHIFT) & 0xff)];
+      if (bins) bins[i] = bin;
+      counts[bin]++;
+      sumX[bin] += x;
+      sumY[bin] += y;
+      if (x < minX[bin]) minX[bin] = x;
+      if (x > maxX[bin]) maxX[bin] = x;
+      // Rows arrive in order, so the first row seen is the minimum.
+      if (maxY[bin] < 0) minY[bin] = y;
+      maxY[bin] = y;
+    }
+  }
+
+  return { counts, sumX, sumY, minX, maxX, minY, maxY, width, height };
+};
+
+// Otsu's method: the threshold maximizing the between-class variance of the
+// bins below and at-or-above it. Empty bins between two modes give a plateau
+// of equal variance; its middle is returned rather than its dark edge, so
+// anti-aliased edge pixels split evenly.
+export const otsuThreshold = ({ counts }) => {
+  let total = 0;
+  let weighted = 0;
+  for (let b = 0; b < HISTOGRAM_BINS; b++) {
+    total += counts[b];
+    weighted += b * counts[b];
+  }
+
+  let below = 0;
+  let belowWeighted = 0;
+  let best = -1;
+  let first = BRIGHTNESS_THRESHOLD;
+  let last = BRIGHTNESS_THRESHOLD;
+  for (let t = 1; t < HISTOGRAM_BINS; t++) {
+    below += counts[t - 1];
+    belowWeighted += (t - 1) * counts[t - 1];
+    const above = total - below;
+    if (!below || !above) continue;
+    const gap = belowWeighted / below - (weighted - belowWeighted) / above;
+    const variance = below * above * gap * gap;
+    if (variance > best) {
+      best = variance;
+      first = t;
+      last = t;
+    } else if (variance === best && last === t - 1) {
+      last = t;
+    }
+  }
+  return Math.round((first + last) / 2);
+};
+
+export const resolveThreshold = (histogram, threshold) => (
+  threshold === OTSU ? otsuThreshold(histogram) : threshold
+);
+
+// The features extractFeatures derives from the row and column counts, for
+// the foreground at `threshold`, in O(256).
+export const thresholdFeatures = (histogram, threshold) => {
+  const { counts, sumX, sumY, width, height } = histogram;
+  let count = 0, totalX = 0, totalY = 0;
+  let minX = width, maxX = 0, minY = height, maxY = 0;
+
+  for (let b = 0; b < threshold; b++) {
+    if (!counts[b]) continue;
+    count += counts[b];
+    totalX += sumX[b];
+    totalY += sumY[b];
+    if (histogram.minX[b] < minX) minX = histogram.minX[b];
+    if (histogram.maxX[b] > maxX) maxX = histogram.maxX[b];
+    if (histogram.minY[b] < minY) minY = histogram.minY[b];
+    if (histogram.maxY[b] > maxY) maxY = histogram.maxY[b];
+  }
+
+  return {
+    pixelCount: count,
+    centerX: count > 0 ? totalX / count : width / 2,
+    centerY: count > 0 ? totalY / count : height / 2,
+    minX,
+    maxX,
+    minY,
+    maxY,
+    aspectRatio: (maxX - minX) / (maxY - minY + 0.0001),
+    fillRatio: count / (width * height),
+    compactness: count / ((maxX - minX + 1) * (maxY - minY + 1))
+  };
+};
+
+// Live preview of a decode at another threshold: the last decode's features
+// with the histogram-derived ones replaced, and the rule they now select.
+export const previewThreshold = (histogram, threshold, features) => {
+  const resolved = resolveThreshold(histogram, threshold);
+  const next = { ...features, ...thresholdFeatures(histogram, resolved) };
+  return { threshold: resolved, features: next, rule: selectRule(next) };
+};
@@ -0,0 +1,118 @@
+// Tiled decoding for images too large to read back in one piece. Browsers
+// have no region decode (createImageBitmap(blob, x, y, w, h) and ImageDecoder
+// both decode the whole file), so the file is decoded once to an ImageBitmap
+// of at most MAX_DECODED_PIXELS: larger images are downscaled by an integer
+// factor during the decode, which is reported as `tiles.scale`. Each tile is
+// then drawn from that bitmap, read back, masked, and folded into running
+// row/column sums (exact counts, centroid and bounding box at the decoded
+// resolution) plus a bounded overview mask for the polar profile.
+//
+// Peak memory is the decoded bitmap (at most 256 MiB of RGBA) plus one
+// tile's readback and mask. Images over MAX_IMAGE_PIXELS are refused before
+// anything is decoded.
+
+import { analyzeMask } from './analyze.js';
+import { buildForegroundMask } from './features.js';
+import { imageSize } from './image-size.js';
+import { bufferPool } from './memory.js';
+import { rasterizeRegion } from './bitmap.js';
+
+export const TILE_SIZE = 2048;
+export const OVERVIEW_MAX_SIZE = 1024;
+export const MAX_DECODED_PIXELS = 8192 * 8192;
+export const MAX_IMAGE_PIXELS = 32768 * 32768;
+
+export class TileAccumulator {
+  constructor(width, height, overviewMaxSize = OVERVIEW_MAX_SIZE) {
+    this.width = width;
+    this.height = height;
+    this.rowSums = new Uint32Array(height);
+    this.colSums = new Uint32Array(width);
+    this.count = 0;
+
+    const scale = Math.max(1, Math.ceil(Math.max(width, height) / overviewMaxSize));
+    this.overview = {
+      scale,
+      width: Math.ceil(width / scale),
+      height: Math.ceil(height / scale),
+      mask: new Uint8Array(Math.ceil(width / scale) * Math.ceil(height / scale))
+    };
+  }
+
+  // A block of the overview is foreground if any pixel in it is, so thin
+  // strokes survive the downsampling.
+  add({ mask, rowSums, colSums, count, width, height }, x0, y0) {
+    const { scale, width: overviewWidth, mask: overview } = this.overview;
+    this.count += count;
+    for (let y = 0; y < height; y++) this.rowSums[y0 + y] += rowSums[y];
+    for (let x = 0; x < width; x++) this.colSums[x0 + x] += colSums[x];
+
+    for (let y = 0, i = 0; y < height; y++) {
+      if (!rowSums[y]) {
+        i += width;
+        continue;
+      }
+      const row = Math.floor((y0 + y) / scale) * overviewWidth;
+      for (let x = 0; x < width; x++, i++) {
+        if (mask[i]) overview[row + Math.floor((x0 + x) / scale)] = 1;
+      }
+    }
+  }
+
+  toMaskInfo() {
+    const { rowSums, colSums, count, width, height, overview } = this;
+    return { mask: null, rowSums, colSums, count, width, height, overview };
+  }
+}
+
+export const tileGrid = (width, height, tileSize = TILE_SIZE) => {
+  const tiles = [];
+  for (let y = 0; y < height; y += tileSize) {
+    for (let x = 0; x < width; x += tileSize) {
+      tiles.push({ x, y, width: Math.min(tileSize, width - x), height: Math.min(tileSize, height - y) });
+    }
+  }
+  return tiles;
+};
+
+export const decodeTiled = async (blob, { tileSize = TILE_SIZE, onTile, onProgress } = {}) => {
+  const start = performance.now();
+  const size = await imageSize(blob);
+  if (!size) {
+    throw new Error('Unsupported image format for tiled decoding');
+  }
+
+  const pixels = size.width * size.height;
+  if (pixels > MAX_IMAGE_PIXELS) {
+    throw new Error(`Image too large for tiled decoding: ${size.width}×${size.height} is over ${MAX_IMAGE_PIXELS} pixels`);
+  }
+  // Oriented the way imageSize reports; the resize happens inside the decode,
+  // so the full-resolution image is never held.
+  const scale = Math.ceil(Math.sqrt(pixels / MAX_DECODED_PIXELS));
+  const width = Math.ceil(size.width / scale);
+  const height = Math.ceil(size.height / scale);
+  const source = await createImageBitmap(blob, {
+    imageOrientation: 'from-image',
+    ...(scale > 1 && { resizeWidth: width, resizeHeight: height, resizeQuality: 'medium' })
+  });
+  const tiles = tileGrid(width, height, tileSize);
+  const accumulator = new TileAccumulator(width, height);
+  try {
+    if (source.width !== width || source.height !== height) {
+      throw new Error('Image header and decoded size disagree');
+    }
+    for (let i = 0; i < tiles.length; i++) {
+      const tile = tiles[i];
+      const { data } = rasterizeRegion(source, tile.x, tile.y, tile.width, tile.height);
+      const mask = buildForegroundMask(data, tile.width, tile.height);
+      accumulator.add(mask, tile.x, tile.y);
+      bufferPool.release(mask.mask);
+      onTile?.(i + 1, tiles.length);
+    }
+  } finally {
+    source.close();
+  }
+
+  const result = analyzeMask(accumulator.toMaskInfo(), { onProgress, inputMs: performance.now() - start });
+  return { ...result, tiles: { count: tiles.length, tileSize, width: size.width, height: size.height, scale } };
+};
@@ -0,0 +1,41 @@
+// index.html's view of a decode. It is derived entirely from the shared
+// kernel's features and rule, so both front ends report the same geometry for
+// the same pixels and repeated decodes are identical.
+
+const PHI = (1 + Math.sqrt(5)) / 2;
+
+const clamp01 = (value) => (Number.isFinite(value) ? Math.min(1, Math.max(0, value)) : 0);
+
+// Continuous symmetry scores 1, a detected n-fold symmetry its harmonic
+// strength, and anything else falls back to radial consistency.
+export const symmetryScore = ({ symmetryOrder, symmetryStrength, radialSymmetry }) => {
+  if (symmetryOrder === 0) return 1;
+  if (symmetryOrder >= 2) return symmetryStrength;
+  return clamp01(radialSymmetry);
+};
+
+export const transcodeFeatures = (features, rule) => {
+  const score = symmetryScore(features);
+  return {
+    geometricPoints: Math.floor(features.pixelCount / 100),
+    centerCoords: [Math.round(features.centerX), Math.round(features.centerY)],
+    aspectRatio: features.aspectRatio,
+    phiDeviation: Math.abs(features.aspectRatio - PHI),
+    spiralGrowth: features.spiralGrowth,
+    spiralPhiDeviation: features.spiralPhiDeviation,
+    fillDensity: features.fillRatio,
+    patternType: rule.id,
+    circleCount: features.circleCount,
+    lineCount: features.lineCount,
+    componentCount: features.componentCount,
+    componentEdges: features.componentEdges,
+    degreeExponent: features.degreeExponent,
+    symmetryScore: score,
+    classification: score > 0.8 ? 'UNIVERSAL' : 'SPECIFIC',
+    equation: rule.equation,
+    physicsLaw: rule.physicsLaw,
+    // Fallback until the front end projects the upload onto the presets
+    // (similarity.js), which needs the preset index.
+    crossDomainFit: score * 100
+  };
+};
@@ -0,0 +1,141 @@
+// Live decoding of a <video> element (camera or file). Frames are taken with
+// requestVideoFrameCallback; a frame that arrives while the previous decode is
+// still running is dropped rather than queued, and the analysis resolution is
+// adjusted so decodes settle around the target frame time. Results are smoothed
+// across frames so the reported law only changes once a new one dominates.
+
+export const VIDEO_TARGET_MS = 80;
+export const VIDEO_MIN_SIZE = 96;
+export const VIDEO_MAX_SIZE = 400;
+export const SMOOTHING_WINDOW = 9;
+
+// Majority vote over the last `window` frames with hysteresis: the displayed
+// label only switches when another label is strictly more frequent.
+export class LabelSmoother {
+  constructor(window = SMOOTHING_WINDOW) {
+    this.window = window;
+    this.labels = [];
+    this.latest = new Map();
+    this.current = null;
+  }
+
+  push(label, value) {
+    this.labels.push(label);
+    if (this.labels.length > this.window) this.labels.shift();
+    if (label !== null) this.latest.set(label, value);
+
+    const counts = new Map();
+    this.labels.forEach((l) => counts.set(l, (counts.get(l) || 0) + 1));
+    let best = this.current;
+    counts.forEach((count, l) => {
+      if (count > (counts.get(best) || 0)) best = l;
+    });
+    this.current = best;
+    return this.value();
+  }
+
+  value() {
+    return this.current === null ? null : this.latest.get(this.current) ?? null;
+  }
+
+  reset() {
+    this.labels = [];
+    this.latest.clear();
+    this.current = null;
+  }
+}
+
+const scheduleFrame = (video, callback) => (
+  'requestVideoFrameCallback' in video
+    ? video.requestVideoFrameCallback(callback)
+    : requestAnimationFrame(callback)
+);
+
+const cancelFrame = (video, handle) => (
+  'cancelVideoFrameCallback' in video
+    ? video.cancelVideoFrameCallback(handle)
+    : cancelAnimationFrame(handle)
+);
+
+export class VideoFrameDecoder {
+  constructor(video, client, { targetMs = VIDEO_TARGET_MS, onUpdate } = {}) {
+    this.video = video;
+    this.client = client;
+    this.targetMs = targetMs;
+    this.onUpdate = onUpdate;
+    this.smoother = new LabelSmoother();
+    this.size = VIDEO_MAX_SIZE;
+    this.busy = false;
+    this.handle = null;
+    this.running = false;
+    this.stats = { decoded: 0, dropped: 0, failed: 0, frameMs: 0 };
+    this.onFrame = this.onFrame.bind(this);
+  }
+
+  start() {
+    if (this.running) return;
+    this.running = true;
+    this.handle = scheduleFrame(this.video, this.onFrame);
+  }
+
+  stop() {
+    this.running = false;
+    if (this.handle !== null) cancelFrame(this.video, this.handle);
+    this.handle = null;
+    this.client.cancel();
+    this.busy = false;
+  }
+
+  onFrame() {
+    if (!this.running) return;
+    this.handle = scheduleFrame(this.video, this.onFrame);
+
+    if (this.busy) {
+      this.stats.dropped++;
+      return;
+    }
+    if (!this.video.videoWidth || this.video.readyState < 2) return;
+    this.decodeFrame();
+  }
+
+  // Multiplicative steps toward the target, with a dead band so the size does
+  // not oscillate on every frame.
+  adapt(ms) {
+    if (ms > this.targetMs) {
+      this.size = Math.max(VIDEO_MIN_SIZE, Math.round(this.size * 0.8));
+    } else if (ms < this.targetMs * 0.6) {
+      this.size = Math.min(VIDEO_MAX_SIZE, Math.round(this.size * 1.1));
+    }
+  }
+
+  async decodeFrame() {
+    const { videoWidth, videoHeight } = this.video;
+    const scale = Math.min(1, this.size / Math.max(videoWidth, videoHeight));
+    const width = Math.max(1, Math.round(videoWidth * scale));
+    const height = Math.max(1, Math.round(videoHeight * scale));
+    const start = performance.now();
+    this.busy = true;
+
+    let label = null;
+    let value = null;
+    try {
+      const bitmap = await createImageBitmap(this.video, { resizeWidth: width, resizeHeight: height, resizeQuality: 'low' });
+      const result = await this.client.decodeBitmap(bitmap, { maxSize: this.size });
+      label = result.analysis.physicsLaw;
+      value = result;
+      this.stats.decoded++;
+    } catch (err) {
+      if (err.name === 'AbortError' || !this.running) return;
+      // Empty or blank frames vote for "nothing detected".
+      this.stats.failed++;
+    } finally {
+      this.busy = false;
+    }
+
+    const ms = performance.now() - start;
+    this.stats.frameMs = ms;
+    this.adapt(ms);
+    const smoothed = this.smoother.push(label, value);
+    this.onUpdate?.({ result: smoothed, stats: { ...this.stats, size: this.size } });
+  }
+}
@@ -0,0 +1,225 @@
+// Streaming readers for 3D input: PLY (ASCII and binary) and XYZ point
+// clouds, and headerless raw voxel volumes. Everything is read from a Blob (a
+// File in the browser, fs.openAsBlob in Node) in slices of about
+// VOLUME_CHUNK_BYTES, cut on record boundaries where records have a fixed
+// size (binary vertices, whole z-slices), so only one slice is ever held and
+// multi-GB scans decode in bounded memory. Raw volumes never materialize at
+// all; point clouds end up in a chunked PointStore.
+
+import { PointStore, VolumeAccumulator, analyzeVolumeFeatures, pointCloudFeatures, volumeFeatures } from './volume.js';
+
+export const VOLUME_CHUNK_BYTES = 16 * 1024 * 1024;
+export const VOLUME_FORMATS = ['ply', 'xyz', 'raw'];
+
+const HEADER_BYTES = 64 * 1024;
+
+const RAW_TYPES = { uint8: Uint8Array, uint16: Uint16Array, float32: Float32Array };
+
+// Occupied from the middle of the value range up.
+export const RAW_THRESHOLDS = { uint8: 128, uint16: 32768, float32: 0.5 };
+
+const PLY_TYPES = {
+  char: 'Int8', int8: 'Int8', uchar: 'Uint8', uint8: 'Uint8',
+  short: 'Int16', int16: 'Int16', ushort: 'Uint16', uint16: 'Uint16',
+  int: 'Int32', int32: 'Int32', uint: 'Uint32', uint32: 'Uint32',
+  float: 'Float32', float32: 'Float32', double: 'Float64', float64: 'Float64'
+};
+const PLY_SIZES = { Int8: 1, Uint8: 1, Int16: 2, Uint16: 2, Int32: 4, Uint32: 4, Float32: 4, Float64: 8 };
+
+export const volumeFormat = (name) => {
+  const match = /\.(\w+)$/.exec(name || '');
+  const format = match && match[1].toLowerCase();
+  return VOLUME_FORMATS.includes(format) ? format : null;
+};
+
+// Raw volumes carry no header; the usual convention puts the size and sample
+// type in the name, e.g. `bonsai_256x256x256_uint8.raw`.
+export const parseRawVolumeName = (name) => {
+  const match = /(\d+)x(\d+)x(\d+)(?:_(uint8|uint16|float32))?/i.exec(name || '');
+  if (!match) return null;
+  return {
+    width: Number(match[1]),
+    height: Number(match[2]),
+    depth: Number(match[3]),
+    type: match[4] ? match[4].toLowerCase() : 'uint8'
+  };
+};
+
+const readSlice = async (blob, start, end) => new Uint8Array(await blob.slice(start, end).arrayBuffer());
+
+// Calls onLine for every line from byte `start`; stops early when it returns
+// false.
+const readLines = async (blob, start, onLine, onChunk) => {
+  const decoder = new TextDecoder();
+  let carry = '';
+  for (let offset = start; offset < blob.size; offset += VOLUME_CHUNK_BYTES) {
+    const end = Math.min(blob.size, offset + VOLUME_CHUNK_BYTES);
+    const lines = (carry + decoder.decode(await readSlice(blob, offset, end), { stream: true })).split('\n');
+    carry = lines.pop();
+    for (let i = 0; i < lines.length; i++) {
+      if (onLine(lines[i]) === false) return;
+    }
+    onChunk?.(end, blob.size);
+  }
+  carry += decoder.decode();
+  if (carry) onLine(carry);
+};
+
+const splitFields = (line) => line.trim().split(/[\s,]+/);
+
+// One point per line, x y z first; anything after (colours, normals) and
+// lines that do not start with three numbers (headers, comments) are ignored.
+export const readXyz = async (blob, { onChunk } = {}) => {
+  const points = new PointStore();
+  await readLines(blob, 0, (line) => {
+    const fields = splitFields(line);
+    const x = Number(fields[0]);
+    const y = Number(fields[1]);
+    const z = Number(fields[2]);
+    if (fields.length >= 3 && Number.isFinite(x) && Number.isFinite(y) && Number.isFinite(z)) points.push(x, y, z);
+  }, onChunk);
+  return points;
+};
+
+export const readPlyHeader = async (blob) => {
+  // windows-1252 maps every byte to one character, so string offsets are
+  // byte offsets even with a binary body behind the header.
+  const text = new TextDecoder('windows-1252').decode(await readSlice(blob, 0, HEADER_BYTES));
+  const end = text.indexOf('end_header');
+  if (!text.startsWith('ply') || end < 0) {
+    throw new Error('Not a PLY file');
+  }
+
+  const header = { format: null, elements: [], bodyStart: text.indexOf('\n', end) + 1 };
+  text.slice(0, end).split(/\r?\n/).forEach((line) => {
+    const [keyword, ...rest] = line.trim().split(/\s+/);
+    if (keyword === 'format') {
+      header.format = rest[0];
+    } else if (keyword === 'element') {
+      header.elements.push({ name: rest[0], count: Number(rest[1]), properties: [] });
+    } else if (keyword === 'property' && header.elements.length) {
+      const list = rest[0] === 'list';
+      header.elements[header.elements.length - 1].properties.push({
+        name: rest[rest.length - 1],
+        type: PLY_TYPES[list ? rest[2] : rest[0]],
+        list
+      });
+    }
+  });
+  return header;
+};
+
+// Vertex positions only. Vertices must be the first element (as every
+// exporter writes them), so nothing before them needs parsing.
+export const readPly = async (blob, { onChunk } = {}) => {
+  const { format, elements, bodyStart } = await readPlyHeader(blob);
+  const [vertex] = elements;
+  if (!vertex || vertex.name !== 'vertex') {
+    throw new Error('PLY files must list vertices first');
+  }
+  const axes = ['x', 'y', 'z'].map((name) => vertex.properties.findIndex((p) => p.name === name));
+  if (axes.includes(-1)) {
+    throw new Error('PLY vertices have no x, y, z properties');
+  }
+
+  const points = new PointStore();
+  if (format === 'ascii') {
+    let remaining = vertex.count;
+    await readLines(blob, bodyStart, (line) => {
+      if (remaining <= 0) return false;
+      const fields = splitFields(line);
+      if (fields[0] === '') return true;
+      points.push(Number(fields[axes[0]]), Number(fields[axes[1]]), Number(fields[axes[2]]));
+      remaining--;
+      return true;
+    }, onChunk);
+    return points;
+  }
+
+  if (format !== 'binary_little_endian' && format !== 'binary_big_endian') {
+    throw new Error(`Unsupported PLY format: ${format}`);
+  }
+  if (vertex.properties.some((p) => p.list || !p.type)) {
+    throw new Error('PLY vertices with list or unknown properties are not supported');
+  }
+  const littleEndian = format === 'binary_little_endian';
+  const offsets = [];
+  let stride = 0;
+  vertex.properties.forEach(({ type }) => {
+    offsets.push(stride);
+    stride += PLY_SIZES[type];
+  });
+  const [readX, readY, readZ] = axes.map((a) => {
+    const getter = DataView.prototype[`get${vertex.properties[a].type}`];
+    const offset = offsets[a];
+    return (view, base) => getter.call(view, base + offset, littleEndian);
+  });
+
+  const perChunk = Math.max(1, Math.floor(VOLUME_CHUNK_BYTES / stride));
+  const bodyEnd = Math.min(blob.size, bodyStart + vertex.count * stride);
+  for (let v = 0; v < vertex.count; v += perChunk) {
+    const start = bodyStart + v * stride;
+    const end = Math.min(bodyEnd, start + perChunk * stride);
+    const bytes = await readSlice(blob, start, end);
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    for (let base = 0; base + stride <= bytes.byteLength; base += stride) {
+      points.push(readX(view, base), readY(view, base), readZ(view, base));
+    }
+    onChunk?.(end, blob.size);
+    if (end >= bodyEnd) break;
+  }
+  return points;
+};
+
+// Samples are in the platform's byte order (little-endian everywhere this
+// runs), x fastest, then y, then z.
+export const readRawVolume = async (blob, {
+  width,
+  height,
+  depth,
+  type = 'uint8',
+  threshold = RAW_THRESHOLDS[type],
+  onChunk
+}) => {
+  const Type = RAW_TYPES[type];
+  if (!Type) {
+    throw new Error(`Unsupported raw sample type: ${type}`);
+  }
+  const sliceBytes = width * height * Type.BYTES_PER_ELEMENT;
+  if (!sliceBytes || blob.size !== sliceBytes * depth) {
+    throw new Error(`Raw volume is ${blob.size} bytes, expected ${sliceBytes * depth} for ${width}x${height}x${depth} ${type}`);
+  }
+
+  const volume = new VolumeAccumulator(width, height, depth);
+  const slicesPerSlab = Math.max(1, Math.floor(VOLUME_CHUNK_BYTES / sliceBytes));
+  for (let z = 0; z < depth; z += slicesPerSlab) {
+    const end = Math.min(depth, z + slicesPerSlab) * sliceBytes;
+    const bytes = await readSlice(blob, z * sliceBytes, end);
+    volume.addSlab(new Type(bytes.buffer, bytes.byteOffset, bytes.byteLength / Type.BYTES_PER_ELEMENT), z, threshold);
+    onChunk?.(end, blob.size);
+  }
+  return volume;
+};
+
+// Reads and analyzes a 3D file. `format` defaults to the extension of
+// `name`; raw volumes take their size and sample type from the options or,
+// failing that, from the name.
+export const decodeVolume = async (blob, { name = blob.name, format = volumeFormat(name), onChunk, ...options } = {}) => {
+  const start = performance.now();
+  let features;
+  if (format === 'raw') {
+    const given = Object.entries(options).filter(([, value]) => value !== undefined);
+    const size = { ...parseRawVolumeName(name), ...Object.fromEntries(given) };
+    if (!size.width || !size.height || !size.depth) {
+      throw new Error('Raw volumes need a size, e.g. name_256x256x128_uint8.raw');
+    }
+    features = volumeFeatures(await readRawVolume(blob, { ...size, onChunk }));
+  } else if (format === 'ply' || format === 'xyz') {
+    const points = await (format === 'ply' ? readPly : readXyz)(blob, { onChunk });
+    features = pointCloudFeatures(points);
+  } else {
+    throw new Error('Unsupported 3D format; use PLY, XYZ or raw volumes');
+  }
+  const result = analyzeVolumeFeatures(features);
+  return { ...result, volume: { format, bytes: blob.size, ms: performance.now() - start } };
+};
@@ -0,0 +1,468 @@
+// 3D counterparts of the image features, for point clouds and voxel volumes.
+//
+// Points are kept in fixed-size Float32Array chunks, so a scan of any size is
+// many modest allocations rather than one huge one, and the store keeps exact
+// count, coordinate sums and bounds as points arrive. Voxel volumes are folded
+// in slab by slab (VolumeAccumulator, the 3D TileAccumulator): exact moments
+// and bounds at full resolution plus a bounded occupancy grid, so memory stays
+// at one slab however large the volume is.
+//
+// Fill comes from an OccupancyGrid (points per cell over at most
+// OCCUPANCY_RESOLUTION cells per axis). The spherical-shell profile bins the
+// points (or the grid's cells, for volumes) by distance from the centroid
+// into SHELL_COUNT shells and, within each shell, by direction into
+// equal-area sectors. A shell whose sectors hold the same amount is
+// spherically symmetric; the weighted mean over shells is the 3D
+// radialSymmetry. Point clouds also get the mean nearest-neighbour spacing
+// from a SpatialHash.
+
+import { ANALYSIS_VERSION } from './defaults.js';
+import { selectRule } from './classify.js';
+import { bufferPool } from './memory.js';
+import { transcodeFeatures } from './transcoder.js';
+
+export const POINT_CHUNK_SHIFT = 16;
+export const POINT_CHUNK = 1 << POINT_CHUNK_SHIFT;
+export const OCCUPANCY_RESOLUTION = 128;
+export const SHELL_COUNT = 16;
+export const NEIGHBOUR_SAMPLE = 4096;
+
+// Point-cloud fill is measured on a grid with about this many points per
+// cell, so it does not depend on how densely the cloud was sampled.
+const POINTS_PER_CELL = 8;
+
+// Equal-area sectors: azimuth in equal steps, polar angle in equal steps of
+// cos θ.
+const AZIMUTH_BINS = 8;
+const POLAR_BINS = 4;
+const SECTORS = AZIMUTH_BINS * POLAR_BINS;
+
+const MIN_POINTS = 100;
+
+export class PointStore {
+  constructor() {
+    this.chunks = [];
+    this.length = 0;
+    this.sumX = 0;
+    this.sumY = 0;
+    this.sumZ = 0;
+    this.minX = Infinity;
+    this.minY = Infinity;
+    this.minZ = Infinity;
+    this.maxX = -Infinity;
+    this.maxY = -Infinity;
+    this.maxZ = -Infinity;
+  }
+
+  push(x, y, z) {
+    const offset = this.length & (POINT_CHUNK - 1);
+    if (offset === 0) this.chunks.push(new Float32Array(POINT_CHUNK * 3));
+    const chunk = this.chunks[this.chunks.length - 1];
+    chunk[offset * 3] = x;
+    chunk[offset * 3 + 1] = y;
+    chunk[offset * 3 + 2] = z;
+    this.length++;
+    this.sumX += x;
+    this.sumY += y;
+    this.sumZ += z;
+    if (x < this.minX) this.minX = x;
+    if (x > this.maxX) this.maxX = x;
+    if (y < this.minY) this.minY = y;
+    if (y > this.maxY) this.maxY = y;
+    if (z < this.minZ) this.minZ = z;
+    if (z > this.maxZ) this.maxZ = z;
+  }
+
+  forEach(callback) {
+    for (let c = 0, i = 0; c < this.chunks.length; c++) {
+      const chunk = this.chunks[c];
+      const count = Math.min(POINT_CHUNK, this.length - i);
+      for (let o = 0; o < count * 3; o += 3, i++) callback(chunk[o], chunk[o + 1], chunk[o + 2], i);
+    }
+  }
+
+  get byteLength() {
+    return this.chunks.length * POINT_CHUNK * 3 * Float32Array.BYTES_PER_ELEMENT;
+  }
+}
+
+// Uniform hash grid over a PointStore: points are counting-sorted by the
+// hashed cell they fall in, so a neighbour query reads the 27 cells around a
+// position (more for radii above the cell size) as contiguous index runs.
+// Distinct cells may share a bucket; queries filter by distance anyway.
+export class SpatialHash {
+  constructor(points, cellSize) {
+    const n = points.length;
+    let size = 16;
+    while (size < n) size *= 2;
+    this.points = points;
+    this.cellSize = cellSize;
+    this.inverse = 1 / cellSize;
+    this.mask = size - 1;
+    this.starts = bufferPool.acquire(Uint32Array, size + 1);
+    this.order = bufferPool.acquire(Uint32Array, n);
+
+    const buckets = bufferPool.acquire(Uint32Array, n);
+    points.forEach((x, y, z, i) => {
+      const bucket = this.bucketAt(x, y, z);
+      buckets[i] = bucket;
+      this.starts[bucket + 1]++;
+    });
+    for (let b = 0; b < size; b++) this.starts[b + 1] += this.starts[b];
+    const cursor = bufferPool.acquire(Uint32Array, size);
+    cursor.set(this.starts.subarray(0, size));
+    for (let i = 0; i < n; i++) this.order[cursor[buckets[i]]++] = i;
+    bufferPool.release(cursor);
+    bufferPool.release(buckets);
+  }
+
+  bucket(cx, cy, cz) {
+    return (Math.imul(cx, 73856093) ^ Math.imul(cy, 19349663) ^ Math.imul(cz, 83492791)) & this.mask;
+  }
+
+  bucketAt(x, y, z) {
+    return this.bucket(Math.floor(x * this.inverse), Math.floor(y * this.inverse), Math.floor(z * this.inverse));
+  }
+
+  // callback(index, distanceSquared) for every point within `radius` of
+  // (x, y, z).
+  forEachNeighbour(x, y, z, radius, callback) {
+    const { chunks } = this.points;
+    const reach = Math.ceil(radius * this.inverse);
+    const cx = Math.floor(x * this.inverse);
+    const cy = Math.floor(y * this.inverse);
+    const cz = Math.floor(z * this.inverse);
+    const radiusSquared = radius * radius;
+    const seen = new Set();
+    for (let dz = -reach; dz <= reach; dz++) {
+      for (let dy = -reach; dy <= reach; dy++) {
+        for (let dx = -reach; dx <= reach; dx++) {
+          const bucket = this.bucket(cx + dx, cy + dy, cz + dz);
+          if (seen.has(bucket)) continue;
+          seen.add(bucket);
+          for (let s = this.starts[bucket]; s < this.starts[bucket + 1]; s++) {
+            const i = this.order[s];
+            const chunk = chunks[i >>> POINT_CHUNK_SHIFT];
+            const o = (i & (POINT_CHUNK - 1)) * 3;
+            const ex = chunk[o] - x;
+            const ey = chunk[o + 1] - y;
+            const ez = chunk[o + 2] - z;
+            const d = ex * ex + ey * ey + ez * ez;
+            if (d <= radiusSquared) callback(i, d);
+          }
+        }
+      }
+    }
+  }
+
+  // Distance to the closest other point within `radius`, or null.
+  nearest(i, radius = this.cellSize) {
+    const chunk = this.points.chunks[i >>> POINT_CHUNK_SHIFT];
+    const o = (i & (POINT_CHUNK - 1)) * 3;
+    let best = Infinity;
+    this.forEachNeighbour(chunk[o], chunk[o + 1], chunk[o + 2], radius, (j, d) => {
+      if (j !== i && d < best) best = d;
+    });
+    return best < Infinity ? Math.sqrt(best) : null;
+  }
+
+  dispose() {
+    bufferPool.release(this.starts);
+    bufferPool.release(this.order);
+  }
+}
+
+// Points (or voxels) per cubic cell of side `cellSize` from `origin`.
+export class OccupancyGrid {
+  constructor(origin, cellSize, nx, ny, nz) {
+    this.origin = origin;
+    this.cellSize = cellSize;
+    this.nx = nx;
+    this.ny = ny;
+    this.nz = nz;
+    this.counts = new Uint32Array(nx * ny * nz);
+  }
+
+  // A grid of at most `resolution` cells along the longest side of the box.
+  static fitting(minX, minY, minZ, maxX, maxY, maxZ, resolution = OCCUPANCY_RESOLUTION) {
+    const longest = Math.max(maxX - minX, maxY - minY, maxZ - minZ);
+    const cellSize = longest > 0 ? longest / resolution : 1;
+    const cells = (extent) => Math.min(resolution, Math.floor(extent / cellSize)) + 1;
+    return new OccupancyGrid(
+      [minX, minY, minZ],
+      cellSize,
+      cells(maxX - minX),
+      cells(maxY - minY),
+      cells(maxZ - minZ)
+    );
+  }
+
+  index(x, y, z) {
+    const clamp = (v, n) => Math.min(n - 1, Math.max(0, Math.floor(v)));
+    const { origin, cellSize } = this;
+    return clamp((x - origin[0]) / cellSize, this.nx)
+      + this.nx * (clamp((y - origin[1]) / cellSize, this.ny) + this.ny * clamp((z - origin[2]) / cellSize, this.nz));
+  }
+
+  add(x, y, z, count = 1) {
+    this.counts[this.index(x, y, z)] += count;
+  }
+
+  // callback(x, y, z, count) at the centre of every occupied cell.
+  forEachOccupied(callback) {
+    const { origin, cellSize, nx, ny, nz, counts } = this;
+    for (let k = 0, i = 0; k < nz; k++) {
+      for (let j = 0; j < ny; j++) {
+        for (let c = 0; c < nx; c++, i++) {
+          if (counts[i]) {
+            callback(
+              origin[0] + (c + 0.5) * cellSize,
+              origin[1] + (j + 0.5) * cellSize,
+              origin[2] + (k + 0.5) * cellSize,
+              counts[i]
+            );
+          }
+        }
+      }
+    }
+  }
+
+  occupiedCells() {
+    let occupied = 0;
+    for (let i = 0; i < this.counts.length; i++) if (this.counts[i]) occupied++;
+    return occupied;
+  }
+}
+
+// Occupied voxels of a width × height × depth volume, fed in slabs of whole
+// z-slices. Voxels at or above `threshold` are occupied (scans store density,
+// so the object is the bright part, unlike the dark-on-light images).
+export class VolumeAccumulator {
+  constructor(width, height, depth, resolution = OCCUPANCY_RESOLUTION) {
+    this.width = width;
+    this.height = height;
+    this.depth = depth;
+    this.count = 0;
+    this.sumX = 0;
+    this.sumY = 0;
+    this.sumZ = 0;
+    this.minX = width;
+    this.minY = height;
+    this.minZ = depth;
+    this.maxX = -1;
+    this.maxY = -1;
+    this.maxZ = -1;
+
+    const scale = Math.max(1, Math.ceil(Math.max(width, height, depth) / resolution));
+    this.scale = scale;
+    this.grid = new OccupancyGrid(
+      [0, 0, 0],
+      scale,
+      Math.ceil(width / scale),
+      Math.ceil(height / scale),
+      Math.ceil(depth / scale)
+    );
+  }
+
+  // `values` holds whole slices starting at slice z0, x fastest.
+  addSlab(values, z0, threshold) {
+    const { width, height, scale, grid } = this;
+    const slices = Math.floor(values.length / (width * height));
+    const { counts, nx, ny } = grid;
+    for (let z = z0, i = 0; z < z0 + slices; z++) {
+      let sliceCount = 0;
+      const cellZ = Math.floor(z / scale) * nx * ny;
+      for (let y = 0; y < height; y++) {
+        let rowCount = 0;
+        let rowSum = 0;
+        const cellY = cellZ + Math.floor(y / scale) * nx;
+        for (let x = 0; x < width; x++, i++) {
+          if (values[i] < threshold) continue;
+          rowCount++;
+          rowSum += x;
+          if (x < this.minX) this.minX = x;
+          if (x > this.maxX) this.maxX = x;
+          counts[cellY + Math.floor(x / scale)]++;
+        }
+        if (!rowCount) continue;
+        sliceCount += rowCount;
+        this.sumX += rowSum;
+        this.sumY += y * rowCount;
+        if (y < this.minY) this.minY = y;
+        if (y > this.maxY) this.maxY = y;
+      }
+      if (!sliceCount) continue;
+      this.count += sliceCount;
+      this.sumZ += z * sliceCount;
+      if (z < this.minZ) this.minZ = z;
+      if (z > this.maxZ) this.maxZ = z;
+    }
+  }
+}
+
+const clamp01 = (value) => Math.min(1, Math.max(0, value));
+
+// Occupancy per distance shell and direction sector around (cx, cy, cz):
+// the share of the total in each shell and how evenly each shell is spread
+// over the sectors (1 - mean absolute deviation / mean). `forEachSample`
+// calls back with (x, y, z, weight), like OccupancyGrid#forEachOccupied.
+export const shellProfile = (forEachSample, cx, cy, cz, shells = SHELL_COUNT) => {
+  let maxRadius = 0;
+  forEachSample((x, y, z) => {
+    const r = Math.hypot(x - cx, y - cy, z - cz);
+    if (r > maxRadius) maxRadius = r;
+  });
+
+  const sectors = new Float64Array(shells * SECTORS);
+  const totals = new Float64Array(shells);
+  forEachSample((x, y, z, count) => {
+    const dx = x - cx;
+    const dy = y - cy;
+    const dz = z - cz;
+    const r = Math.hypot(dx, dy, dz);
+    if (r === 0) return;
+    const shell = Math.min(shells - 1, Math.floor((r / maxRadius) * shells));
+    const azimuth = Math.min(AZIMUTH_BINS - 1, Math.floor(((Math.atan2(dy, dx) + Math.PI) / (2 * Math.PI)) * AZIMUTH_BINS));
+    const polar = Math.min(POLAR_BINS - 1, Math.floor(((dz / r + 1) / 2) * POLAR_BINS));
+    sectors[shell * SECTORS + polar * AZIMUTH_BINS + azimuth] += count;
+    totals[shell] += count;
+  });
+
+  let total = 0;
+  totals.forEach((t) => {
+    total += t;
+  });
+  const symmetry = new Array(shells).fill(0);
+  let weighted = 0;
+  for (let s = 0; s < shells; s++) {
+    if (!totals[s]) continue;
+    const mean = totals[s] / SECTORS;
+    let deviation = 0;
+    for (let a = 0; a < SECTORS; a++) deviation += Math.abs(sectors[s * SECTORS + a] - mean);
+    symmetry[s] = clamp01(1 - deviation / SECTORS / mean);
+    weighted += symmetry[s] * totals[s];
+  }
+
+  return {
+    shellRadius: maxRadius / shells,
+    shellProfile: Array.from(totals, (t) => (total ? t / total : 0)),
+    shellSymmetry: symmetry,
+    sphericalSymmetry: total ? weighted / total : 0
+  };
+};
+
+// Shared by both inputs. The 2D-named fields line up with the image features
+// so the classification rules and transcoder apply unchanged: aspectRatio is
+// the longest over the middle extent (1 for spheres and discs, large for
+// rods) and radialSymmetry is the spherical symmetry.
+const shapeFeatures = (bounds, forEachSample, fillRatio, compactness) => {
+  const { count, sumX, sumY, sumZ } = bounds;
+  const centerX = sumX / count;
+  const centerY = sumY / count;
+  const centerZ = sumZ / count;
+  const extents = [bounds.maxX - bounds.minX, bounds.maxY - bounds.minY, bounds.maxZ - bounds.minZ];
+  const [shortest, middle, longest] = [...extents].sort((a, b) => a - b);
+  const profile = shellProfile(forEachSample, centerX, centerY, centerZ);
+
+  return {
+    pointCount: count,
+    centerX,
+    centerY,
+    centerZ,
+    minX: bounds.minX,
+    maxX: bounds.maxX,
+    minY: bounds.minY,
+    maxY: bounds.maxY,
+    minZ: bounds.minZ,
+    maxZ: bounds.maxZ,
+    extentX: extents[0],
+    extentY: extents[1],
+    extentZ: extents[2],
+    aspectRatio: longest / (middle + 0.0001),
+    flatness: shortest / (middle + 0.0001),
+    fillRatio,
+    compactness,
+    ...profile,
+    radialSymmetry: profile.sphericalSymmetry
+  };
+};
+
+// Voxel features from a filled VolumeAccumulator; voxels count once each, so
+// fill and compactness are exact (occupied over all voxels, and over the
+// bounding box).
+export const volumeFeatures = (volume) => {
+  if (volume.count < MIN_POINTS) {
+    throw new Error('No significant geometric features detected in the volume');
+  }
+  const { width, height, depth, count } = volume;
+  const boxVolume = (volume.maxX - volume.minX + 1) * (volume.maxY - volume.minY + 1) * (volume.maxZ - volume.minZ + 1);
+  return {
+    ...shapeFeatures(volume, (callback) => volume.grid.forEachOccupied(callback), count / (width * height * depth), count / boxVolume),
+    volumeSize: [width, height, depth]
+  };
+};
+
+// Point-cloud features. Points have no volume, so fill is measured on an
+// occupancy grid sized to the point count (occupied cells over cells in the
+// bounding box) and serves as compactness too; the shell profile uses the
+// points themselves. Nearest-neighbour spacing is averaged over up to
+// NEIGHBOUR_SAMPLE points spread evenly through the store.
+export const pointCloudFeatures = (points) => {
+  if (points.length < MIN_POINTS) {
+    throw new Error('No significant geometric features detected in the point cloud');
+  }
+  const bounds = { ...points, count: points.length };
+  const resolution = Math.min(OCCUPANCY_RESOLUTION, Math.max(1, Math.round(Math.cbrt(points.length / POINTS_PER_CELL))));
+  const grid = OccupancyGrid.fitting(
+    points.minX, points.minY, points.minZ, points.maxX, points.maxY, points.maxZ, resolution
+  );
+  points.forEach((x, y, z) => grid.add(x, y, z));
+  const fill = grid.occupiedCells() / grid.counts.length;
+
+  // Cells about one expected spacing across, taking the points to lie on a
+  // surface (scans) rather than fill the box.
+  const longest = Math.max(points.maxX - points.minX, points.maxY - points.minY, points.maxZ - points.minZ);
+  const cellSize = Math.max(longest / Math.sqrt(points.length), Number.EPSILON);
+  const hash = new SpatialHash(points, cellSize);
+  const stride = Math.max(1, Math.floor(points.length / NEIGHBOUR_SAMPLE));
+  let spacing = 0;
+  let found = 0;
+  for (let i = 0; i < points.length; i += stride) {
+    const d = hash.nearest(i, cellSize * 2);
+    if (d !== null) {
+      spacing += d;
+      found++;
+    }
+  }
+  hash.dispose();
+
+  return {
+    ...shapeFeatures(bounds, (callback) => points.forEach((x, y, z) => callback(x, y, z, 1)), fill, fill),
+    neighbourSpacing: found ? spacing / found : null
+  };
+};
+
+// The decode result for 3D input, shaped like analyzeGeometry's so the front
+// ends and tools can treat it the same way.
+export const analyzeVolumeFeatures = (features) => {
+  const rule = selectRule(features);
+  const transcoder = transcodeFeatures({ ...features, pixelCount: features.pointCount }, rule);
+  transcoder.centerCoords = [features.centerX, features.centerY, features.centerZ].map(Math.round);
+  transcoder.sphericalSymmetry = features.sphericalSymmetry;
+  return {
+    version: ANALYSIS_VERSION,
+    features,
+    analysis: {
+      name: 'Custom Geometry',
+      description: `3D ${rule.id} form: ${features.pointCount} points, spherical symmetry ${(features.sphericalSymmetry * 100).toFixed(0)}%`,
+      geometry: rule.geometry,
+      constraint: rule.constraint,
+      operator: rule.operator,
+      physicsLaw: rule.physicsLaw,
+      application: rule.application,
+      equation: rule.equation,
+      verification: rule.verification
+    },
+    transcoder
+  };
+};
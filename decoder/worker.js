@@ -0,0 +1,86 @@
+// Dedicated decode worker. Receives an RGBA buffer (or an ImageBitmap to
+// rasterize or decode coarse-to-fine itself) as a transferable, a File to
+// decode tile by tile (or, for PLY/XYZ/raw files, as a 3D volume), or
+// encode-mode parameters to render and decode, runs the shared kernel and
+// posts progress events followed by a single result.
+
+import { analyzeGeometry } from './analyze.js';
+import { rasterizeToFit } from './bitmap.js';
+import { decodePyramid } from './pyramid.js';
+import { decodeTiled } from './tiled.js';
+import { decodeVolume } from './volume-io.js';
+import { buildPresetIndex } from './signatures.js';
+import { memory, scratchCanvas } from './memory.js';
+import { GENERATOR_SIZE, drawGeometry } from './generate.js';
+
+// `at` is the absolute end time, so the main thread can place the stage on
+// its own clock for traces.
+const progressReporter = (id) => (stage, index, total, ms, level) => {
+  const at = performance.timeOrigin + performance.now();
+  self.postMessage({ type: 'progress', id, stage, index, total, ms, level, at });
+};
+
+const runKernel = (id, data, width, height, { threshold, histogram } = {}) => (
+  analyzeGeometry(data, width, height, { onProgress: progressReporter(id), threshold, histogram })
+);
+
+self.onmessage = async ({ data: message }) => {
+  const { id } = message;
+
+  try {
+    let result;
+    if (message.type === 'decode') {
+      const { width, height, buffer } = message;
+      result = runKernel(id, new Uint8ClampedArray(buffer), width, height, message);
+    } else if (message.type === 'decodeBitmap') {
+      const { data, width, height } = rasterizeToFit(message.bitmap, message.maxSize);
+      result = runKernel(id, data, width, height);
+    } else if (message.type === 'decodePyramid') {
+      const { bitmap, maxSize, tolerance } = message;
+      result = await decodePyramid(bitmap, { maxSize, tolerance, onProgress: progressReporter(id) });
+    } else if (message.type === 'decodeTiled') {
+      result = await decodeTiled(message.file, {
+        tileSize: message.tileSize,
+        onTile: (index, total) => self.postMessage({ type: 'progress', id, stage: 'tile', index, total }),
+        onProgress: progressReporter(id)
+      });
+    } else if (message.type === 'decodeVolume') {
+      const { file, name, width, height, depth, type, threshold } = message;
+      result = await decodeVolume(file, {
+        name,
+        width,
+        height,
+        depth,
+        type,
+        threshold,
+        onChunk: (index, total) => self.postMessage({ type: 'progress', id, stage: 'chunk', index, total })
+      });
+    } else if (message.type === 'buildPresetIndex') {
+      const index = buildPresetIndex((size) => new OffscreenCanvas(size, size).getContext('2d'));
+      result = { record: index.toRecord() };
+    } else if (message.type === 'generate') {
+      // transferToImageBitmap hands over the backing store and leaves the
+      // canvas reusable, so every render draws on the same one.
+      const canvas = scratchCanvas('generate', GENERATOR_SIZE, GENERATOR_SIZE);
+      drawGeometry(canvas.getContext('2d'), message.params);
+      const bitmap = canvas.transferToImageBitmap();
+      self.postMessage({ type: 'result', id, bitmap }, [bitmap]);
+      return;
+    } else if (message.type === 'evaluate') {
+      // Inverse design (inverse.js): decode the generated geometry as if it
+      // had been uploaded. Only the transcoder view goes back.
+      const canvas = scratchCanvas('generate', GENERATOR_SIZE, GENERATOR_SIZE);
+      const ctx = canvas.getContext('2d', { willReadFrequently: true });
+      drawGeometry(ctx, message.params);
+      const { data } = ctx.getImageData(0, 0, GENERATOR_SIZE, GENERATOR_SIZE);
+      const { transcoder } = analyzeGeometry(data, GENERATOR_SIZE, GENERATOR_SIZE);
+      result = { transcoder };
+    } else {
+      return;
+    }
+    self.postMessage({ type: 'memory', id, stats: memory.stats() });
+    self.postMessage({ type: 'result', id, ...result });
+  } catch (err) {
+    self.postMessage({ type: 'error', id, message: err.message });
+  }
+};
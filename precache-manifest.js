@@ -0,0 +1,191 @@
+// Generated by tools/build-precache.mjs; do not edit.
+self.PRECACHE_MANIFEST = {
+  "version": "72b9dd25e1a7880f",
+  "files": [
+    {
+      "url": "index.html",
+      "bytes": 47878,
+      "integrity": "sha256-ypSSBf5T7GMVNZAZcY5gEmT1LH0X03zBZmFLjAw+KkQ="
+    },
+    {
+      "url": "decoder/analyze.js",
+      "bytes": 6062,
+      "integrity": "sha256-mqk4M4Dx2st+0GDwIVnPHcE1tLJBj66Z7dF+d9eZHQ8="
+    },
+    {
+      "url": "decoder/bitmap.js",
+      "bytes": 1417,
+      "integrity": "sha256-4xqOlle0HoGpsRflktnX3voDXrQ4WZqMp1fUhyIKzg4="
+    },
+    {
+      "url": "decoder/catalog.js",
+      "bytes": 5927,
+      "integrity": "sha256-RthcZq0AuJWQiXHUmu0PtfJDw5r/6873ymT3okh7tGI="
+    },
+    {
+      "url": "decoder/classify.js",
+      "bytes": 7110,
+      "integrity": "sha256-e2pCRuSoipJ67fQrjnDCrvf1tElzhYz4xIjYr/APs58="
+    },
+    {
+      "url": "decoder/client.js",
+      "bytes": 4181,
+      "integrity": "sha256-geEjIuBZR9mr9Kow2VmAVZ4/tchZ5U7MzKQpxRPDFO4="
+    },
+    {
+      "url": "decoder/components.js",
+      "bytes": 10577,
+      "integrity": "sha256-/V8PWEJZR9FDUn6koSkGfnzbcR7nLPBIGrK3dEf5hqU="
+    },
+    {
+      "url": "decoder/defaults.js",
+      "bytes": 1064,
+      "integrity": "sha256-pxhcs/ekTO8iSzp/z+9Hv6k1zEv/9tMiHEUKg3RC3PY="
+    },
+    {
+      "url": "decoder/features.js",
+      "bytes": 5291,
+      "integrity": "sha256-jlUwjykAXDOvS3pbSsxdtiJZQvBvG7xRQJUlJAM6gmE="
+    },
+    {
+      "url": "decoder/fft.js",
+      "bytes": 1741,
+      "integrity": "sha256-p/36+1qZQ8mZAp/p16eGEjAMbfO7DNEbrSWpt36ddXU="
+    },
+    {
+      "url": "decoder/generate.js",
+      "bytes": 3040,
+      "integrity": "sha256-nwrd7TnbAst/wUKdH+9txCH9HwNLImEBOTZneNfz7FA="
+    },
+    {
+      "url": "decoder/geometry-renderer.js",
+      "bytes": 2188,
+      "integrity": "sha256-fiwsiXDw0CgxFbl430Op6R7gzS3ViS45wJNrmYrP0pw="
+    },
+    {
+      "url": "decoder/hough.js",
+      "bytes": 20343,
+      "integrity": "sha256-44+uP3L1saXLi+quX33CGSajyQKYEgcpQ85C5r1Nre4="
+    },
+    {
+      "url": "decoder/idb.js",
+      "bytes": 1690,
+      "integrity": "sha256-c6d0xTj7ZRJB/pPKmNOgnYlAtx6VZXz/4PmA2EQuMdE="
+    },
+    {
+      "url": "decoder/image-size.js",
+      "bytes": 3861,
+      "integrity": "sha256-kOFEtJ2F/d5IvbUqEdb+trWvPL32q5UVkk2uX6Q5VN8="
+    },
+    {
+      "url": "decoder/inverse.js",
+      "bytes": 8285,
+      "integrity": "sha256-1P5tlgdiJoNXmKClMs3VZZgfU0FUOWAaYx0hffazMZI="
+    },
+    {
+      "url": "decoder/logpolar.js",
+      "bytes": 13375,
+      "integrity": "sha256-iJ+ZZo2V1sSJU9NIXJWUgUr5PLbd2jkcVJwudq67i80="
+    },
+    {
+      "url": "decoder/memory.js",
+      "bytes": 6003,
+      "integrity": "sha256-JetP7D7LTwn5VnQKzJV1CxJ+GivowZ9pTMSgrIvk0FM="
+    },
+    {
+      "url": "decoder/perf.js",
+      "bytes": 8074,
+      "integrity": "sha256-boRagJYGP+bRiShJXHjDIN8U88wzHgbTefBGIyZwgMs="
+    },
+    {
+      "url": "decoder/pipeline.js",
+      "bytes": 817,
+      "integrity": "sha256-GI4piaZZh/E8WyDWf3o6wZVRTJye2EzjmvWVm8RpPPI="
+    },
+    {
+      "url": "decoder/polar.js",
+      "bytes": 3989,
+      "integrity": "sha256-aS6GnvpkQf6/rL1idOcL3QfJIFwUptEiZgroAZ800zw="
+    },
+    {
+      "url": "decoder/pool.js",
+      "bytes": 3556,
+      "integrity": "sha256-YjfRmRllYJNh9gzlG+LOKXTU1XAVwW5KqjgHRbkvhaE="
+    },
+    {
+      "url": "decoder/preset-index.js",
+      "bytes": 1018,
+      "integrity": "sha256-K2ghqmlm6dyLB4Xa1IXC2v0kU5M9K7PXSstnbvFZnZA="
+    },
+    {
+      "url": "decoder/preset-shapes.js",
+      "bytes": 5602,
+      "integrity": "sha256-cAQk4/0G31udl4cGzCq7Rj+OrDT/Z25+9teZ57SfB3s="
+    },
+    {
+      "url": "decoder/pyramid.js",
+      "bytes": 2074,
+      "integrity": "sha256-uRENgpy8CRVc1xjdnpW7QKEnJbpxvi941HjLxlpRNgg="
+    },
+    {
+      "url": "decoder/result-cache.js",
+      "bytes": 3478,
+      "integrity": "sha256-QNjCtWfD7BSXhnmfcqm7hcYD/Q1x8uPtsXJiyjZU/PA="
+    },
+    {
+      "url": "decoder/signatures.js",
+      "bytes": 5413,
+      "integrity": "sha256-MAo+DU6fgdXOvvmic2sB94s/cLwiSzPhWRF5y37/g2Q="
+    },
+    {
+      "url": "decoder/similarity.js",
+      "bytes": 7778,
+      "integrity": "sha256-JIRxb4rRE8Pj0zudC+PH9x7TMcwM/2rimto6AVrrD3U="
+    },
+    {
+      "url": "decoder/threshold.js",
+      "bytes": 5491,
+      "integrity": "sha256-RY1hAkYOz0M4XYQsXKXx+Ys3JLq/++an4bhfjMxDnlA="
+    },
+    {
+      "url": "decoder/tiled.js",
+      "bytes": 4769,
+      "integrity": "sha256-bge764/NRxtdIp5UonaVedtP01W9qtpWJUXXNMMKyJo="
+    },
+    {
+      "url": "decoder/transcoder.js",
+      "bytes": 1712,
+      "integrity": "sha256-/SuMJS0nvx8NoJnzN+CqoTgVU5ct8v7GTtMyue8/obM="
+    },
+    {
+      "url": "decoder/video.js",
+      "bytes": 4423,
+      "integrity": "sha256-ckB19WJryCwiWA2O5tlZ/ycb3YGkJUaU021g49A6ar4="
+    },
+    {
+      "url": "decoder/volume-io.js",
+      "bytes": 9317,
+      "integrity": "sha256-PKxEOJtCKnYpAgne6V794n6vxwZOO1ok7WE1pCu1jxs="
+    },
+    {
+      "url": "decoder/volume.js",
+      "bytes": 17016,
+      "integrity": "sha256-Gr0xqn9e3Qv1QKajGmAhucno2xSweP5sd8XC2GPnmnA="
+    },
+    {
+      "url": "decoder/worker.js",
+      "bytes": 4069,
+      "integrity": "sha256-J+/nPpRkm5TFCW+Aw97FZAi+9whrW+DYoQTJ8dB6Xi8="
+    },
+    {
+      "url": "catalog/index.json",
+      "bytes": 5469,
+      "integrity": "sha256-aqwb6bb+ZhDhonrLJHLmuRLqjtJch5ASa3LwMt1Tnl4="
+    },
+    {
+      "url": "catalog/chunks/000.json",
+      "bytes": 9962,
+      "integrity": "sha256-+CyWftnTY0MQd51LWtyph9ZoVyBFIb6rmQRoDU6OFCU="
+    }
+  ]
+};
@@ -0,0 +1,58 @@
+// Service worker for index.html. Precaches the page, the decoder modules and
+// the symbol catalog from the versioned manifest that
+// tools/build-precache.mjs writes to precache-manifest.js, and serves those
+// files cache-first, so repeat loads need no network and work offline.
+//
+// The manifest is pulled in with importScripts, and browsers compare imported
+// scripts byte for byte on every update check, so any rebuilt file changes the
+// version, installs a fresh cache and the old one is dropped on activation.
+// Each file is fetched with its SHA-256 as subresource integrity: a file that
+// changed on the server without a rebuilt manifest fails the install instead
+// of being cached under the wrong version.
+
+importScripts('./precache-manifest.js');
+
+const { version, files } = self.PRECACHE_MANIFEST;
+const CACHE_PREFIX = 'ugd-precache-';
+const CACHE = `${CACHE_PREFIX}${version}`;
+
+const urlOf = (path) => new URL(path, self.registration.scope).href;
+const PRECACHED = new Set(files.map(({ url }) => urlOf(url)));
+const INDEX = urlOf('index.html');
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(
+    caches.open(CACHE)
+      .then((cache) => cache.addAll(files.map(({ url, integrity }) => (
+        new Request(urlOf(url), { cache: 'reload', integrity })
+      ))))
+      .then(() => self.skipWaiting())
+  );
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches.keys()
+      .then((keys) => Promise.all(keys
+        .filter((key) => key.startsWith(CACHE_PREFIX) && key !== CACHE)
+        .map((key) => caches.delete(key))))
+      .then(() => self.clients.claim())
+  );
+});
+
+// Query strings (?perf) and the bare directory URL resolve to the
+// precached file; anything else goes to the network untouched.
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET') return;
+  const url = new URL(request.url);
+  url.search = '';
+  url.hash = '';
+  const key = request.mode === 'navigate' && url.href === urlOf('./') ? INDEX : url.href;
+  if (!PRECACHED.has(key)) return;
+  event.respondWith(
+    caches.open(CACHE)
+      .then((cache) => cache.match(key))
+      .then((cached) => cached || fetch(request))
+  );
+});
@@ -0,0 +1,221 @@
+// Headless benchmark for the shared decode kernel. Builds a synthetic corpus
+// from the encode-mode generators and the preset shapes at several sizes,
+// decodes each image repeatedly on plain RGBA arrays and prints JSON with
+// per-stage throughput, p50/p95 latency and peak memory.
+//
+//   node tools/bench.mjs [--sizes 256,1024,4096,8192] [--iterations 5]
+//                        [--shapes radial,seedOfLife] [--out bench.json]
+//                        [--baseline bench.json] [--threshold 0.15]
+//                        [--startup-runs 5]
+//
+// "startup" reports cold and warm start: each run spawns a fresh worker
+// thread that imports the kernel and decodes a STARTUP_SIZE image twice, so
+// cold is spawn to first result (import and first decode, nothing compiled
+// yet) and warm is the second decode. It also lists what each front end loads
+// before its first paint: index.html's bytes plus the decoder modules its
+// static imports pull in, and the same for the React app.
+//
+// With --baseline, any case whose p50 latency grew by more than the threshold
+// (relative) is listed under "regressions" and the process exits with code 1.
+
+import { readFileSync, statSync, writeFileSync } from 'node:fs';
+import { Worker } from 'node:worker_threads';
+import { RasterContext, RasterPath } from './raster.js';
+import { ANALYSIS_VERSION, PIPELINE_STAGES, analyzeGeometry } from '../decoder/analyze.js';
+import { GENERATOR_PATTERNS, GENERATOR_SIZE, drawGeometry } from '../decoder/generate.js';
+import { PRESET_SHAPES, SHAPE_SIZE, drawPresetShape } from '../decoder/preset-shapes.js';
+
+const DEFAULT_SIZES = [256, 1024, 4096, 8192];
+const STARTUP_SIZE = 400;
+const ROOT = new URL('../', import.meta.url);
+const SHELLS = { indexHtml: 'index.html', reactApp: 'Universal geometric decoder.py' };
+const GENERATOR_PARAMS = { symmetryScore: 0.85, aspectRatio: 1, phiDeviation: 0.618, fillDensity: 0.5, scaleFactor: 100 };
+
+const parseArgs = (argv) => {
+  const args = {};
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i].startsWith('--')) args[argv[i].slice(2)] = argv[i + 1];
+  }
+  return {
+    sizes: args.sizes ? args.sizes.split(',').map(Number) : DEFAULT_SIZES,
+    iterations: Number(args.iterations || 5),
+    shapes: args.shapes ? args.shapes.split(',') : null,
+    out: args.out,
+    baseline: args.baseline,
+    threshold: Number(args.threshold || 0.15),
+    startupRuns: Number(args['startup-runs'] ?? 5)
+  };
+};
+
+const corpusShapes = () => [
+  ...GENERATOR_PATTERNS.map((patternType) => ({
+    name: patternType,
+    base: GENERATOR_SIZE,
+    draw: (ctx) => drawGeometry(ctx, { ...GENERATOR_PARAMS, patternType }, () => new RasterPath())
+  })),
+  ...Object.keys(PRESET_SHAPES).map((key) => ({
+    name: key,
+    base: SHAPE_SIZE,
+    draw: (ctx) => drawPresetShape(ctx, key)
+  }))
+];
+
+const render = ({ base, draw }, size) => {
+  const ctx = new RasterContext(size, size);
+  ctx.scale(size / base);
+  draw(ctx);
+  return ctx.data;
+};
+
+const percentile = (values, p) => {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.min(sorted.length - 1, Math.floor(p * sorted.length))];
+};
+
+const round = (value, digits = 3) => Number(value.toFixed(digits));
+
+const liveBytes = () => {
+  const { heapUsed, arrayBuffers } = process.memoryUsage();
+  return heapUsed + arrayBuffers;
+};
+
+const benchCase = (shape, size, iterations) => {
+  const data = render(shape, size);
+  const megapixels = (size * size) / 1e6;
+  const latencies = [];
+  const stageMs = Object.fromEntries(PIPELINE_STAGES.map(({ id }) => [id, []]));
+  let peakBytes = 0;
+
+  // One warm-up pass so cached polar tables and JIT state match steady state.
+  for (let run = -1; run < iterations; run++) {
+    const baseline = liveBytes();
+    const start = performance.now();
+    const { analysis } = analyzeGeometry(data, size, size, {
+      onProgress: () => {
+        peakBytes = Math.max(peakBytes, liveBytes() - baseline);
+      }
+    });
+    const elapsed = performance.now() - start;
+    if (run < 0) continue;
+    latencies.push(elapsed);
+    analysis.timings.forEach(({ id, ms }) => stageMs[id].push(ms));
+  }
+
+  const stages = Object.fromEntries(Object.entries(stageMs).map(([id, samples]) => {
+    const p50 = percentile(samples, 0.5);
+    return [id, { p50Ms: round(p50), megapixelsPerSecond: p50 > 0 ? round(megapixels / (p50 / 1000), 1) : null }];
+  }));
+
+  return {
+    shape: shape.name,
+    size,
+    megapixels: round(megapixels),
+    latency: { p50Ms: round(percentile(latencies, 0.5)), p95Ms: round(percentile(latencies, 0.95)) },
+    megapixelsPerSecond: round(megapixels / (percentile(latencies, 0.5) / 1000), 1),
+    stages,
+    peakBytes: Math.max(0, peakBytes)
+  };
+};
+
+const median = (values) => round(percentile(values, 0.5));
+
+const startupRun = (data) => new Promise((resolveRun, rejectRun) => {
+  const spawned = performance.now();
+  const worker = new Worker(new URL('./startup-worker.mjs', import.meta.url), {
+    workerData: { data, size: STARTUP_SIZE }
+  });
+  worker.once('message', (timings) => {
+    resolveRun({ totalMs: performance.now() - spawned, ...timings });
+    worker.terminate();
+  });
+  worker.once('error', rejectRun);
+});
+
+// Relative imports reachable through static import/export-from statements;
+// dynamic import() is what defers a module, so it is not followed. Classic
+// inline scripts (index.html) have none.
+const staticImports = (url, seen = new Map()) => {
+  const source = readFileSync(url, 'utf8');
+  const specifiers = /^\s*(?:import\s*|(?:import|export)\s[^'"]*?\sfrom\s*)['"](\.{1,2}\/[^'"]+)['"]/gm;
+  for (const [, specifier] of source.matchAll(specifiers)) {
+    const target = new URL(specifier, url);
+    if (seen.has(target.href)) continue;
+    seen.set(target.href, statSync(target).size);
+    staticImports(target, seen);
+  }
+  return seen;
+};
+
+const shellPayload = () => Object.fromEntries(Object.entries(SHELLS).map(([name, file]) => {
+  const url = new URL(file, ROOT);
+  const modules = staticImports(url);
+  const moduleBytes = [...modules.values()].reduce((sum, bytes) => sum + bytes, 0);
+  return [name, {
+    bytes: statSync(url).size,
+    eagerModules: [...modules.keys()].map((href) => href.slice(ROOT.href.length)),
+    eagerBytes: statSync(url).size + moduleBytes
+  }];
+}));
+
+const benchStartup = async (runs) => {
+  const data = render(corpusShapes()[0], STARTUP_SIZE);
+  const samples = [];
+  for (let i = 0; i < runs; i++) samples.push(await startupRun(data));
+  const pick = (key) => median(samples.map((sample) => sample[key]));
+  return {
+    runs,
+    size: STARTUP_SIZE,
+    cold: { totalMs: pick('totalMs'), importMs: pick('importMs'), firstDecodeMs: pick('firstDecodeMs') },
+    warm: { decodeMs: pick('warmDecodeMs') },
+    shell: shellPayload()
+  };
+};
+
+const findRegressions = (cases, baseline, threshold) => {
+  const previous = new Map(baseline.cases.map((c) => [`${c.shape}@${c.size}`, c]));
+  return cases.flatMap((c) => {
+    const before = previous.get(`${c.shape}@${c.size}`);
+    if (!before) return [];
+    const change = c.latency.p50Ms / before.latency.p50Ms - 1;
+    return change > threshold
+      ? [{ shape: c.shape, size: c.size, baselineP50Ms: before.latency.p50Ms, p50Ms: c.latency.p50Ms, change: round(change) }]
+      : [];
+  });
+};
+
+const options = parseArgs(process.argv.slice(2));
+const shapes = corpusShapes().filter(({ name }) => !options.shapes || options.shapes.includes(name));
+
+// Let the JIT settle on small inputs so the first measured case is not penalized.
+const warmup = render(corpusShapes()[0], 256);
+for (let i = 0; i < 50; i++) analyzeGeometry(warmup, 256, 256);
+
+const cases = [];
+for (const size of options.sizes) {
+  for (const shape of shapes) {
+    cases.push(benchCase(shape, size, options.iterations));
+  }
+}
+
+const report = {
+  version: ANALYSIS_VERSION,
+  node: process.version,
+  iterations: options.iterations,
+  maxRssBytes: process.resourceUsage().maxRSS * 1024,
+  ...(options.startupRuns > 0 && { startup: await benchStartup(options.startupRuns) }),
+  cases
+};
+
+if (options.baseline) {
+  report.threshold = options.threshold;
+  report.regressions = findRegressions(cases, JSON.parse(readFileSync(options.baseline, 'utf8')), options.threshold);
+}
+
+const json = `${JSON.stringify(report, null, 2)}\n`;
+if (options.out) writeFileSync(options.out, json);
+else process.stdout.write(json);
+
+if (report.regressions?.length) {
+  console.error(`${report.regressions.length} cases regressed by more than ${options.threshold * 100}%`);
+  process.exit(1);
+}
@@ -0,0 +1,54 @@
+// Builds the lazily loaded symbol catalog. Every catalog/source/*.json file
+// maps symbol keys to entries (name, description, category, optional
+// keywords, and the physics fields shown in the results panel); sources are
+// merged in file-name order and written as fixed-size chunks plus one index
+// with the picker summaries and the prebuilt search index.
+//
+//   node tools/build-catalog.mjs [--chunk-size 64]
+//
+// Rerun after editing any source file.
+
+import { mkdirSync, readFileSync, readdirSync, rmSync, writeFileSync } from 'node:fs';
+import { CATALOG_CHUNK_SIZE, buildCatalogIndex, chunkFileName } from '../decoder/catalog.js';
+
+const CATALOG = new URL('../catalog/', import.meta.url);
+const SOURCES = new URL('source/', CATALOG);
+const CHUNKS = new URL('chunks/', CATALOG);
+const REQUIRED_FIELDS = ['name', 'description', 'category'];
+
+const parseArgs = (argv) => {
+  const args = {};
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i].startsWith('--')) args[argv[i].slice(2)] = argv[i + 1];
+  }
+  return { chunkSize: Number(args['chunk-size'] || CATALOG_CHUNK_SIZE) };
+};
+
+const readSources = () => {
+  const entries = [];
+  const seen = new Map();
+  readdirSync(SOURCES).filter((file) => file.endsWith('.json')).sort().forEach((file) => {
+    Object.entries(JSON.parse(readFileSync(new URL(file, SOURCES), 'utf8'))).forEach(([key, entry]) => {
+      if (seen.has(key)) throw new Error(`${file}: "${key}" is already defined in ${seen.get(key)}`);
+      const missing = REQUIRED_FIELDS.filter((field) => !entry[field]);
+      if (missing.length) throw new Error(`${file}: "${key}" is missing ${missing.join(', ')}`);
+      seen.set(key, file);
+      entries.push([key, entry]);
+    });
+  });
+  return entries;
+};
+
+const { chunkSize } = parseArgs(process.argv.slice(2));
+const entries = readSources();
+
+rmSync(CHUNKS, { recursive: true, force: true });
+mkdirSync(CHUNKS, { recursive: true });
+for (let start = 0, chunk = 0; start < entries.length; start += chunkSize, chunk++) {
+  const body = Object.fromEntries(entries.slice(start, start + chunkSize));
+  writeFileSync(new URL(chunkFileName(chunk), CHUNKS), `${JSON.stringify(body)}\n`);
+}
+
+const index = buildCatalogIndex(entries, chunkSize);
+writeFileSync(new URL('index.json', CATALOG), `${JSON.stringify(index)}\n`);
+console.log(`Wrote ${entries.length} entries in ${Math.ceil(entries.length / chunkSize)} chunks, ${index.tokens.length} search tokens`);
@@ -0,0 +1,54 @@
+// Writes precache-manifest.js, the versioned file list sw.js precaches: the
+// page, every decoder module and the symbol catalog, each with its SHA-256
+// for subresource integrity. The version is a hash over all of them, so it
+// changes exactly when a precached file does.
+//
+//   node tools/build-precache.mjs
+//
+// Rerun after changing any of those files (and after build-catalog.mjs).
+
+import { createHash } from 'node:crypto';
+import { readFileSync, readdirSync, writeFileSync } from 'node:fs';
+
+const ROOT = new URL('../', import.meta.url);
+const MANIFEST = new URL('precache-manifest.js', ROOT);
+
+// Directory globs are one level deep, sorted, so the manifest is stable.
+const PRECACHE = [
+  'index.html',
+  ['decoder/', '.js'],
+  'catalog/index.json',
+  ['catalog/chunks/', '.json']
+];
+
+const listFiles = () => PRECACHE.flatMap((entry) => {
+  if (typeof entry === 'string') return [entry];
+  const [dir, extension] = entry;
+  return readdirSync(new URL(dir, ROOT))
+    .filter((name) => name.endsWith(extension))
+    .sort()
+    .map((name) => `${dir}${name}`);
+});
+
+const files = listFiles().map((url) => {
+  const bytes = readFileSync(new URL(url, ROOT));
+  return {
+    url,
+    bytes: bytes.length,
+    integrity: `sha256-${createHash('sha256').update(bytes).digest('base64')}`
+  };
+});
+
+const version = createHash('sha256')
+  .update(files.map(({ url, integrity }) => `${url} ${integrity}`).join('\n'))
+  .digest('hex')
+  .slice(0, 16);
+
+writeFileSync(MANIFEST, [
+  '// Generated by tools/build-precache.mjs; do not edit.',
+  `self.PRECACHE_MANIFEST = ${JSON.stringify({ version, files }, null, 2)};`,
+  ''
+].join('\n'));
+
+const total = files.reduce((sum, { bytes }) => sum + bytes, 0);
+console.log(`Wrote precache-manifest.js: ${files.length} files, ${(total / 1024).toFixed(1)} KiB, version ${version}`);
@@ -0,0 +1,51 @@
+// worker_threads side of tools/decode.mjs: reads, decodes and analyzes one
+// file per message and posts a single NDJSON-ready record back. 3D files
+// (PLY, XYZ, raw volumes) are streamed from disk through a Blob rather than
+// read whole.
+
+import { openAsBlob } from 'node:fs';
+import { readFile } from 'node:fs/promises';
+import { parentPort, workerData } from 'node:worker_threads';
+import { analyzeGeometry } from '../decoder/analyze.js';
+import { decodeVolume, volumeFormat } from '../decoder/volume-io.js';
+import { decodeImage, resizeToFit } from './image-decode.js';
+
+// Typed arrays become plain arrays and per-stage timings are dropped, as in
+// the golden corpus.
+const normalize = (value) => JSON.parse(JSON.stringify(value, (key, v) => {
+  if (key === 'timings') return undefined;
+  return ArrayBuffer.isView(v) ? Array.from(v) : v;
+}));
+
+parentPort.on('message', async ({ id, file }) => {
+  const start = performance.now();
+  try {
+    if (volumeFormat(file)) {
+      const { volume, ...result } = await decodeVolume(await openAsBlob(file), { name: file });
+      parentPort.postMessage({
+        id,
+        record: {
+          file,
+          ms: Number((performance.now() - start).toFixed(1)),
+          source: { format: volume.format, bytes: volume.bytes },
+          ...normalize(result)
+        }
+      });
+      return;
+    }
+    const image = await decodeImage(await readFile(file));
+    const { data, width, height } = resizeToFit(image, workerData.maxSize);
+    const result = analyzeGeometry(data, width, height, { threshold: workerData.threshold });
+    parentPort.postMessage({
+      id,
+      record: {
+        file,
+        ms: Number((performance.now() - start).toFixed(1)),
+        source: { width: image.width, height: image.height },
+        ...normalize(result)
+      }
+    });
+  } catch (err) {
+    parentPort.postMessage({ id, record: { file, error: err.message } });
+  }
+});
@@ -0,0 +1,211 @@
+// Headless batch decoder. Walks directories and glob patterns, decodes every
+// image on a pool of worker threads and writes one NDJSON line per image as
+// soon as it finishes (completion order, not input order).
+//
+//   node tools/decode.mjs <dir|glob>... [--workers 4] [--queue 8]
+//                         [--max-size 400] [--threshold 200|otsu]
+//                         [--checkpoint done.txt] [--out out.ndjson]
+//
+// Files are enumerated lazily and at most --queue (default 2 × workers) are in
+// flight at once, so memory stays flat however large the corpus is. With
+// --checkpoint, every file decoded and written is appended to the checkpoint
+// and skipped on the next run, so an interrupted batch resumes where it
+// stopped; failed files are retried. A worker that crashes fails the files
+// it had in flight and is replaced. Ctrl-C stops dispatching and lets
+// in-flight files finish.
+// PNG and BMP are decoded natively; JPEG, GIF and WebP need `sharp`. PLY and
+// XYZ point clouds and raw volumes (size in the name, e.g.
+// scan_256x256x128_uint8.raw) are decoded as 3D input.
+
+import { createWriteStream, existsSync, readFileSync, appendFileSync } from 'node:fs';
+import { opendir, stat } from 'node:fs/promises';
+import { availableParallelism } from 'node:os';
+import { join, resolve } from 'node:path';
+import { Worker } from 'node:worker_threads';
+import { BRIGHTNESS_THRESHOLD } from '../decoder/features.js';
+import { OTSU } from '../decoder/threshold.js';
+
+const IMAGE_EXTENSIONS = /\.(png|bmp|jpe?g|gif|webp|ply|xyz|raw)$/i;
+const GLOB_CHARS = /[*?[]/;
+
+const parseArgs = (argv) => {
+  const args = {};
+  const inputs = [];
+  for (let i = 0; i < argv.length; i++) {
+    if (argv[i].startsWith('--')) args[argv[i].slice(2)] = argv[++i];
+    else inputs.push(argv[i]);
+  }
+  const workers = Number(args.workers || Math.max(1, availableParallelism() - 1));
+  return {
+    inputs,
+    workers,
+    queue: Math.max(1, Number(args.queue || workers * 2)),
+    maxSize: Number(args['max-size'] || 400),
+    threshold: args.threshold === OTSU ? OTSU : Number(args.threshold || BRIGHTNESS_THRESHOLD),
+    checkpoint: args.checkpoint,
+    out: args.out
+  };
+};
+
+// `**` matches any number of directories, `*` and `?` stay within one.
+const globToRegExp = (pattern) => new RegExp(`^${pattern.split(/(\*\*\/?|\*|\?)/).map((part) => {
+  if (part === '**/' || part === '**') return '(?:.*/)?';
+  if (part === '*') return '[^/]*';
+  if (part === '?') return '[^/]';
+  return part.replace(/[.+^${}()|[\]\\]/g, '\\$&');
+}).join('').replace(/\(\?:\.\*\/\)\?$/, '.*')}$`);
+
+// Depth-first, one directory handle open at a time; entries are sorted per
+// directory so runs over the same tree dispatch in the same order.
+async function* walk(dir) {
+  const names = [];
+  for await (const entry of await opendir(dir)) {
+    if (entry.isDirectory()) names.push([entry.name, true]);
+    else if (entry.isFile()) names.push([entry.name, false]);
+  }
+  names.sort(([a], [b]) => (a < b ? -1 : a > b ? 1 : 0));
+  for (const [name, isDirectory] of names) {
+    if (isDirectory) yield* walk(join(dir, name));
+    else yield join(dir, name);
+  }
+}
+
+async function* expand(inputs) {
+  for (const input of inputs) {
+    if (GLOB_CHARS.test(input)) {
+      // Walk from the longest literal prefix and filter by the pattern.
+      const parts = resolve(input).split('/');
+      const literal = parts.slice(0, parts.findIndex((part) => GLOB_CHARS.test(part))).join('/') || '/';
+      const pattern = globToRegExp(resolve(input));
+      if (!existsSync(literal)) continue;
+      for await (const file of walk(literal)) {
+        if (pattern.test(file)) yield file;
+      }
+    } else if ((await stat(input)).isDirectory()) {
+      for await (const file of walk(resolve(input))) {
+        if (IMAGE_EXTENSIONS.test(file)) yield file;
+      }
+    } else {
+      yield resolve(input);
+    }
+  }
+}
+
+const readCheckpoint = (path) => (
+  path && existsSync(path)
+    ? new Set(readFileSync(path, 'utf8').split('\n').filter(Boolean))
+    : new Set()
+);
+
+const options = parseArgs(process.argv.slice(2));
+if (!options.inputs.length) {
+  console.error('usage: node tools/decode.mjs <dir|glob>... [--workers N] [--queue N] [--max-size 400] [--threshold N|otsu] [--checkpoint file] [--out file]');
+  process.exit(2);
+}
+
+const done = readCheckpoint(options.checkpoint);
+const output = options.out ? createWriteStream(options.out, { flags: 'a' }) : process.stdout;
+const workers = [];
+const pending = new Map();
+const stats = { decoded: 0, failed: 0, skipped: 0 };
+let nextId = 0;
+let stopping = false;
+let closing = false;
+let wake = () => {};
+
+process.on('SIGINT', () => {
+  if (stopping) process.exit(130);
+  stopping = true;
+  console.error(`Stopping after ${pending.size} in-flight files (Ctrl-C again to abort)`);
+  wake();
+});
+
+// Writes the line, then checkpoints the file once the line is flushed, so a
+// file is only ever skipped on resume if its output exists.
+const emit = (record) => new Promise((resolveWrite) => {
+  const flushed = output.write(`${JSON.stringify(record)}\n`, () => {
+    if (options.checkpoint && !record.error) appendFileSync(options.checkpoint, `${record.file}\n`);
+    resolveWrite();
+  });
+  if (!flushed) output.once('drain', () => wake());
+});
+
+const writes = new Set();
+const finish = (id, record) => {
+  pending.delete(id);
+  stats[record.error ? 'failed' : 'decoded']++;
+  const write = emit(record);
+  writes.add(write);
+  write.then(() => writes.delete(write));
+  wake();
+};
+
+// A worker that dies (an uncaught error, out of memory) takes its in-flight
+// files with it: each gets an error record, and the slot is respawned. A
+// worker that dies with nothing in flight is failing on its own, e.g. at
+// startup, so its slot is dropped instead, and the run fails once none are
+// left.
+const spawn = () => {
+  const slot = {
+    worker: new Worker(new URL('./decode-worker.mjs', import.meta.url), { workerData: { maxSize: options.maxSize, threshold: options.threshold } }),
+    inFlight: new Set(),
+    crash: null
+  };
+  slot.worker.on('message', ({ id, record }) => {
+    slot.inFlight.delete(id);
+    finish(id, record);
+  });
+  slot.worker.on('error', (err) => {
+    slot.crash = err;
+  });
+  slot.worker.on('exit', (code) => {
+    if (closing) return;
+    const reason = slot.crash ? slot.crash.message : `exit code ${code}`;
+    console.error(`Decode worker died (${reason}) with ${slot.inFlight.size} files in flight`);
+    const lost = [...slot.inFlight];
+    workers.splice(workers.indexOf(slot), 1);
+    if (lost.length) {
+      workers.push(spawn());
+    } else if (!workers.length) {
+      console.error('No decode workers left');
+      process.exitCode = 1;
+      stopping = true;
+    }
+    lost.forEach((id) => finish(id, { file: pending.get(id), error: `Decode worker died: ${reason}` }));
+    wake();
+  });
+  return slot;
+};
+for (let i = 0; i < options.workers; i++) workers.push(spawn());
+
+// Resolves when a slot frees up, the output drains or Ctrl-C is pressed.
+const nextEvent = () => new Promise((resolveWake) => {
+  wake = resolveWake;
+});
+const saturated = () => pending.size >= options.queue || output.writableNeedDrain;
+
+for await (const file of expand(options.inputs)) {
+  if (stopping) break;
+  if (done.has(file)) {
+    stats.skipped++;
+    continue;
+  }
+  while (saturated() && !stopping) await nextEvent();
+  if (stopping) break;
+
+  // Least-loaded worker; each one still analyzes a single image at a time.
+  const slot = workers.reduce((a, b) => (b.inFlight.size < a.inFlight.size ? b : a));
+  const id = nextId++;
+  pending.set(id, file);
+  slot.inFlight.add(id);
+  slot.worker.postMessage({ id, file });
+}
+
+while (pending.size) await nextEvent();
+await Promise.all(writes);
+closing = true;
+await Promise.all(workers.map(({ worker }) => worker.terminate()));
+if (options.out) await new Promise((resolveEnd) => output.end(resolveEnd));
+
+console.error(`${stats.decoded} decoded, ${stats.failed} failed, ${stats.skipped} skipped from checkpoint`);
+if (stats.failed) process.exitCode = 1;
@@ -0,0 +1,57 @@
+// Golden-output corpus for the shared decode kernel. Every preset shape is
+// rendered headlessly and decoded; the outputs (minus timings) are compared
+// byte-for-byte against tools/golden.json so optimizations can prove they
+// leave results bit-identical.
+//
+//   node tools/golden.mjs           check, exit 1 on any difference
+//   node tools/golden.mjs --update  rewrite the corpus
+
+import { readFileSync, writeFileSync } from 'node:fs';
+import { RasterContext } from './raster.js';
+import { ANALYSIS_VERSION, analyzeGeometry } from '../decoder/analyze.js';
+import { PRESET_SHAPES, SHAPE_SIZE, drawPresetShape } from '../decoder/preset-shapes.js';
+
+const CORPUS = new URL('./golden.json', import.meta.url);
+
+// Typed arrays become plain arrays and timings are dropped; everything else is
+// serialized as-is so float round-trips stay exact.
+const normalize = (value) => JSON.parse(JSON.stringify(value, (key, v) => {
+  if (key === 'timings') return undefined;
+  return ArrayBuffer.isView(v) ? Array.from(v) : v;
+}));
+
+const decodeCorpus = () => Object.fromEntries(Object.keys(PRESET_SHAPES).map((key) => {
+  const ctx = new RasterContext(SHAPE_SIZE, SHAPE_SIZE);
+  drawPresetShape(ctx, key);
+  return [key, normalize(analyzeGeometry(ctx.data, SHAPE_SIZE, SHAPE_SIZE))];
+}));
+
+const diffPaths = (expected, actual, path = '') => {
+  if (JSON.stringify(expected) === JSON.stringify(actual)) return [];
+  if (expected && actual && typeof expected === 'object' && typeof actual === 'object') {
+    const keys = new Set([...Object.keys(expected), ...Object.keys(actual)]);
+    return [...keys].flatMap((key) => diffPaths(expected[key], actual[key], `${path}.${key}`));
+  }
+  return [`${path}: expected ${JSON.stringify(expected)}, got ${JSON.stringify(actual)}`];
+};
+
+const outputs = decodeCorpus();
+
+if (process.argv.includes('--update')) {
+  writeFileSync(CORPUS, `${JSON.stringify({ version: ANALYSIS_VERSION, outputs }, null, 1)}\n`);
+  console.log(`Wrote ${Object.keys(outputs).length} golden outputs`);
+} else {
+  const golden = JSON.parse(readFileSync(CORPUS, 'utf8'));
+  const failures = golden.version !== ANALYSIS_VERSION
+    ? [`corpus is for version ${golden.version}, kernel is ${ANALYSIS_VERSION}; rerun with --update`]
+    : Object.keys({ ...golden.outputs, ...outputs }).flatMap((key) => (
+      diffPaths(golden.outputs[key], outputs[key], key)
+    ));
+
+  failures.slice(0, 20).forEach((line) => console.error(line));
+  if (failures.length) {
+    console.error(`${failures.length} golden mismatches`);
+    process.exit(1);
+  }
+  console.log(`${Object.keys(outputs).length} golden outputs match`);
+}
@@ -0,0 +1,234 @@
+// Headless image decoding for the command-line tools. PNG (every colour type,
+// bit depth and Adam7 interlacing) and uncompressed BMP are decoded here with
+// only node:zlib; other formats go through `sharp` when it is installed.
+// Pixels are composited onto white, as the browser front ends draw uploads
+// onto a white canvas before decoding.
+
+import { inflateSync } from 'node:zlib';
+
+const PNG_SIGNATURE = [0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a];
+const CHANNELS = { 0: 1, 2: 3, 3: 1, 4: 2, 6: 4 };
+const ADAM7 = [
+  [0, 0, 8, 8], [4, 0, 8, 8], [0, 4, 4, 8], [2, 0, 4, 4],
+  [0, 2, 2, 4], [1, 0, 2, 2], [0, 1, 1, 2]
+];
+
+const isPng = (buf) => PNG_SIGNATURE.every((byte, i) => buf[i] === byte);
+const isBmp = (buf) => buf[0] === 0x42 && buf[1] === 0x4d;
+
+const paeth = (a, b, c) => {
+  const p = a + b - c;
+  const pa = Math.abs(p - a);
+  const pb = Math.abs(p - b);
+  const pc = Math.abs(p - c);
+  if (pa <= pb && pa <= pc) return a;
+  return pb <= pc ? b : c;
+};
+
+// Undoes the per-scanline filters in place; returns the offset after the pass.
+const unfilter = (raw, offset, rowBytes, rows, bpp) => {
+  let prev = -1;
+  for (let y = 0; y < rows; y++) {
+    const filter = raw[offset];
+    const row = offset + 1;
+    for (let x = 0; x < rowBytes; x++) {
+      const a = x >= bpp ? raw[row + x - bpp] : 0;
+      const b = prev >= 0 ? raw[prev + x] : 0;
+      const c = prev >= 0 && x >= bpp ? raw[prev + x - bpp] : 0;
+      let value = raw[row + x];
+      if (filter === 1) value += a;
+      else if (filter === 2) value += b;
+      else if (filter === 3) value += (a + b) >> 1;
+      else if (filter === 4) value += paeth(a, b, c);
+      else if (filter !== 0) throw new Error(`Unknown PNG filter type ${filter}`);
+      raw[row + x] = value;
+    }
+    prev = row;
+    offset = row + rowBytes;
+  }
+  return offset;
+};
+
+// Sample `i` of a row at its native bit depth.
+const rawSample = (raw, row, i, depth) => {
+  if (depth === 8) return raw[row + i];
+  if (depth === 16) return raw.readUInt16BE(row + i * 2);
+  const perByte = 8 / depth;
+  const shift = 8 - depth * ((i % perByte) + 1);
+  return (raw[row + Math.floor(i / perByte)] >> shift) & ((1 << depth) - 1);
+};
+
+// The same sample scaled to 0..255.
+const sampleAt = (raw, row, i, depth) => {
+  const value = rawSample(raw, row, i, depth);
+  if (depth === 8) return value;
+  if (depth === 16) return value >> 8;
+  return Math.round((value * 255) / ((1 << depth) - 1));
+};
+
+export const decodePng = (buf) => {
+  let width = 0, height = 0, depth = 0, colorType = 0, interlace = 0;
+  let palette = null, transparency = null;
+  const idat = [];
+
+  for (let offset = 8; offset < buf.length;) {
+    const length = buf.readUInt32BE(offset);
+    const type = buf.toString('latin1', offset + 4, offset + 8);
+    const data = buf.subarray(offset + 8, offset + 8 + length);
+    if (type === 'IHDR') {
+      width = data.readUInt32BE(0);
+      height = data.readUInt32BE(4);
+      [depth, colorType] = [data[8], data[9]];
+      interlace = data[12];
+    } else if (type === 'PLTE') {
+      palette = data;
+    } else if (type === 'tRNS') {
+      transparency = data;
+    } else if (type === 'IDAT') {
+      idat.push(data);
+    } else if (type === 'IEND') {
+      break;
+    }
+    offset += 12 + length;
+  }
+
+  const channels = CHANNELS[colorType];
+  if (!channels || !width || !height) throw new Error('Unsupported PNG');
+  const raw = inflateSync(Buffer.concat(idat));
+  const bpp = Math.max(1, (channels * depth) >> 3);
+  const rgba = new Uint8ClampedArray(width * height * 4);
+
+  // Composites one pixel onto white.
+  const put = (x, y, r, g, b, a) => {
+    const i = (y * width + x) * 4;
+    const k = 255 - a;
+    rgba[i] = (r * a + 255 * k) / 255;
+    rgba[i + 1] = (g * a + 255 * k) / 255;
+    rgba[i + 2] = (b * a + 255 * k) / 255;
+    rgba[i + 3] = 255;
+  };
+
+  const readPixel = (row, i, x, y) => {
+    const s = (c) => sampleAt(raw, row, i * channels + c, depth);
+    if (colorType === 3) {
+      const index = rawSample(raw, row, i, depth);
+      const alpha = transparency && index < transparency.length ? transparency[index] : 255;
+      put(x, y, palette[index * 3], palette[index * 3 + 1], palette[index * 3 + 2], alpha);
+    } else if (colorType === 0) {
+      const keyed = transparency && rawSample(raw, row, i, depth) === transparency.readUInt16BE(0);
+      put(x, y, s(0), s(0), s(0), keyed ? 0 : 255);
+    } else if (colorType === 4) {
+      put(x, y, s(0), s(0), s(0), s(1));
+    } else if (colorType === 2) {
+      put(x, y, s(0), s(1), s(2), 255);
+    } else {
+      put(x, y, s(0), s(1), s(2), s(3));
+    }
+  };
+
+  const passes = interlace ? ADAM7 : [[0, 0, 1, 1]];
+  let offset = 0;
+  for (const [x0, y0, dx, dy] of passes) {
+    const passWidth = Math.ceil((width - x0) / dx);
+    const passHeight = Math.ceil((height - y0) / dy);
+    if (passWidth <= 0 || passHeight <= 0) continue;
+    const rowBytes = Math.ceil((passWidth * channels * depth) / 8);
+    const start = offset;
+    offset = unfilter(raw, offset, rowBytes, passHeight, bpp);
+    for (let py = 0; py < passHeight; py++) {
+      const row = start + py * (rowBytes + 1) + 1;
+      for (let px = 0; px < passWidth; px++) readPixel(row, px, x0 + px * dx, y0 + py * dy);
+    }
+  }
+
+  return { data: rgba, width, height };
+};
+
+// Uncompressed (BI_RGB / BI_BITFIELDS with the usual masks) 8-, 24- and 32-bit.
+export const decodeBmp = (buf) => {
+  const dataOffset = buf.readUInt32LE(10);
+  const width = buf.readInt32LE(18);
+  const rawHeight = buf.readInt32LE(22);
+  const bits = buf.readUInt16LE(28);
+  const compression = buf.readUInt32LE(30);
+  if (![8, 24, 32].includes(bits) || ![0, 3].includes(compression)) {
+    throw new Error(`Unsupported BMP (${bits}-bit, compression ${compression})`);
+  }
+
+  const height = Math.abs(rawHeight);
+  const stride = Math.ceil((width * bits) / 32) * 4;
+  const paletteOffset = 14 + buf.readUInt32LE(14);
+  const rgba = new Uint8ClampedArray(width * height * 4);
+  for (let y = 0; y < height; y++) {
+    const row = dataOffset + (rawHeight > 0 ? height - 1 - y : y) * stride;
+    for (let x = 0; x < width; x++) {
+      const i = (y * width + x) * 4;
+      let p = row + x * (bits >> 3);
+      if (bits === 8) p = paletteOffset + buf[row + x] * 4;
+      rgba[i] = buf[p + 2];
+      rgba[i + 1] = buf[p + 1];
+      rgba[i + 2] = buf[p];
+      rgba[i + 3] = 255;
+    }
+  }
+  return { data: rgba, width, height };
+};
+
+let sharpModule;
+const loadSharp = async () => {
+  if (sharpModule === undefined) {
+    sharpModule = await import('sharp').then((m) => m.default, () => null);
+  }
+  return sharpModule;
+};
+
+export const decodeImage = async (buf) => {
+  if (isPng(buf)) return decodePng(buf);
+  if (isBmp(buf)) return decodeBmp(buf);
+
+  const sharp = await loadSharp();
+  if (!sharp) throw new Error('Unsupported image format (install sharp for JPEG, GIF and WebP)');
+  const { data, info } = await sharp(buf)
+    .flatten({ background: '#ffffff' })
+    .ensureAlpha()
+    .raw()
+    .toBuffer({ resolveWithObject: true });
+  return { data: new Uint8ClampedArray(data.buffer, data.byteOffset, data.length), width: info.width, height: info.height };
+};
+
+// Area-averaging resize to fit maxSize × maxSize, sized exactly like the
+// front ends' rasterizeToFit (which may also scale up).
+export const resizeToFit = ({ data, width, height }, maxSize) => {
+  const scale = Math.min(maxSize / width, maxSize / height);
+  const w = Math.max(1, Math.floor(width * scale));
+  const h = Math.max(1, Math.floor(height * scale));
+  if (w === width && h === height) return { data, width, height };
+
+  const out = new Uint8ClampedArray(w * h * 4);
+  const sx = width / w;
+  const sy = height / h;
+  for (let y = 0; y < h; y++) {
+    const y0 = Math.floor(y * sy);
+    const y1 = Math.max(y0 + 1, Math.floor((y + 1) * sy));
+    for (let x = 0; x < w; x++) {
+      const x0 = Math.floor(x * sx);
+      const x1 = Math.max(x0 + 1, Math.floor((x + 1) * sx));
+      let r = 0, g = 0, b = 0;
+      for (let yy = y0; yy < y1; yy++) {
+        for (let xx = x0; xx < x1; xx++) {
+          const i = (yy * width + xx) * 4;
+          r += data[i];
+          g += data[i + 1];
+          b += data[i + 2];
+        }
+      }
+      const n = (y1 - y0) * (x1 - x0);
+      const o = (y * w + x) * 4;
+      out[o] = r / n;
+      out[o + 1] = g / n;
+      out[o + 2] = b / n;
+      out[o + 3] = 255;
+    }
+  }
+  return { data: out, width: w, height: h };
+};
@@ -0,0 +1,173 @@
+// Headless stand-in for the subset of CanvasRenderingContext2D used by the
+// preset shapes and generators, so corpora can be drawn without a browser.
+
+const parseColor = (style) => {
+  if (style === 'white') return [255, 255, 255];
+  if (style === 'black') return [0, 0, 0];
+  const hex = style.replace('#', '');
+  const full = hex.length === 3 ? hex.split('').map((c) => c + c).join('') : hex;
+  return [0, 2, 4].map((i) => parseInt(full.slice(i, i + 2), 16));
+};
+
+// Records path commands so they can be replayed into a RasterContext, standing
+// in for Path2D.
+export class RasterPath {
+  constructor() {
+    this.commands = [];
+  }
+
+  replay(ctx) {
+    this.commands.forEach(([name, args]) => ctx[name](...args));
+  }
+}
+
+['moveTo', 'lineTo', 'closePath', 'arc', 'rect'].forEach((name) => {
+  RasterPath.prototype[name] = function record(...args) {
+    this.commands.push([name, args]);
+  };
+});
+
+export class RasterContext {
+  constructor(width, height) {
+    this.width = width;
+    this.height = height;
+    this.data = new Uint8ClampedArray(width * height * 4);
+    this.strokeStyle = '#000000';
+    this.fillStyle = '#000000';
+    this.lineWidth = 1;
+    this.k = 1;
+    this.beginPath();
+  }
+
+  // Uniform scaling only; that is all the corpus builders need.
+  scale(sx) {
+    this.k *= sx;
+  }
+
+  fillRect(x, y, w, h) {
+    const [r, g, b] = parseColor(this.fillStyle);
+    const { k } = this;
+    x *= k; y *= k; w *= k; h *= k;
+    const x0 = Math.max(0, Math.floor(x)), x1 = Math.min(this.width, Math.ceil(x + w));
+    const y0 = Math.max(0, Math.floor(y)), y1 = Math.min(this.height, Math.ceil(y + h));
+    const pixels = new Uint32Array(this.data.buffer);
+    const rgba = new Uint32Array(new Uint8ClampedArray([r, g, b, 255]).buffer)[0];
+    for (let py = y0; py < y1; py++) {
+      pixels.fill(rgba, py * this.width + x0, py * this.width + x1);
+    }
+  }
+
+  set(x, y, r, g, b) {
+    const i = (y * this.width + x) * 4;
+    this.data[i] = r;
+    this.data[i + 1] = g;
+    this.data[i + 2] = b;
+    this.data[i + 3] = 255;
+  }
+
+  beginPath() {
+    this.subpaths = [];
+    this.current = null;
+  }
+
+  moveTo(x, y) {
+    this.current = [[x * this.k, y * this.k]];
+    this.subpaths.push(this.current);
+  }
+
+  lineTo(x, y) {
+    if (!this.current) this.moveTo(x, y);
+    else this.current.push([x * this.k, y * this.k]);
+  }
+
+  closePath() {
+    if (this.current && this.current.length) this.current.push([...this.current[0]]);
+  }
+
+  arc(cx, cy, radius, start, end) {
+    const steps = Math.max(8, Math.ceil(Math.abs(end - start) * radius * this.k));
+    for (let i = 0; i <= steps; i++) {
+      const angle = start + ((end - start) * i) / steps;
+      this.lineTo(cx + radius * Math.cos(angle), cy + radius * Math.sin(angle));
+    }
+  }
+
+  rect(x, y, w, h) {
+    this.moveTo(x, y);
+    this.lineTo(x + w, y);
+    this.lineTo(x + w, y + h);
+    this.lineTo(x, y + h);
+    this.closePath();
+  }
+
+  stamp(x, y, half, color) {
+    const x0 = Math.max(0, Math.floor(x - half)), x1 = Math.min(this.width - 1, Math.ceil(x + half));
+    const y0 = Math.max(0, Math.floor(y - half)), y1 = Math.min(this.height - 1, Math.ceil(y + half));
+    const limit = half * half;
+    for (let py = y0; py <= y1; py++) {
+      for (let px = x0; px <= x1; px++) {
+        const dx = px + 0.5 - x, dy = py + 0.5 - y;
+        if (dx * dx + dy * dy <= limit) this.set(px, py, ...color);
+      }
+    }
+  }
+
+  stroke(path) {
+    if (path) {
+      this.beginPath();
+      path.replay(this);
+    }
+    const color = parseColor(this.strokeStyle);
+    const half = Math.max(0.5, (this.lineWidth * this.k) / 2);
+    const step = Math.max(0.5, half / 2);
+    this.subpaths.forEach((points) => {
+      for (let i = 1; i < points.length; i++) {
+        const [x0, y0] = points[i - 1];
+        const [x1, y1] = points[i];
+        const n = Math.max(1, Math.ceil(Math.hypot(x1 - x0, y1 - y0) / step));
+        for (let s = 0; s <= n; s++) {
+          this.stamp(x0 + ((x1 - x0) * s) / n, y0 + ((y1 - y0) * s) / n, half, color);
+        }
+      }
+      if (points.length === 1) this.stamp(points[0][0], points[0][1], half, color);
+    });
+  }
+
+  // Even-odd scanline fill of every subpath.
+  fill() {
+    const color = parseColor(this.fillStyle);
+    const edges = [];
+    this.subpaths.forEach((points) => {
+      for (let i = 0; i < points.length; i++) {
+        const a = points[i];
+        const b = points[(i + 1) % points.length];
+        if (a[1] !== b[1]) edges.push(a[1] < b[1] ? [a, b] : [b, a]);
+      }
+    });
+    for (let y = 0; y < this.height; y++) {
+      const sy = y + 0.5;
+      const xs = [];
+      edges.forEach(([[ax, ay], [bx, by]]) => {
+        if (sy >= ay && sy < by) xs.push(ax + ((sy - ay) * (bx - ax)) / (by - ay));
+      });
+      xs.sort((p, q) => p - q);
+      for (let k = 0; k + 1 < xs.length; k += 2) {
+        const x0 = Math.max(0, Math.ceil(xs[k] - 0.5));
+        const x1 = Math.min(this.width - 1, Math.floor(xs[k + 1] - 0.5));
+        for (let x = x0; x <= x1; x++) this.set(x, y, ...color);
+      }
+    }
+  }
+
+  getImageData(x, y, width, height) {
+    if (x === 0 && y === 0 && width === this.width && height === this.height) {
+      return { data: this.data, width, height };
+    }
+    const data = new Uint8ClampedArray(width * height * 4);
+    for (let row = 0; row < height; row++) {
+      const from = ((y + row) * this.width + x) * 4;
+      data.set(this.data.subarray(from, from + width * 4), row * width * 4);
+    }
+    return { data, width, height };
+  }
+}
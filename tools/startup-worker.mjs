@@ -0,0 +1,20 @@
+// worker_threads side of the startup timings in tools/bench.mjs: a fresh
+// isolate loads the kernel, decodes one image cold and then again warm, and
+// posts the three times back.
+
+import { parentPort, workerData } from 'node:worker_threads';
+
+const start = performance.now();
+const { analyzeGeometry } = await import('../decoder/analyze.js');
+const loaded = performance.now();
+const { data, size } = workerData;
+analyzeGeometry(data, size, size);
+const first = performance.now();
+analyzeGeometry(data, size, size);
+const second = performance.now();
+
+parentPort.postMessage({
+  importMs: loaded - start,
+  firstDecodeMs: first - loaded,
+  warmDecodeMs: second - first
+});